@@ -0,0 +1,323 @@
+"""
+Micro-benchmarks of the signing pipeline
+
+    python benchmarks/bench.py                        compare against the baseline
+    python benchmarks/bench.py --fail-on-regression   also exit 1 on a regression
+    python benchmarks/bench.py --update-baseline      record a new baseline
+    python benchmarks/bench.py --filter multisend     run a subset
+
+Results are written as JSON. Against a baseline, a benchmark whose time per call
+regresses by more than the threshold is reported, and only fails the run with
+--fail-on-regression. The fastest round is compared by default, it is the statistic
+least disturbed by other load on the machine.
+
+Timings are absolute and only comparable on the machine and interpreter that recorded
+them. baseline.json must be regenerated with --update-baseline on the machine the
+comparison runs on, typically from the commit being compared against, before it can
+gate anything
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from py_builder_relayer_client.builder import proxy as proxy_builder  # noqa: E402
+from py_builder_relayer_client.builder import safe as safe_builder  # noqa: E402
+from py_builder_relayer_client.builder.derive import derive  # noqa: E402
+from py_builder_relayer_client.config import get_contract_config  # noqa: E402
+from py_builder_relayer_client.encode.proxy import (  # noqa: E402
+    encode_proxy_transaction_data,
+)
+from py_builder_relayer_client.encode.safe import (  # noqa: E402
+    create_safe_multisend_transaction,
+)
+from py_builder_relayer_client.models import (  # noqa: E402
+    CallType,
+    OperationType,
+    ProxyTransaction,
+    SafeTransaction,
+    SignatureParams,
+    TransactionRequest,
+    TransactionType,
+)
+from py_builder_relayer_client.signer import Signer  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "results.json")
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_STATISTIC = "min"
+DEFAULT_ROUNDS = 7
+# Each round runs the benchmark at least this many seconds
+DEFAULT_MIN_TIME = 0.05
+
+CHAIN_ID = 137
+SEED = 1234
+# Publicly known PK
+PK = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+MULTISEND_SIZES = (1, 10, 100, 1000)
+
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    """
+    Returns the benchmarks by name, with fixtures generated from a fixed seed
+    """
+    rng = random.Random(SEED)
+    config = get_contract_config(CHAIN_ID)
+    signer = Signer(PK, CHAIN_ID)
+    address = signer.address()
+    safe = derive(address, config.safe_factory)
+    struct_hash = "0x" + rng.randbytes(32).hex()
+    signature = signer.sign_eip712_struct_hash(struct_hash)
+
+    def safe_txn() -> SafeTransaction:
+        return SafeTransaction(
+            to="0x" + rng.randbytes(20).hex(),
+            operation=OperationType.Call,
+            data="0x" + rng.randbytes(rng.randrange(4, 200)).hex(),
+            value=str(rng.randrange(10**18)),
+        )
+
+    def proxy_txn() -> ProxyTransaction:
+        txn = safe_txn()
+        return ProxyTransaction(
+            to=txn.to, type_code=CallType.Call, data=txn.data, value=txn.value
+        )
+
+    request = TransactionRequest(
+        type=TransactionType.SAFE.value,
+        from_address=address,
+        to=config.safe_multisend,
+        proxy=safe,
+        data="0x" + rng.randbytes(500).hex(),
+        signature=signature,
+        signature_params=SignatureParams(
+            gas_price="0",
+            operation="1",
+            safe_txn_gas="0",
+            base_gas="0",
+            gas_token="0x0000000000000000000000000000000000000000",
+            refund_receiver="0x0000000000000000000000000000000000000000",
+        ),
+        value="0",
+        nonce="42",
+        metadata="",
+    )
+    safe_call = safe_txn()
+    proxy_calls = [proxy_txn() for _ in range(10)]
+    proxy_data = encode_proxy_transaction_data(proxy_calls)
+
+    benchmarks = {
+        "derive": lambda: derive.__wrapped__(address, config.safe_factory),
+        "derive.cached": lambda: derive(address, config.safe_factory),
+        "derive_proxy": lambda: proxy_builder.derive_proxy.__wrapped__(
+            address, config.proxy_factory
+        ),
+        "safe.create_struct_hash": lambda: safe_builder.create_struct_hash(
+            CHAIN_ID,
+            safe,
+            safe_call.to,
+            safe_call.value,
+            safe_call.data,
+            safe_call.operation,
+            "0",
+            "0",
+            "0",
+            "0x0000000000000000000000000000000000000000",
+            "0x0000000000000000000000000000000000000000",
+            "42",
+        ),
+        "proxy.create_struct_hash": lambda: proxy_builder.create_struct_hash(
+            address,
+            config.proxy_factory,
+            proxy_data,
+            "0",
+            "0",
+            "10000000",
+            "42",
+            config.relay_hub,
+            address,
+        ),
+        "signer.sign": lambda: signer.sign(struct_hash),
+        "signer.sign_eip712_struct_hash": lambda: signer.sign_eip712_struct_hash(
+            struct_hash
+        ),
+        "signer.sign_message": lambda: signer.sign_message(struct_hash),
+        "split_and_pack_sig": lambda: safe_builder.split_and_pack_sig(signature),
+        "encode_proxy_transaction_data": lambda: encode_proxy_transaction_data(
+            proxy_calls
+        ),
+        "TransactionRequest.to_dict": request.to_dict,
+    }
+    for size in MULTISEND_SIZES:
+        txns = [safe_txn() for _ in range(size)]
+        benchmarks[f"create_safe_multisend_transaction[{size}]"] = (
+            lambda txns=txns: create_safe_multisend_transaction(
+                txns, config.safe_multisend
+            )
+        )
+    return benchmarks
+
+
+def measure(
+    fn: Callable[[], object],
+    rounds: int = DEFAULT_ROUNDS,
+    min_time: float = DEFAULT_MIN_TIME,
+) -> Dict[str, float]:
+    """
+    Times fn, returning the median and minimum seconds per call over the rounds
+    The loops per round are calibrated so that a round lasts at least min_time
+    """
+    loops = 1
+    while True:
+        elapsed = _time(fn, loops)
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+    samples = [_time(fn, loops) / loops for _ in range(rounds)]
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "loops": loops,
+        "rounds": rounds,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    statistic: str = DEFAULT_STATISTIC,
+) -> List[str]:
+    """
+    Returns a description of every benchmark slower than the baseline by more than
+    its threshold, the baseline's per benchmark "thresholds" override the default
+    """
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        limit = thresholds.get(name, threshold)
+        change = result[statistic] / base[statistic] - 1
+        if change > limit:
+            regressions.append(
+                f"{name}: {_format(result[statistic])} vs {_format(base[statistic])} "
+                f"(+{change:.0%}, threshold {limit:.0%})"
+            )
+    return regressions
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "signing_backend": Signer(PK, CHAIN_ID).backend.name,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed regression, 0.5 is 50%% slower than the baseline",
+    )
+    parser.add_argument(
+        "--statistic", choices=("min", "median"), default=DEFAULT_STATISTIC
+    )
+    parser.add_argument("--filter", help="regex selecting the benchmarks to run")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit 1 on a regression, needs a baseline recorded on this machine",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to the baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = build_benchmarks()
+    if args.filter:
+        pattern = re.compile(args.filter)
+        benchmarks = {k: v for k, v in benchmarks.items() if pattern.search(k)}
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    width = max(len(name) for name in benchmarks)
+    for name, fn in benchmarks.items():
+        results[name] = measure(fn, args.rounds, args.min_time)
+        base = baseline.get("results", {}).get(name)
+        value = results[name][args.statistic]
+        line = f"{name:<{width}}  {_format(value):>10}"
+        if base is not None:
+            change = value / base[args.statistic] - 1
+            line += f"  {_format(base[args.statistic]):>10}  {change:+.1%}"
+        print(line)
+
+    report = {"environment": environment(), "results": results}
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            # Keep the per benchmark thresholds of the previous baseline
+            with open(args.baseline) as f:
+                report["thresholds"] = json.load(f).get("thresholds", {})
+        _write(args.baseline, report)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    _write(args.output, report)
+
+    if not baseline:
+        print(f"no baseline at {args.baseline}, nothing to compare")
+        return 0
+    if baseline.get("environment") != report["environment"]:
+        print("warning: the baseline was recorded in a different environment")
+    regressions = compare(results, baseline, args.threshold, args.statistic)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def _time(fn: Callable[[], object], loops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter() - started
+
+
+def _format(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.2f}us"
+
+
+def _write(path: str, report: Dict):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+Load generator driving the client against a relayer, a local mock one by default
+
+    python benchmarks/load.py --mode execute --rate 50 --duration 10
+    python benchmarks/load.py --mode confirm --latency-ms 80 --throttle-rate 0.05
+    python benchmarks/load.py --mode pool --signers 3 --rate 200
+    python benchmarks/load.py --mode async-confirm --rate 100
+    python benchmarks/load.py --url http://127.0.0.1:8080 --mode queue
+
+Operations are started at the target rate whatever the latency of the ones in
+flight, and each latency is measured from the time the operation was due, so a
+saturated client shows up as latency rather than as a lower offered rate. Modes:
+  execute  RelayClient.execute, until the relayer acknowledges the submit
+  confirm  execute, then until the shared waiter sees a terminal state
+  pool     PooledRelayClient.execute across --signers signers
+  queue    SubmissionQueue.submit, until the batch carrying it is acknowledged
+  async    AsyncRelayClient.execute on one event loop, until acknowledged
+  async-confirm
+           AsyncRelayClient.execute, then until its wait() sees a terminal state
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from py_builder_signing_sdk.config import (  # noqa: E402
+    BuilderApiKeyCreds,
+    BuilderConfig,
+)
+
+from benchmarks.mock_relayer import (  # noqa: E402
+    MockRelayer,
+    MockRelayerConfig,
+    constant,
+    lognormal,
+)
+from py_builder_relayer_client.async_client import AsyncRelayClient  # noqa: E402
+from py_builder_relayer_client.client import RelayClient  # noqa: E402
+from py_builder_relayer_client.exceptions import RelayerClientException  # noqa: E402
+from py_builder_relayer_client.models import (  # noqa: E402
+    OperationType,
+    SafeTransaction,
+)
+from py_builder_relayer_client.pool import PooledRelayClient  # noqa: E402
+from py_builder_relayer_client.submission import SubmissionQueue  # noqa: E402
+
+MODES = ("execute", "confirm", "pool", "queue", "async", "async-confirm")
+CHAIN_ID = 137
+# Publicly known PKs
+PKS = [
+    "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+    "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d",
+    "0x5de4111afa1a4b94908f83103eb1f1706367c2e68ca870fc3fb9a804cdab365a",
+    "0x7c852118294e51e653712a81e05800f419141751be58f605c371e15141b007a6",
+    "0x47e179ec197488593b187f80a00eb0da91f1b9d0b13f8733639f19c30a34926a",
+]
+BUILDER_SECRET = "c2VjcmV0"
+PERCENTILES = (50, 95, 99)
+
+
+def approve_txn() -> SafeTransaction:
+    return SafeTransaction(
+        to="0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+        operation=OperationType.Call,
+        data="0x095ea7b3",
+        value="0",
+    )
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """
+    Nearest rank percentile of already sorted values
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_load(
+    operation: Callable[[], object],
+    rate: float,
+    duration: float,
+    concurrency: int,
+) -> Dict:
+    """
+    Starts operation rate times a second for duration seconds on concurrency threads
+    Returns the achieved throughput, latency percentiles and errors by type
+    """
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    lock = threading.Lock()
+
+    def run(due: float):
+        try:
+            operation()
+        except Exception as e:
+            with lock:
+                errors[type(e).__name__] += 1
+            return
+        elapsed = time.perf_counter() - due
+        with lock:
+            latencies.append(elapsed)
+
+    total = int(rate * duration)
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="load"
+    ) as executor:
+        started = time.perf_counter()
+        for i in range(total):
+            due = started + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run, due)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    report = {
+        "offered": total,
+        "completed": len(latencies),
+        "failed": sum(errors.values()),
+        "errors": dict(errors),
+        "target_tps": rate,
+        "achieved_tps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "elapsed": elapsed,
+        "max": latencies[-1] if latencies else None,
+    }
+    for p in PERCENTILES:
+        report[f"p{p}"] = percentile(latencies, p)
+    return report
+
+
+def build_operation(mode: str, url: str, signers: int, wait_timeout: float):
+    """
+    Returns the operation of the mode and a function releasing its clients
+    """
+    builder_config = BuilderConfig(
+        local_builder_creds=BuilderApiKeyCreds(
+            key="key", secret=BUILDER_SECRET, passphrase="pass"
+        )
+    )
+    if mode == "pool":
+        pool = PooledRelayClient(url, CHAIN_ID, PKS[:signers], builder_config)
+        return lambda: pool.execute([approve_txn()]), pool.close
+    if mode.startswith("async"):
+        return build_async_operation(
+            url, builder_config, mode == "async-confirm", wait_timeout
+        )
+
+    client = RelayClient(url, CHAIN_ID, PKS[0], builder_config)
+    if mode == "execute":
+        return lambda: client.execute([approve_txn()]), client.close
+    if mode == "confirm":
+        return (
+            lambda: client.execute([approve_txn()]).future().result(wait_timeout),
+            client.close,
+        )
+
+    queue = SubmissionQueue(client, wait_timeout=wait_timeout)
+
+    def close():
+        queue.close()
+        client.close()
+
+    return (
+        lambda: queue.submit(approve_txn()).submitted.result(wait_timeout),
+        close,
+    )
+
+
+def build_async_operation(
+    url: str, builder_config: BuilderConfig, confirm: bool, wait_timeout: float
+):
+    """
+    Returns an operation running AsyncRelayClient.execute on an event loop thread
+    shared by every operation, and a function closing the client and the loop
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="load-loop", daemon=True)
+    thread.start()
+    client = AsyncRelayClient(url, CHAIN_ID, PKS[0], builder_config)
+
+    async def execute():
+        resp = await client.execute([approve_txn()])
+        if confirm and await resp.wait(timeout=wait_timeout) is None:
+            raise RelayerClientException(
+                f"transaction {resp.transaction_id} did not reach a terminal state"
+            )
+
+    def operation():
+        asyncio.run_coroutine_threadsafe(execute(), loop).result()
+
+    def close():
+        asyncio.run_coroutine_threadsafe(client.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    return operation, close
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="relayer to load, a local mock by default")
+    parser.add_argument("--mode", choices=MODES, default="execute")
+    parser.add_argument("--rate", type=float, default=50.0, help="operations/s")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--signers", type=int, default=3, choices=range(1, 6))
+    parser.add_argument("--wait-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="also write the report as JSON")
+    mock = parser.add_argument_group("mock relayer")
+    mock.add_argument("--latency-ms", type=float, default=50.0)
+    mock.add_argument("--latency-sigma", type=float, default=0.5)
+    mock.add_argument("--error-rate", type=float, default=0.0)
+    mock.add_argument("--throttle-rate", type=float, default=0.0)
+    mock.add_argument("--retry-after", type=float)
+    mock.add_argument("--mined-after", type=float, default=1.0)
+    mock.add_argument("--confirmed-after", type=float, default=2.0)
+    mock.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    relayer = None
+    url = args.url
+    if url is None:
+        latency = (
+            lognormal(args.latency_ms / 1000, args.latency_sigma)
+            if args.latency_ms > 0
+            else constant(0.0)
+        )
+        relayer = MockRelayer(
+            MockRelayerConfig(
+                default_latency=latency,
+                error_rate=args.error_rate,
+                throttle_rate=args.throttle_rate,
+                retry_after=args.retry_after,
+                mined_after=args.mined_after,
+                confirmed_after=args.confirmed_after,
+                builder_secret=BUILDER_SECRET,
+                seed=args.seed,
+            )
+        ).start()
+        url = relayer.url
+
+    operation, close = build_operation(args.mode, url, args.signers, args.wait_timeout)
+    try:
+        report = run_load(operation, args.rate, args.duration, args.concurrency)
+    finally:
+        close()
+        if relayer is not None:
+            relayer.stop()
+    report["mode"] = args.mode
+    if relayer is not None:
+        report["http"] = {
+            f"{path} {status}": count
+            for (path, status), count in sorted(relayer.counts().items())
+        }
+
+    print(
+        f"{args.mode}: {report['completed']}/{report['offered']} ok, "
+        f"{report['failed']} failed, {report['achieved_tps']:.1f} tps "
+        f"(target {args.rate:g})"
+    )
+    print(
+        "latency "
+        + "  ".join(
+            f"{key} {_format(report[key])}"
+            for key in [f"p{p}" for p in PERCENTILES] + ["max"]
+        )
+    )
+    for name, count in report["errors"].items():
+        print(f"error {name}: {count}")
+    for key, count in report.get("http", {}).items():
+        print(f"http {key}: {count}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 0
+
+
+def _format(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    return f"{seconds * 1e3:.1f}ms"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
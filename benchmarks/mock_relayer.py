@@ -0,0 +1,420 @@
+"""
+Mock relayer serving the relayer API over HTTP, for load tests and end to end tests
+
+    python benchmarks/mock_relayer.py --port 8080 --latency-ms 50
+
+Latency, throttling, errors and the pace of state transitions are configurable, see
+MockRelayerConfig
+"""
+
+import argparse
+import hmac
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from py_builder_signing_sdk.signing.hmac import build_hmac_signature  # noqa: E402
+
+from py_builder_relayer_client.endpoints import (  # noqa: E402
+    GET_DEPLOYED,
+    GET_NONCE,
+    GET_RELAY_PAYLOAD,
+    GET_TRANSACTION,
+    GET_TRANSACTIONS,
+    SUBMIT_TRANSACTION,
+)
+from py_builder_relayer_client.models import (  # noqa: E402
+    RelayerTransactionState,
+    TransactionType,
+)
+
+# Draws a latency in seconds
+LatencyFn = Callable[[random.Random], float]
+
+BUILDER_HEADERS = (
+    "POLY_BUILDER_API_KEY",
+    "POLY_BUILDER_PASSPHRASE",
+    "POLY_BUILDER_SIGNATURE",
+    "POLY_BUILDER_TIMESTAMP",
+)
+DEFAULT_RELAY_ADDRESS = "0x7db63fe6d62eb73fb01f8009416f4c2bb4fbda6a"
+
+
+def constant(seconds: float) -> LatencyFn:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyFn:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> LatencyFn:
+    """
+    Long tailed latency, half the draws are below median
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclass
+class MockRelayerConfig:
+    """
+    Behaviour of a MockRelayer
+    Latencies are drawn per request from the distribution of its path, or
+    default_latency. Injected faults apply to the paths in fault_paths, every path
+    when it is None. A submitted transaction is STATE_NEW until mined_after seconds
+    have passed, then STATE_MINED (or STATE_FAILED, with fail_rate) and STATE_CONFIRMED
+    from confirmed_after seconds
+    """
+
+    latency: Dict[str, LatencyFn] = field(default_factory=dict)
+    default_latency: LatencyFn = constant(0.0)
+    # Probability of answering a 500
+    error_rate: float = 0.0
+    # Probability of answering a 429, with a Retry-After header when retry_after is set
+    throttle_rate: float = 0.0
+    retry_after: Optional[float] = None
+    fault_paths: Optional[FrozenSet[str]] = None
+    mined_after: float = 1.0
+    confirmed_after: float = 2.0
+    fail_rate: float = 0.0
+    # Safes reported as deployed before any SAFE-CREATE is submitted
+    deployed_by_default: bool = True
+    # Verifies the builder HMAC of submits against the raw body when set
+    builder_secret: Optional[str] = None
+    relay_address: str = DEFAULT_RELAY_ADDRESS
+    seed: Optional[int] = None
+
+
+class _Transaction:
+    __slots__ = ("request", "record", "submitted_at", "created", "failed")
+
+    def __init__(self, request: dict, record: dict, failed: bool):
+        self.request = request
+        self.record = record
+        self.submitted_at = time.monotonic()
+        self.created = datetime.now(timezone.utc)
+        self.failed = failed
+
+
+class MockRelayer:
+    """
+    In process stand-in for the relayer API, for load tests and end to end tests
+    Serves the nonce, relay payload, deployed, submit and transaction endpoints from
+    memory on a local port, with the latencies and faults of its config
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockRelayerConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config if config is not None else MockRelayerConfig()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._transactions: Dict[str, _Transaction] = {}
+        self._order: List[str] = []
+        self._nonces: Dict[Tuple[str, str], int] = {}
+        self._deployed: Dict[str, bool] = {}
+        self._counts: Counter = Counter()
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.relayer = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockRelayer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name="mock-relayer",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def counts(self) -> Dict[Tuple[str, int], int]:
+        """
+        Requests served by (path, status code)
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def transactions(self) -> List[dict]:
+        """
+        Every submitted transaction in submission order, as the relayer lists it
+        """
+        with self._lock:
+            return [self._render(self._transactions[tid]) for tid in self._order]
+
+    def set_deployed(self, safe_address: str, deployed: bool = True):
+        with self._lock:
+            self._deployed[safe_address.lower()] = deployed
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, str], headers, body: bytes
+    ) -> Tuple[int, object, Dict[str, str]]:
+        """
+        Returns the status, JSON payload and extra headers answering a request
+        """
+        config = self.config
+        with self._lock:
+            latency = config.latency.get(path, config.default_latency)(self._rng)
+            fault = None
+            if config.fault_paths is None or path in config.fault_paths:
+                draw = self._rng.random()
+                if draw < config.throttle_rate:
+                    fault = 429
+                elif draw < config.throttle_rate + config.error_rate:
+                    fault = 500
+        if latency > 0:
+            time.sleep(latency)
+
+        if fault == 429:
+            extra = {}
+            if config.retry_after is not None:
+                extra["Retry-After"] = str(config.retry_after)
+            return 429, {"error": "too many requests"}, extra
+        if fault == 500:
+            return 500, {"error": "injected error"}, {}
+
+        route = (method, path)
+        if route == ("GET", GET_NONCE):
+            return 200, {"nonce": str(self._nonce(query))}, {}
+        if route == ("GET", GET_RELAY_PAYLOAD):
+            return (
+                200,
+                {"address": config.relay_address, "nonce": str(self._nonce(query))},
+                {},
+            )
+        if route == ("GET", GET_DEPLOYED):
+            return 200, {"deployed": self._is_deployed(query.get("address"))}, {}
+        if route == ("GET", GET_TRANSACTION):
+            with self._lock:
+                txn = self._transactions.get(query.get("id"))
+                return 200, [self._render(txn)] if txn is not None else [], {}
+        if route == ("GET", GET_TRANSACTIONS):
+            return 200, self._list(query), {}
+        if route == ("POST", SUBMIT_TRANSACTION):
+            return self._submit(path, headers, body)
+        return 404, {"error": f"no route for {method} {path}"}, {}
+
+    def _count(self, path: str, status: int):
+        with self._lock:
+            self._counts[(path, status)] += 1
+
+    def _nonce(self, query: Dict[str, str]) -> int:
+        key = ((query.get("address") or "").lower(), query.get("type") or "")
+        with self._lock:
+            return self._nonces.get(key, 0)
+
+    def _is_deployed(self, address: Optional[str]) -> bool:
+        with self._lock:
+            return self._deployed.get(
+                (address or "").lower(), self.config.deployed_by_default
+            )
+
+    def _list(self, query: Dict[str, str]) -> List[dict]:
+        with self._lock:
+            ids = self._order
+            if "limit" in query:
+                offset = int(query.get("offset", 0))
+                ids = ids[offset : offset + int(query["limit"])]
+            return [self._render(self._transactions[tid]) for tid in ids]
+
+    def _submit(self, path: str, headers, body: bytes):
+        missing = [h for h in BUILDER_HEADERS if not headers.get(h)]
+        if missing:
+            return 401, {"error": f"missing builder headers: {missing}"}, {}
+        if self.config.builder_secret is not None:
+            expected = build_hmac_signature(
+                self.config.builder_secret,
+                headers["POLY_BUILDER_TIMESTAMP"],
+                "POST",
+                path,
+                body.decode("utf-8"),
+            )
+            if not hmac.compare_digest(expected, headers["POLY_BUILDER_SIGNATURE"]):
+                return 401, {"error": "invalid builder signature"}, {}
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return 400, {"error": "invalid JSON body"}, {}
+        if not isinstance(request, dict) or not all(
+            request.get(k) for k in ("type", "from", "signature")
+        ):
+            return 400, {"error": "invalid transaction request"}, {}
+
+        transaction_id = str(uuid.uuid4())
+        transaction_hash = "0x" + uuid.uuid4().hex + uuid.uuid4().hex
+        with self._lock:
+            failed = self._rng.random() < self.config.fail_rate
+            record = {
+                "transactionID": transaction_id,
+                "transactionHash": transaction_hash,
+                "from": request.get("from"),
+                "to": request.get("to"),
+                "proxyAddress": request.get("proxyWallet"),
+                "data": request.get("data"),
+                "nonce": request.get("nonce"),
+                "value": request.get("value"),
+                "signature": request.get("signature"),
+                "type": request.get("type"),
+                "owner": request.get("from"),
+                "metadata": request.get("metadata"),
+            }
+            self._transactions[transaction_id] = _Transaction(request, record, failed)
+            self._order.append(transaction_id)
+            self._advance_nonce(request)
+            if request.get("type") == TransactionType.SAFE_CREATE.value:
+                self._deployed[(request.get("proxyWallet") or "").lower()] = True
+        return (
+            200,
+            {
+                "transactionID": transaction_id,
+                "transactionHash": transaction_hash,
+                "state": RelayerTransactionState.STATE_NEW.value,
+            },
+            {},
+        )
+
+    def _advance_nonce(self, request: dict):
+        nonce = request.get("nonce")
+        if nonce is None or not str(nonce).isdigit():
+            return
+        key = ((request.get("from") or "").lower(), request.get("type") or "")
+        self._nonces[key] = max(self._nonces.get(key, 0), int(nonce) + 1)
+
+    def _render(self, txn: _Transaction) -> dict:
+        elapsed = time.monotonic() - txn.submitted_at
+        state, changed_after = RelayerTransactionState.STATE_NEW.value, 0.0
+        if elapsed >= self.config.confirmed_after and not txn.failed:
+            state = RelayerTransactionState.STATE_CONFIRMED.value
+            changed_after = self.config.confirmed_after
+        elif elapsed >= self.config.mined_after:
+            state = (
+                RelayerTransactionState.STATE_FAILED.value
+                if txn.failed
+                else RelayerTransactionState.STATE_MINED.value
+            )
+            changed_after = self.config.mined_after
+        return dict(
+            txn.record,
+            state=state,
+            createdAt=_timestamp(txn.created),
+            updatedAt=_timestamp(txn.created + timedelta(seconds=changed_after)),
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, as the relayer's clients pool their connections
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        relayer: MockRelayer = self.server.relayer
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            status, payload, extra = relayer.handle(
+                method, url.path, query, self.headers, body
+            )
+        except Exception:
+            relayer.logger.exception("Mock relayer failed on %s %s", method, self.path)
+            status, payload, extra = 500, {"error": "mock relayer failure"}, {}
+        relayer._count(url.path, status)
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        self.server.relayer.logger.debug(format, *args)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serves a mock relayer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="median request latency"
+    )
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float)
+    parser.add_argument("--mined-after", type=float, default=1.0)
+    parser.add_argument("--confirmed-after", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    config = MockRelayerConfig(
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        mined_after=args.mined_after,
+        confirmed_after=args.confirmed_after,
+    )
+    if args.latency_ms > 0:
+        config.default_latency = lognormal(args.latency_ms / 1000, args.latency_sigma)
+    relayer = MockRelayer(config, args.host, args.port)
+    print(f"mock relayer listening on {relayer.url}")
+    try:
+        relayer._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        relayer._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+import asyncio
+import time
+from functools import partial
+from typing import List, Optional
+
+from py_builder_signing_sdk.config import BuilderConfig
+from py_builder_signing_sdk.sdk_types import BuilderType
+
+from .client import BaseRelayClient
+from .http_helpers.helpers import POST, HttpClient, encode_json
+from .http_helpers.async_helpers import AsyncHttpClient
+from .models import (
+    SafeTransaction,
+    TransactionType,
+    RelayerTxType,
+    RelayPayload,
+    ProxyTransaction,
+)
+from .exceptions import RelayerApiException, RelayerClientException
+from .instrumentation import Instrumentation, propagate, span
+from .metrics import MetricsRegistry
+from .endpoints import (
+    GET_NONCE,
+    GET_RELAY_PAYLOAD,
+    GET_DEPLOYED,
+    GET_TRANSACTION,
+    GET_TRANSACTIONS,
+    SUBMIT_TRANSACTION,
+)
+from .response import AsyncClientRelayerTransactionResponse
+from .polling import DEFAULT_WAIT_TIMEOUT, PollSchedule
+
+
+class AsyncRelayClient(BaseRelayClient):
+    """
+    Asyncio client for the Polymarket Relayer
+    Same surface as RelayClient, every network call is awaitable
+    """
+
+    def __init__(
+        self,
+        relayer_url,
+        chain_id: int,
+        private_key: str = None,
+        builder_config: BuilderConfig = None,
+        relayer_tx_type: RelayerTxType = RelayerTxType.SAFE,
+        rpc_url: Optional[str] = None,
+        http_client: Optional[AsyncHttpClient] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        super().__init__(
+            relayer_url,
+            chain_id,
+            private_key=private_key,
+            builder_config=builder_config,
+            relayer_tx_type=relayer_tx_type,
+            rpc_url=rpc_url,
+            http_client=http_client,
+            instrumentation=instrumentation,
+            metrics=metrics,
+        )
+        self._nonce_sync_lock = None
+
+    def _new_http_client(self, metrics: Optional[MetricsRegistry]) -> AsyncHttpClient:
+        return AsyncHttpClient(metrics=metrics)
+
+    def _blocking_http_client(self) -> Optional[HttpClient]:
+        # Gas estimates run on executor threads, through the pool behind a
+        # thread pool transport and the process wide client behind aiohttp
+        return self.http_client.blocking_client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.http_client.close()
+
+    async def get_nonce(self, signer_address: str, signer_type: str):
+        """
+        Gets the nonce for the signer
+        """
+        return await self._get_request(
+            GET_NONCE, f"?address={signer_address}&type={signer_type}"
+        )
+
+    async def get_relay_payload(
+        self, signer_address: str, signer_type: str
+    ) -> RelayPayload:
+        """
+        Gets the relay payload (relay address and nonce) for the signer
+        """
+        payload = await self._get_request(
+            GET_RELAY_PAYLOAD, f"?address={signer_address}&type={signer_type}"
+        )
+        return self._parse_relay_payload(payload)
+
+    async def get_transaction(self, transaction_id: str):
+        """
+        Gets the transaction given the transaction_id
+        """
+        return await self._get_request(GET_TRANSACTION, f"?id={transaction_id}")
+
+    async def get_transactions(self):
+        """
+        Gets all transactions for the builder
+        """
+        return await self._get_request(GET_TRANSACTIONS)
+
+    async def get_deployed(self, safe_address) -> bool:
+        """
+        Returns a boolean that indicates if a safe is deployed
+        """
+        deployed = self.deployment_cache.get(safe_address)
+        if deployed is not None:
+            return deployed
+
+        deployed_payload = await self._get_request(
+            GET_DEPLOYED, f"?address={safe_address}"
+        )
+        deployed = self._parse_deployed(deployed_payload)
+        self.deployment_cache.seed(safe_address, deployed)
+        return deployed
+
+    async def execute(self, transactions: list[SafeTransaction], metadata: str = None):
+        """
+        Executes a batch of transactions
+        Automatically routes to executeProxyTransactions or executeSafeTransactions based on relayer_tx_type
+        """
+        if self.relayer_tx_type == RelayerTxType.PROXY:
+            return await self.executeProxyTransactions(transactions, metadata)
+        else:
+            return await self.executeSafeTransactions(transactions, metadata)
+
+    async def executeProxyTransactions(
+        self, transactions: list[ProxyTransaction], metadata: str = None
+    ):
+        """
+        Executes a batch of proxy transactions
+        """
+        self.assert_signer_needed()
+        self.assert_builder_creds_needed()
+        self.assert_proxy_configured()
+
+        self.logger.debug("Executing proxy transactions...")
+        with self.tracer.span(
+            "execute", tx_type=RelayerTxType.PROXY.value, batch_size=len(transactions)
+        ):
+            start = time.time()
+            from_address = self.signer.address()
+
+            # Fetch the relay payload while the calls are encoded and their gas
+            # estimated, a blocking RPC call kept off the event loop
+            loop = asyncio.get_running_loop()
+            relay_payload, args = await asyncio.gather(
+                _timed(
+                    "preflight.relay_payload",
+                    self.get_relay_payload(from_address, TransactionType.PROXY.value),
+                ),
+                loop.run_in_executor(
+                    None,
+                    propagate(self._prepare_proxy_args),
+                    from_address,
+                    transactions,
+                ),
+            )
+            txn_request = self._build_proxy_request(
+                from_address, relay_payload, transactions, metadata, args=args
+            )
+
+            self.logger.debug(
+                "Client side proxy request creation took: %.3f seconds",
+                time.time() - start,
+            )
+            self.logger.debug("Created transaction request: %s", txn_request)
+
+            resp = await self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
+            self._count_submit(txn_request)
+        return AsyncClientRelayerTransactionResponse(
+            resp.get("transactionID"),
+            resp.get("transactionHash"),
+            self,
+        )
+
+    async def executeSafeTransactions(
+        self, transactions: list[SafeTransaction], metadata: str = None
+    ):
+        """
+        Executes a batch of safe transactions
+        """
+        self.assert_signer_needed()
+        self.assert_builder_creds_needed()
+
+        with self.tracer.span(
+            "execute", tx_type=RelayerTxType.SAFE.value, batch_size=len(transactions)
+        ):
+            start = time.time()
+            safe_address = self.get_expected_safe()
+            from_address = self.signer.address()
+
+            # The deployment check, the nonce reservation and the aggregation are
+            # independent
+            loop = asyncio.get_running_loop()
+            deployed, nonce, transaction = await asyncio.gather(
+                _timed("preflight.deployed", self.get_deployed(safe_address)),
+                _timed("preflight.nonce", self._reserve_nonce(from_address)),
+                loop.run_in_executor(
+                    None, propagate(self._aggregate_safe_transactions), transactions
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(nonce, BaseException):
+                raise nonce
+            for result in (deployed, transaction):
+                if isinstance(result, BaseException):
+                    self.nonce_manager.release(nonce)
+                    raise result
+            if not deployed:
+                self.nonce_manager.release(nonce)
+                raise RelayerClientException(
+                    f"expected safe {safe_address} is not deployed"
+                )
+
+            try:
+                txn_request = self._build_safe_request(
+                    from_address, str(nonce), [transaction], metadata
+                )
+
+                self.logger.debug(
+                    "Client side safe request creation took: %.3f seconds",
+                    time.time() - start,
+                )
+                self.logger.debug("Created transaction request: %s", txn_request)
+
+                resp = await self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
+                self._count_submit(txn_request)
+            except Exception:
+                self.nonce_manager.release(nonce)
+                raise
+            self.nonce_manager.confirm(nonce)
+        return AsyncClientRelayerTransactionResponse(
+            resp.get("transactionID"),
+            resp.get("transactionHash"),
+            self,
+        )
+
+    async def deploy(self):
+        self.assert_signer_needed()
+        self.assert_builder_creds_needed()
+
+        with self.tracer.span("deploy", tx_type=TransactionType.SAFE_CREATE.value):
+            safe_address = self.get_expected_safe()
+            deployed = await _timed(
+                "preflight.deployed", self.get_deployed(safe_address)
+            )
+            if deployed:
+                raise RelayerClientException(
+                    f"safe {safe_address} is already deployed!"
+                )
+
+            txn_request = self._build_deploy_request()
+
+            self.logger.debug("Created transaction request: %s", txn_request)
+            resp = await self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
+            self._count_submit(txn_request)
+            # The safe is being deployed, stop serving the cached negative result
+            self.deployment_cache.invalidate(safe_address)
+
+        return AsyncClientRelayerTransactionResponse(
+            resp.get("transactionID"),
+            resp.get("transactionHash"),
+            self,
+        )
+
+    async def poll_until_state(
+        self,
+        transaction_id: str,
+        states: List[str],
+        fail_state: str,
+        max_polls: Optional[int] = None,
+        poll_frequency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        submitted_at: Optional[float] = None,
+    ):
+        """
+        Polls the transaction until it reaches one of the states, fails or times out
+        See RelayClient.poll_until_state
+        """
+        if poll_frequency is not None and poll_frequency <= 0:
+            raise ValueError("poll_frequency must be positive")
+        target_states = set(list(states))
+        started = time.monotonic()
+        deadline = started + (timeout if timeout is not None else DEFAULT_WAIT_TIMEOUT)
+        schedule = PollSchedule(self.transition_timings, target_states)
+        observed = set()
+
+        self.logger.debug(
+            "Waiting for transaction %s matching states: %s...",
+            transaction_id,
+            target_states,
+        )
+
+        with self.tracer.span("wait", transaction_id=transaction_id) as wait_span:
+            polls = 0
+            while max_polls is None or polls < max_polls:
+                with span("poll") as poll_span:
+                    transactions = await self.get_transaction(transaction_id)
+                    poll_span.set_attribute(
+                        "state", transactions[0].get("state") if transactions else None
+                    )
+                polls += 1
+                wait_span.set_attribute("polls", polls)
+                done, txn = self._observe_poll(
+                    transaction_id,
+                    transactions,
+                    target_states,
+                    fail_state,
+                    observed,
+                    submitted_at,
+                )
+                if done:
+                    self._observe_wait(polls, submitted_at, txn)
+                    return txn
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                delay = self._next_poll_delay(
+                    schedule, poll_frequency, submitted_at or started
+                )
+                await asyncio.sleep(min(delay, remaining))
+
+        self._observe_wait(polls, submitted_at, None)
+
+        self.logger.info(
+            "Transaction %s not found or not in given states, timing out!",
+            transaction_id,
+        )
+        return None
+
+    async def _reserve_nonce(self, from_address: str) -> int:
+        nonce = self.nonce_manager.reserve()
+        if nonce is not None:
+            return nonce
+        # Concurrent coroutines share a single nonce fetch
+        if self._nonce_sync_lock is None:
+            self._nonce_sync_lock = asyncio.Lock()
+        async with self._nonce_sync_lock:
+            nonce = self.nonce_manager.reserve()
+            if nonce is None:
+                nonce_payload = await self.get_nonce(
+                    from_address, TransactionType.SAFE.value
+                )
+                nonce = self.nonce_manager.sync(
+                    self._parse_nonce(nonce_payload), reserve=True
+                )
+        return nonce
+
+    async def _get_request(self, request_path: str, query: str = ""):
+        return await self.http_client.get(
+            f"{self.relayer_url}{request_path}{query}",
+            timeout=self.http_client.timeout_for(request_path),
+        )
+
+    async def _post_request(self, method: str, request_path: str, body: dict = None):
+        # Serialized once, the builder signature covers the bytes sent
+        payload = encode_json(body) if body is not None else None
+        if self.builder_config.get_builder_type() == BuilderType.REMOTE:
+            # Remote builder signing is a blocking HTTP call
+            loop = asyncio.get_running_loop()
+            builder_headers = await loop.run_in_executor(
+                None,
+                propagate(
+                    partial(
+                        self._generate_builder_headers, method, request_path, payload
+                    )
+                ),
+            )
+        else:
+            builder_headers = self._generate_builder_headers(
+                method, request_path, payload
+            )
+        if builder_headers is None:
+            raise RelayerClientException("could not generate builder headers")
+        with span("http.submit", path=request_path) as http_span:
+            try:
+                resp = await self.http_client.post(
+                    f"{self.relayer_url}{request_path}",
+                    headers=builder_headers,
+                    data=payload,
+                    timeout=self.http_client.timeout_for(request_path),
+                )
+            except RelayerApiException as e:
+                http_span.set_attribute("status_code", e.status_code)
+                raise
+            http_span.set_attribute("status_code", 200)
+        return resp
+
+
+async def _timed(name: str, awaitable):
+    with span(name):
+        return await awaitable
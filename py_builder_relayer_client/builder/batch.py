@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..config import ContractConfig
+from ..models import ProxyTransactionArgs, SafeTransactionArgs, TransactionRequest
+from ..signer import Signer
+from .proxy import build_proxy_transaction_request, prefetch_gas_limits
+from .safe import build_safe_transaction_request
+
+
+@dataclass
+class BatchJob:
+    """
+    A single request to build and sign
+    """
+
+    signer: Signer
+    args: Union[SafeTransactionArgs, ProxyTransactionArgs]
+    metadata: Optional[str] = None
+
+
+# Signers of the current worker process, keyed by their index in the batch
+_worker_signers: Dict[int, Signer] = {}
+_worker_config: Optional[ContractConfig] = None
+
+
+def build_transaction_requests(
+    jobs: List[BatchJob],
+    config: ContractConfig,
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> List[TransactionRequest]:
+    """
+    Builds and signs SAFE and PROXY transaction requests across a process pool
+    Results are returned in the input order. Private keys are sent once to each worker
+    when it starts, jobs only carry the index of their signer
+    """
+    if not jobs:
+        return []
+
+    jobs = _with_gas_limits(jobs, config)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        return [_build(job.signer, job.args, job.metadata, config) for job in jobs]
+
+    signer_indexes: Dict[int, int] = {}
+    signer_params: List[Tuple[str, int, Optional[str]]] = []
+    tasks = []
+    for job in jobs:
+        index = signer_indexes.get(id(job.signer))
+        if index is None:
+            index = len(signer_params)
+            signer_indexes[id(job.signer)] = index
+            signer_params.append(
+                (job.signer.private_key, job.signer.chain_id, job.signer.rpc_url)
+            )
+        tasks.append((index, job.args, job.metadata))
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(signer_params, config),
+    ) as executor:
+        return list(executor.map(_build_task, tasks, chunksize=chunksize))
+
+
+def _with_gas_limits(jobs: List[BatchJob], config: ContractConfig) -> List[BatchJob]:
+    """
+    Estimates the gas of the PROXY jobs without a gas limit in one RPC batch per signer
+    Jobs whose estimate fails are left as is and fall back when they are built
+    """
+    pending: Dict[int, List[int]] = {}
+    for i, job in enumerate(jobs):
+        if isinstance(job.args, ProxyTransactionArgs) and (
+            not job.args.gas_limit or job.args.gas_limit == "0"
+        ):
+            pending.setdefault(id(job.signer), []).append(i)
+    if not pending:
+        return jobs
+
+    jobs = list(jobs)
+    for indexes in pending.values():
+        signer = jobs[indexes[0]].signer
+        if not prefetch_gas_limits(signer, [jobs[i].args for i in indexes], config):
+            continue
+        for i in indexes:
+            args = jobs[i].args
+            gas_limit = signer.gas_estimator.get(
+                args.from_address, config.proxy_factory, args.data
+            )
+            if gas_limit is None:
+                continue
+            jobs[i] = replace(jobs[i], args=replace(args, gas_limit=str(gas_limit)))
+    return jobs
+
+
+def _init_worker(signer_params, config: ContractConfig):
+    global _worker_config
+    _worker_config = config
+    _worker_signers.clear()
+    for index, (private_key, chain_id, rpc_url) in enumerate(signer_params):
+        _worker_signers[index] = Signer(private_key, chain_id, rpc_url=rpc_url)
+
+
+def _build_task(task) -> TransactionRequest:
+    index, args, metadata = task
+    return _build(_worker_signers[index], args, metadata, _worker_config)
+
+
+def _build(
+    signer: Signer,
+    args: Union[SafeTransactionArgs, ProxyTransactionArgs],
+    metadata: Optional[str],
+    config: ContractConfig,
+) -> TransactionRequest:
+    if isinstance(args, SafeTransactionArgs):
+        return build_safe_transaction_request(signer, args, config, metadata)
+    if isinstance(args, ProxyTransactionArgs):
+        return build_proxy_transaction_request(signer, args, config, metadata)
+    raise ValueError(f"Unsupported transaction args: {type(args).__name__}")
@@ -10,6 +10,7 @@ from ..models import (
     TransactionRequest,
 )
 from ..config import ContractConfig
+from ..instrumentation import span
 from ..model.create_proxy import CreateProxy
 
 
@@ -21,10 +22,12 @@ def create_safe_create_signature(
     payment: str,
     payment_receiver: str,
 ) -> str:
-    struct_hash = create_safe_create_struct_hash(
-        safe_factory, chain_id, payment_token, payment, payment_receiver
-    )
-    sig = signer.sign(struct_hash)
+    with span("hash_struct"):
+        struct_hash = create_safe_create_struct_hash(
+            safe_factory, chain_id, payment_token, payment, payment_receiver
+        )
+    with span("sign"):
+        sig = signer.sign(struct_hash)
     return sig
 
 
@@ -55,7 +58,8 @@ def build_safe_create_transaction_request(
     config: ContractConfig,
 ):
     factory = config.safe_factory
-    safe_address = derive(args.from_address, factory)
+    with span("derive_address"):
+        safe_address = derive(args.from_address, factory)
 
     sig = create_safe_create_signature(
         signer,
@@ -1,8 +1,16 @@
+from functools import lru_cache
+from typing import Iterable, Iterator
+
 from eth_abi import encode
 from eth_utils import to_bytes, to_checksum_address, keccak
 
 from ..constants.constants import SAFE_INIT_CODE_HASH
 
+DERIVE_CACHE_SIZE = 4096
+
+# abi.encode(address) left pads the 20 address bytes to a 32 byte word
+ADDRESS_PADDING = bytes(12)
+
 
 def get_create2_address(bytecode_hash: str, from_address: str, salt: bytes) -> str:
     # Remove 0x prefix if present
@@ -24,6 +32,7 @@ def get_create2_address(bytecode_hash: str, from_address: str, salt: bytes) -> s
     return to_checksum_address(address)
 
 
+@lru_cache(maxsize=DERIVE_CACHE_SIZE)
 def derive(address: str, safe_factory: str) -> str:
     address = to_checksum_address(address)
     safe_factory = to_checksum_address(safe_factory)
@@ -33,3 +42,32 @@ def derive(address: str, safe_factory: str) -> str:
         bytecode_hash=SAFE_INIT_CODE_HASH, from_address=safe_factory, salt=salt
     )
     return to_checksum_address(safe_address)
+
+
+def derive_many(addresses: Iterable[str], safe_factory: str) -> Iterator[str]:
+    """
+    Derives the safe of every address, yielding the results in input order
+    The CREATE2 prefix and init code hash are computed once for the whole batch
+    """
+    prefix = create2_prefix(safe_factory)
+    init_code_hash = to_bytes(hexstr=SAFE_INIT_CODE_HASH)
+    for address in addresses:
+        salt = keccak(ADDRESS_PADDING + address_to_bytes(address))
+        yield to_checksum_address(keccak(prefix + salt + init_code_hash)[12:])
+
+
+def create2_prefix(factory: str) -> bytes:
+    """
+    Returns the constant 0xff + factory prefix of a CREATE2 address preimage
+    """
+    return b"\xff" + address_to_bytes(factory)
+
+
+def address_to_bytes(address: str) -> bytes:
+    """
+    Converts a hex address to its 20 bytes
+    """
+    address_bytes = bytes.fromhex(address[2:] if address.startswith("0x") else address)
+    if len(address_bytes) != 20:
+        raise ValueError(f"Invalid address: {address}")
+    return address_bytes
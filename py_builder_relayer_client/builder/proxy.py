@@ -1,4 +1,6 @@
-from typing import List, Optional
+import logging
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional
 
 from eth_abi import encode
 from eth_abi.packed import encode_packed
@@ -6,6 +8,7 @@ from eth_utils import keccak, to_bytes, to_checksum_address, to_hex
 
 from ..config import ContractConfig
 from ..constants.constants import PROXY_INIT_CODE_HASH
+from ..instrumentation import span
 from ..models import (
     ProxyTransactionArgs,
     SignatureParams,
@@ -13,11 +16,19 @@ from ..models import (
     TransactionType,
 )
 from ..signer import Signer
-from .derive import get_create2_address
+from .derive import (
+    DERIVE_CACHE_SIZE,
+    address_to_bytes,
+    create2_prefix,
+    get_create2_address,
+)
 
 DEFAULT_GAS_LIMIT = 10_000_000
 
+logger = logging.getLogger(__name__)
+
 
+@lru_cache(maxsize=DERIVE_CACHE_SIZE)
 def derive_proxy(address: str, proxy_factory: str) -> str:
     """
     Derive proxy wallet address from signer address and proxy factory
@@ -34,6 +45,18 @@ def derive_proxy(address: str, proxy_factory: str) -> str:
     return to_checksum_address(proxy_address)
 
 
+def derive_proxy_many(addresses: Iterable[str], proxy_factory: str) -> Iterator[str]:
+    """
+    Derive the proxy wallet of every address, yielding the results in input order
+    The CREATE2 prefix and init code hash are computed once for the whole batch
+    """
+    prefix = create2_prefix(proxy_factory)
+    init_code_hash = to_bytes(hexstr=PROXY_INIT_CODE_HASH)
+    for address in addresses:
+        salt = keccak(address_to_bytes(address))
+        yield to_checksum_address(keccak(prefix + salt + init_code_hash)[12:])
+
+
 def create_struct_hash(
     from_addr: str,
     to_addr: str,
@@ -112,20 +135,42 @@ def get_gas_limit(signer: Signer, to: str, args: ProxyTransactionArgs) -> str:
 
     try:
         # Try to estimate gas if RPC URL is available
-        gas_limit_bigint = signer.estimate_gas(
-            from_address=args.from_address,
-            to=to,
-            data=args.data,
-        )
+        with span("gas_estimate"):
+            gas_limit_bigint = signer.estimate_gas(
+                from_address=args.from_address,
+                to=to,
+                data=args.data,
+            )
         return str(gas_limit_bigint)
     except (ValueError, AttributeError) as e:
         # If estimation fails (no RPC URL or RPC error), use default
-        print(
-            f"Error estimating gas for proxy transaction, using default gas limit: {e}"
+        logger.warning(
+            "Error estimating gas for proxy transaction, using default gas limit: %s",
+            e,
         )
         return str(DEFAULT_GAS_LIMIT)
 
 
+def prefetch_gas_limits(
+    signer: Signer, args: Iterable[ProxyTransactionArgs], config: ContractConfig
+) -> int:
+    """
+    Estimates the gas of every proxy transaction without a gas limit in one RPC batch
+    The estimates are cached by the signer's gas estimator and picked up when each
+    request is built. Returns how many estimates are available
+    """
+    if config.proxy_factory is None or signer.rpc_url is None:
+        return 0
+    calls = [
+        (a.from_address, config.proxy_factory, a.data)
+        for a in args
+        if not a.gas_limit or a.gas_limit == "0"
+    ]
+    if not calls:
+        return 0
+    return signer.gas_estimator.prefetch(calls)
+
+
 def build_proxy_transaction_request(
     signer: Signer,
     args: ProxyTransactionArgs,
@@ -142,7 +187,8 @@ def build_proxy_transaction_request(
 
     proxy_wallet_factory = config.proxy_factory
     to = proxy_wallet_factory
-    proxy = derive_proxy(args.from_address, proxy_wallet_factory)
+    with span("derive_address"):
+        proxy = derive_proxy(args.from_address, proxy_wallet_factory)
     relayer_fee = "0"
     relay_hub = config.relay_hub
     gas_limit_str = get_gas_limit(signer, to, args)
@@ -155,19 +201,21 @@ def build_proxy_transaction_request(
         relay=args.relay,
     )
 
-    tx_hash = create_struct_hash(
-        args.from_address,
-        to,
-        args.data,
-        relayer_fee,
-        args.gas_price,
-        gas_limit_str,
-        args.nonce,
-        relay_hub,
-        args.relay,
-    )
+    with span("hash_struct"):
+        tx_hash = create_struct_hash(
+            args.from_address,
+            to,
+            args.data,
+            relayer_fee,
+            args.gas_price,
+            gas_limit_str,
+            args.nonce,
+            relay_hub,
+            args.relay,
+        )
 
-    sig = create_proxy_signature(signer, tx_hash)
+    with span("sign"):
+        sig = create_proxy_signature(signer, tx_hash)
 
     if metadata is None:
         metadata = ""
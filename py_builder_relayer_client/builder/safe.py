@@ -1,6 +1,7 @@
+from functools import lru_cache
 from typing import List
-from poly_eip712_structs import make_domain
 from eth_abi.packed import encode_packed
+from eth_utils import keccak, to_bytes
 from hexbytes import HexBytes
 
 from ..config import ContractConfig
@@ -14,10 +15,23 @@ from ..models import (
     TransactionType,
 )
 from ..encode.safe import create_safe_multisend_transaction
-from .derive import derive
+from .derive import ADDRESS_PADDING, address_to_bytes, derive
 from ..signer import Signer
-from ..model.safe_tx import SafeTx
 from ..constants.constants import ZERO_ADDRESS
+from ..instrumentation import span
+from ..utils.utils import prepend_zx
+
+# keccak256 of the EIP712 type strings, as generated by the model.safe_tx.SafeTx
+# struct and a make_domain(chainId, verifyingContract) domain
+SAFE_TX_TYPEHASH = keccak(
+    text=(
+        "SafeTx(address to,uint256 value,bytes data,uint8 operation,uint256 safeTxGas,"
+        "uint256 baseGas,uint256 gasPrice,address gasToken,address refundReceiver,"
+        "uint256 nonce)"
+    )
+)
+DOMAIN_TYPEHASH = keccak(text="EIP712Domain(uint256 chainId,address verifyingContract)")
+DOMAIN_SEPARATOR_CACHE_SIZE = 1024
 
 
 def aggregate_transaction(
@@ -78,25 +92,45 @@ def create_struct_hash(
     gas_token: str,
     refund_receiver: str,
     nonce: str,
-) -> bytes:
+) -> str:
     """
     Creates a Safe struct hash
+    Encodes the SafeTx fields straight to bytes, equivalent to hashing the SafeTx model
     """
-    safe_tx = SafeTx(
-        to=to,
-        value=int(value),
-        data=data,
-        operation=operation.value,
-        safeTxGas=int(safe_tx_gas),
-        baseGas=int(base_gas),
-        gasPrice=int(gas_price),
-        gasToken=gas_token,
-        refundReceiver=refund_receiver,
-        nonce=int(nonce),
-    )
-    return safe_tx.generate_struct_hash(
-        make_domain(verifyingContract=safe, chainId=chain_id)
+    struct_hash = keccak(
+        SAFE_TX_TYPEHASH
+        + _encode_address(to)
+        + _encode_uint(value)
+        + keccak(to_bytes(hexstr=data))
+        + _encode_uint(operation.value, 8)
+        + _encode_uint(safe_tx_gas)
+        + _encode_uint(base_gas)
+        + _encode_uint(gas_price)
+        + _encode_address(gas_token)
+        + _encode_address(refund_receiver)
+        + _encode_uint(nonce)
     )
+    digest = keccak(b"\x19\x01" + get_domain_separator(safe, chain_id) + struct_hash)
+    return prepend_zx(digest.hex())
+
+
+@lru_cache(maxsize=DOMAIN_SEPARATOR_CACHE_SIZE)
+def get_domain_separator(safe: str, chain_id: int) -> bytes:
+    """
+    Returns the EIP712 domain separator of the safe
+    """
+    return keccak(DOMAIN_TYPEHASH + _encode_uint(chain_id) + _encode_address(safe))
+
+
+def _encode_address(address: str) -> bytes:
+    return ADDRESS_PADDING + address_to_bytes(address)
+
+
+def _encode_uint(value, bits: int = 256) -> bytes:
+    value = int(value)
+    # Validates the value fits in the uint type
+    value.to_bytes(bits // 8, "big")
+    return value.to_bytes(32, "big")
 
 
 def build_safe_transaction_request(
@@ -116,27 +150,29 @@ def build_safe_transaction_request(
     gas_price = "0"
     gas_token = ZERO_ADDRESS
     refund_receiver = ZERO_ADDRESS
-    safe_address = derive(args.from_address, factory)
+    with span("derive_address"):
+        safe_address = derive(args.from_address, factory)
 
     # generate the safe struct hash
-    struct_hash = create_struct_hash(
-        args.chain_id,
-        safe_address,
-        transaction.to,
-        transaction.value,
-        transaction.data,
-        transaction.operation,
-        safe_txn_gas,
-        base_gas,
-        gas_price,
-        gas_token,
-        refund_receiver,
-        args.nonce,
-    )
-
-    sig = create_safe_signature(signer, struct_hash)
-
-    packed_sig = split_and_pack_sig(sig)
+    with span("hash_struct"):
+        struct_hash = create_struct_hash(
+            args.chain_id,
+            safe_address,
+            transaction.to,
+            transaction.value,
+            transaction.data,
+            transaction.operation,
+            safe_txn_gas,
+            base_gas,
+            gas_price,
+            gas_token,
+            refund_receiver,
+            args.nonce,
+        )
+
+    with span("sign"):
+        sig = create_safe_signature(signer, struct_hash)
+        packed_sig = split_and_pack_sig(sig)
 
     sig_params = SignatureParams(
         gas_price=gas_price,
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_NEGATIVE_TTL = 5.0
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class DeploymentCache:
+    """
+    LRU cache of safe deployment status
+    A deployed safe never goes back to undeployed, so positive results are kept until
+    evicted while negative results expire after negative_ttl seconds
+    """
+
+    def __init__(
+        self,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # address -> expiry (None for deployed safes)
+        self._entries = OrderedDict()
+
+    def get(self, address: str) -> Optional[bool]:
+        """
+        Returns the cached deployment status, or None if unknown or expired
+        """
+        key = address.lower()
+        with self._lock:
+            if key not in self._entries:
+                return None
+            expiry = self._entries[key]
+            if expiry is None:
+                self._entries.move_to_end(key)
+                return True
+            if time.monotonic() < expiry:
+                return False
+            del self._entries[key]
+            return None
+
+    def seed(self, address: str, deployed: bool = True) -> None:
+        """
+        Records the deployment status of a safe
+        """
+        key = address.lower()
+        with self._lock:
+            if deployed:
+                self._entries[key] = None
+            elif self._entries.get(key, 0) is None:
+                # Never downgrade a safe known to be deployed
+                return
+            elif self.negative_ttl > 0:
+                self._entries[key] = time.monotonic() + self.negative_ttl
+            else:
+                return
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, address: Optional[str] = None) -> None:
+        """
+        Drops the cached status of a safe, or of every safe if no address is given
+        """
+        with self._lock:
+            if address is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(address.lower(), None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -1,19 +1,25 @@
 import logging
 import os
+import threading
 import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 
 from py_builder_signing_sdk.config import BuilderConfig
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from .signer import Signer
 from .config import get_contract_config
 from .constants.constants import ZERO_ADDRESS
-from .http_helpers.helpers import get, post, POST
+from .http_helpers.helpers import HttpClient, POST, encode_json
+from .http_helpers.json_stream import iter_json_array
 from .builder.derive import derive
-from .builder.safe import build_safe_transaction_request
+from .builder.safe import aggregate_transaction, build_safe_transaction_request
 from .builder.create import build_safe_create_transaction_request
-from .builder.proxy import build_proxy_transaction_request
+from .builder.proxy import build_proxy_transaction_request, get_gas_limit
 from .encode.proxy import encode_proxy_transaction_data
+from .encode.safe import create_safe_multisend_transactions
 from .models import (
     SafeTransaction,
     SafeTransactionArgs,
@@ -24,8 +30,14 @@ from .models import (
     ProxyTransactionArgs,
     ProxyTransaction,
     CallType,
+    RelayerTransactionRecord,
 )
-from .exceptions import RelayerClientException
+from .exceptions import RelayerApiException, RelayerClientException
+from .journal import TransactionJournal
+from .instrumentation import Instrumentation, Tracer, propagate, span
+from .metrics import MetricsRegistry, RelayerMetrics
+from .nonce import NonceManager
+from .cache import DeploymentCache
 from .endpoints import (
     GET_NONCE,
     GET_RELAY_PAYLOAD,
@@ -35,12 +47,23 @@ from .endpoints import (
     SUBMIT_TRANSACTION,
 )
 from .response import ClientRelayerTransactionResponse
+from .waiter import TransactionWaiter
+from .polling import (
+    DEFAULT_WAIT_TIMEOUT,
+    TRACKED_STATES,
+    PollSchedule,
+    TransitionTimings,
+)
+
+# Threads of the default executor running pre-flight reads
+DEFAULT_PREFLIGHT_WORKERS = 4
+# Guards iter_transactions against a relayer that never returns a short page
+DEFAULT_MAX_PAGES = 10_000
 
 
-class RelayClient:
+class BaseRelayClient:
     """
-    Client for the Polymarket Relayer
-    Authenticated with builder api key credentials
+    Transport agnostic state and request building shared by RelayClient and AsyncRelayClient
     """
 
     def __init__(
@@ -51,6 +74,9 @@ class RelayClient:
         builder_config: BuilderConfig = None,
         relayer_tx_type: RelayerTxType = RelayerTxType.SAFE,
         rpc_url: Optional[str] = None,
+        http_client: Optional[HttpClient] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ):
         self.relayer_url = (
             relayer_url[0:-1] if relayer_url.endswith("/") else relayer_url
@@ -59,90 +85,64 @@ class RelayClient:
         self.contract_config = get_contract_config(chain_id)
         self.relayer_tx_type = relayer_tx_type
 
+        # Submit and wait metrics, HTTP metrics are recorded by a transport created
+        # here or one given the same registry
+        self.metrics = RelayerMetrics(metrics) if metrics is not None else None
+
+        # Pooled transport shared by every call made through this client, closed
+        # with it unless it was given
+        self._owns_http_client = http_client is None
+        self.http_client = (
+            http_client if http_client is not None else self._new_http_client(metrics)
+        )
+
         # Use provided rpc_url, or fall back to environment variable
         rpc_url = rpc_url or os.getenv("RPC_URL")
 
         self.signer = None
         if private_key is not None:
-            self.signer = Signer(private_key, chain_id, rpc_url=rpc_url)
+            self.signer = Signer(
+                private_key,
+                chain_id,
+                rpc_url=rpc_url,
+                http_client=self._blocking_http_client(),
+            )
 
         self.builder_config = None
         if builder_config is not None:
             self.builder_config = builder_config
-        self.logger = logging.getLogger(self.__class__.__name__)
-
-    def get_nonce(self, signer_address: str, signer_type: str):
-        """
-        Gets the nonce for the signer
-        """
-        return get(
-            f"{self.relayer_url}{GET_NONCE}?address={signer_address}&type={signer_type}"
-        )
 
-    def get_relay_payload(self, signer_address: str, signer_type: str) -> RelayPayload:
-        """
-        Gets the relay payload (relay address and nonce) for the signer
-        """
-        payload = get(
-            f"{self.relayer_url}{GET_RELAY_PAYLOAD}?address={signer_address}&type={signer_type}"
-        )
-        if payload is None or payload.get("address") is None or payload.get("nonce") is None:
-            raise RelayerClientException("invalid relay payload received")
-        return RelayPayload(
-            address=payload.get("address"),
-            nonce=payload.get("nonce"),
-        )
+        # Local SAFE nonce reservations for the signer
+        self.nonce_manager = NonceManager()
+        # Deployment status of safes, deployed safes are remembered permanently
+        self.deployment_cache = DeploymentCache()
+        # Learned time from submission to each relayer state, drives poll scheduling
+        self.transition_timings = TransitionTimings()
+        # Durable record of submitted transactions, None unless configured
+        self.journal: Optional[TransactionJournal] = None
+        # Times the phases of executes, deploys and waits when a hook is installed
+        self.tracer = Tracer(instrumentation)
+        self.logger = logging.getLogger(self.__class__.__name__)
 
-    def get_transaction(self, transaction_id: str):
+    def _new_http_client(self, metrics: Optional[MetricsRegistry]):
         """
-        Gets the transaction given the transaction_id
+        Creates the transport of a client not given one
         """
-        return get(f"{self.relayer_url}{GET_TRANSACTION}?id={transaction_id}")
+        return HttpClient(metrics=metrics)
 
-    def get_transactions(self):
+    def _blocking_http_client(self) -> Optional[HttpClient]:
         """
-        Gets all transactions for the builder
+        Blocking transport of the signer's RPC calls, None for the process wide one
         """
-        return get(f"{self.relayer_url}{GET_TRANSACTIONS}")
+        return self.http_client
 
-    def get_deployed(self, safe_address) -> bool:
+    def _prepare_proxy_args(
+        self, from_address: str, transactions: list[ProxyTransaction]
+    ) -> ProxyTransactionArgs:
         """
-        Returns a boolean that indicates if a safe is deployed
+        Encodes the proxy calls and resolves their gas limit
+        Independent of the relay payload, so it can overlap with fetching it
         """
-        deployed_payload = get(
-            f"{self.relayer_url}{GET_DEPLOYED}?address={safe_address}"
-        )
-        if deployed_payload and deployed_payload.get("deployed"):
-            return bool(deployed_payload.get("deployed"))
-        return False
-
-    def execute(self, transactions: list[SafeTransaction], metadata: str = None):
-        """
-        Executes a batch of transactions
-        Automatically routes to executeProxyTransactions or executeSafeTransactions based on relayer_tx_type
-        """
-        if self.relayer_tx_type == RelayerTxType.PROXY:
-            return self.executeProxyTransactions(transactions, metadata)
-        else:
-            return self.executeSafeTransactions(transactions, metadata)
-
-    def executeProxyTransactions(self, transactions: list[ProxyTransaction], metadata: str = None):
-        """
-        Executes a batch of proxy transactions
-        """
-        self.assert_signer_needed()
-        self.assert_builder_creds_needed()
-
-        if self.contract_config.proxy_factory is None or self.contract_config.relay_hub is None:
-            raise RelayerClientException("Proxy contracts are not configured for this chain")
-
-        self.logger.debug("Executing proxy transactions...")
-        start = time.time()
-        from_address = self.signer.address()
-
-        # Get relay payload (relay address and nonce)
-        relay_payload = self.get_relay_payload(from_address, TransactionType.PROXY.value)
-
         # Convert SafeTransaction to ProxyTransaction
         proxy_transactions = [
             ProxyTransaction(
@@ -155,60 +155,58 @@ class RelayClient:
         ]
 
         # Encode proxy transaction data
-        encoded_data = encode_proxy_transaction_data(proxy_transactions)
+        with span("encode", batch_size=len(proxy_transactions)):
+            encoded_data = encode_proxy_transaction_data(proxy_transactions)
 
-        # Build ProxyTransactionArgs
         args = ProxyTransactionArgs(
             from_address=from_address,
             gas_price="0",
             data=encoded_data,
-            relay=relay_payload.address,
-            nonce=relay_payload.nonce,
+            relay=None,
+            nonce=None,
         )
+        args.gas_limit = get_gas_limit(
+            self.signer, self.contract_config.proxy_factory, args
+        )
+        return args
+
+    def _build_proxy_request(
+        self,
+        from_address: str,
+        relay_payload: RelayPayload,
+        transactions: list[ProxyTransaction],
+        metadata: str = None,
+        args: Optional[ProxyTransactionArgs] = None,
+    ) -> dict:
+        if args is None:
+            args = self._prepare_proxy_args(from_address, transactions)
 
         # Build proxy transaction request
-        txn_request = build_proxy_transaction_request(
+        return build_proxy_transaction_request(
             signer=self.signer,
-            args=args,
+            args=replace(args, relay=relay_payload.address, nonce=relay_payload.nonce),
             config=self.contract_config,
             metadata=metadata,
         ).to_dict()
 
-        self.logger.debug(f"Client side proxy request creation took: {(time.time() - start):.3f} seconds")
-        self.logger.debug(f"Created transaction request: {txn_request}")
-
-        resp = self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
-        return ClientRelayerTransactionResponse(
-            resp.get("transactionID"),
-            resp.get("transactionHash"),
-            self,
-        )
-
-    def executeSafeTransactions(self, transactions: list[SafeTransaction], metadata: str = None):
+    def _aggregate_safe_transactions(
+        self, transactions: list[SafeTransaction]
+    ) -> SafeTransaction:
         """
-        Executes a batch of safe transactions
+        Aggregates the transactions into the single transaction the safe executes
         """
-        import time
-        self.assert_signer_needed()
-        self.assert_builder_creds_needed()
-
-        safe_address = self.get_expected_safe()
-
-        deployed = self.get_deployed(safe_address)
-        if not deployed:
-            raise RelayerClientException(
-                f"expected safe {safe_address} is not deployed"
+        with span("encode", batch_size=len(transactions)):
+            return aggregate_transaction(
+                transactions, self.contract_config.safe_multisend
             )
 
-        start = time.time()
-        from_address = self.signer.address()
-
-        nonce_payload = self.get_nonce(from_address, TransactionType.SAFE.value)
-        nonce = 0
-        if nonce_payload is None or nonce_payload.get("nonce") is None:
-            raise RelayerClientException("invalid nonce payload received")
-        nonce = nonce_payload.get("nonce")
-
+    def _build_safe_request(
+        self,
+        from_address: str,
+        nonce: str,
+        transactions: list[SafeTransaction],
+        metadata: str = None,
+    ) -> dict:
         safe_args = SafeTransactionArgs(
             from_address=from_address,
             nonce=nonce,
@@ -216,115 +214,131 @@ class RelayClient:
             transactions=transactions,
         )
 
-        txn_request = build_safe_transaction_request(
+        return build_safe_transaction_request(
             signer=self.signer,
             args=safe_args,
             config=self.contract_config,
             metadata=metadata,
         ).to_dict()
 
-        self.logger.debug(f"Client side safe request creation took: {(time.time() - start):.3f} seconds")
-        self.logger.debug(f"Created transaction request: {txn_request}")
-
-        resp = self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
-        return ClientRelayerTransactionResponse(
-            resp.get("transactionID"),
-            resp.get("transactionHash"),
-            self,
-        )
-
-    def deploy(self):
-        self.assert_signer_needed()
-        self.assert_builder_creds_needed()
-
-        safe_address = self.get_expected_safe()
-        deployed = self.get_deployed(safe_address)
-        if deployed:
-            raise RelayerClientException(f"safe {safe_address} is already deployed!")
-
-        from_address = self.signer.address()
-
+    def _build_deploy_request(self) -> dict:
         args = SafeCreateTransactionArgs(
-            from_address=from_address,
+            from_address=self.signer.address(),
             chain_id=self.chain_id,
             payment_token=ZERO_ADDRESS,
             payment="0",
             payment_receiver=ZERO_ADDRESS,
         )
 
-        txn_request = build_safe_create_transaction_request(
+        return build_safe_create_transaction_request(
             self.signer, args, self.contract_config
         ).to_dict()
 
-        self.logger.debug(f"Created transaction request: {txn_request}")
-        resp = self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
-
-        return ClientRelayerTransactionResponse(
-            resp.get("transactionID"),
-            resp.get("transactionHash"),
-            self,
+    @staticmethod
+    def _parse_relay_payload(payload) -> RelayPayload:
+        if (
+            payload is None
+            or payload.get("address") is None
+            or payload.get("nonce") is None
+        ):
+            raise RelayerClientException("invalid relay payload received")
+        return RelayPayload(
+            address=payload.get("address"),
+            nonce=payload.get("nonce"),
         )
 
-    def poll_until_state(
-        self,
-        transaction_id: str,
-        states: List[str],
-        fail_state: str,
-        max_polls: Optional[int] = None,
-        poll_frequency: Optional[int] = None,
-    ):
-        target_states = set(list(states))
-
-        poll_limit = max_polls if max_polls is not None else 10
-
-        poll_frequency_ms = 2000
-        if poll_frequency is not None and poll_frequency >= 1000:
-            poll_frequency_ms = poll_frequency
+    @staticmethod
+    def _parse_nonce(nonce_payload):
+        if nonce_payload is None or nonce_payload.get("nonce") is None:
+            raise RelayerClientException("invalid nonce payload received")
+        return nonce_payload.get("nonce")
 
-        print(
-            f"Waiting for transaction {transaction_id} matching states: {target_states}..."
-        )
+    @staticmethod
+    def _parse_deployed(deployed_payload) -> bool:
+        if deployed_payload and deployed_payload.get("deployed"):
+            return bool(deployed_payload.get("deployed"))
+        return False
 
-        for _ in range(poll_limit):
-            transactions = self.get_transaction(transaction_id)
-            if transactions:
-                txn = transactions[0]
-                txn_state = txn.get("state")
-                if (
-                    txn_state
-                    and isinstance(txn_state, str)
-                    and txn_state in target_states
-                ):
-                    return txn
-                if fail_state is not None and txn_state == fail_state:
-                    txn_hash = txn.get("transactionHash")
-                    self.logger.error(
-                        f"txn {transaction_id} failed onchain, transaction_hash: {txn_hash}!"
-                    )
-                    return None
-            time.sleep(poll_frequency_ms / 1000)
+    def get_transition_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the learned seconds from submission to each relayer state
+        """
+        return self.transition_timings.snapshot()
 
-        self.logger.info(
-            f"Transaction {transaction_id} not found or not in given states, timing out!"
-        )
-        return None
+    def _observe_poll(
+        self,
+        transaction_id: str,
+        transactions,
+        target_states: Set[str],
+        fail_state: str,
+        observed: Set[str],
+        submitted_at: Optional[float],
+    ) -> Tuple[bool, Optional[dict]]:
+        """
+        Inspects a polled transaction, returns whether polling is done and its result
+        """
+        if not transactions:
+            return False, None
+        txn = transactions[0]
+        txn_state = txn.get("state")
+        if self.journal is not None:
+            self.journal.record_state(
+                transaction_id, txn_state, txn.get("transactionHash")
+            )
+        if (
+            submitted_at is not None
+            and txn_state in TRACKED_STATES
+            and txn_state not in observed
+        ):
+            # First observation of the state, an upper bound of its transition time
+            observed.add(txn_state)
+            self.transition_timings.record(txn_state, time.monotonic() - submitted_at)
+        if txn_state and isinstance(txn_state, str) and txn_state in target_states:
+            return True, txn
+        if fail_state is not None and txn_state == fail_state:
+            txn_hash = txn.get("transactionHash")
+            self.logger.error(
+                f"txn {transaction_id} failed onchain, transaction_hash: {txn_hash}!"
+            )
+            return True, None
+        return False, None
 
-    def _post_request(self, method: str, request_path: str, body: dict = None):
-        builder_headers = self._generate_builder_headers(method, request_path, body)
-        if builder_headers is None:
-            raise RelayerClientException("could not generate builder headers")
-        return post(
-            f"{self.relayer_url}{request_path}", headers=builder_headers, data=body
-        )
+    def _observe_wait(
+        self, polls: int, submitted_at: Optional[float], txn: Optional[dict]
+    ) -> None:
+        """
+        Records the polls a wait made and, once confirmed, the time since submission
+        """
+        if self.metrics is None:
+            return
+        self.metrics.poll_rounds.observe(polls)
+        if txn is not None and submitted_at is not None:
+            self.metrics.time_to_confirmation.observe(time.monotonic() - submitted_at)
+
+    def _count_submit(self, txn_request: dict) -> None:
+        if self.metrics is not None:
+            self.metrics.submits.inc(txn_request.get("type"))
+
+    @staticmethod
+    def _next_poll_delay(
+        schedule: PollSchedule, poll_frequency: Optional[int], reference: float
+    ) -> float:
+        if poll_frequency is not None:
+            return poll_frequency / 1000
+        return schedule.next_delay(time.monotonic() - reference)
 
     def _generate_builder_headers(
-        self, method: str, request_path: str, body: dict = None
+        self, method: str, request_path: str, body: Optional[bytes] = None
     ) -> Optional[dict]:
+        """
+        Signs the request with the builder credentials, body being the exact bytes sent
+        """
         if body is not None:
-            body = str(body)
-        headers = self.builder_config.generate_builder_headers(
-            method, request_path, body
-        )
+            body = body.decode("utf-8")
+        with span("headers"):
+            headers = self.builder_config.generate_builder_headers(
+                method, request_path, body
+            )
         return headers.to_dict() if headers is not None else None
 
     def get_expected_safe(self):
@@ -333,7 +347,8 @@ class RelayClient:
         """
         self.assert_signer_needed()
         addr = self.signer.address()
-        return derive(addr, self.contract_config.safe_factory)
+        with span("derive_address"):
+            return derive(addr, self.contract_config.safe_factory)
 
     def assert_signer_needed(self):
         if self.signer is None:
@@ -344,3 +359,513 @@ class RelayClient:
             raise RelayerClientException(
                 "builder credentials are required for this endpoint"
             )
+
+    def assert_proxy_configured(self):
+        if (
+            self.contract_config.proxy_factory is None
+            or self.contract_config.relay_hub is None
+        ):
+            raise RelayerClientException(
+                "Proxy contracts are not configured for this chain"
+            )
+
+
+class RelayClient(BaseRelayClient):
+    """
+    Client for the Polymarket Relayer
+    Authenticated with builder api key credentials. With a journal, given by path or
+    instance, every submission is recorded and the journaled transactions not in a
+    terminal state are waited for again on construction, unless resume_pending is
+    False and resume() is left to the caller
+    """
+
+    def __init__(
+        self,
+        *args,
+        executor: Optional[Executor] = None,
+        journal: Union[str, TransactionJournal, None] = None,
+        resume_pending: bool = True,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        # A journal given by path is owned, and closed, by this client
+        self._owns_journal = isinstance(journal, str)
+        self.journal = TransactionJournal(journal) if self._owns_journal else journal
+        self._waiter = None
+        self._waiter_lock = threading.Lock()
+        # Runs the independent pre-flight reads of an execute concurrently
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._executor_lock = threading.Lock()
+        if self.journal is not None and resume_pending:
+            self.resume()
+
+    @property
+    def waiter(self) -> TransactionWaiter:
+        """
+        Shared waiter multiplexing every in flight transaction of this client
+        """
+        if self._waiter is None:
+            with self._waiter_lock:
+                if self._waiter is None:
+                    self._waiter = TransactionWaiter(self, journal=self.journal)
+        return self._waiter
+
+    @property
+    def executor(self) -> Executor:
+        """
+        Executor running pre-flight reads, a small thread pool unless one was given
+        """
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=DEFAULT_PREFLIGHT_WORKERS,
+                        thread_name_prefix="relayer-preflight",
+                    )
+        return self._executor
+
+    def close(self):
+        """
+        Stops the waiter, and the pre-flight executor, journal and transport owned by
+        this client
+        """
+        if self._waiter is not None:
+            self._waiter.close()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._owns_journal:
+            self.journal.close()
+        if self._owns_http_client:
+            self.http_client.close()
+
+    def resume(self) -> Dict[str, Future]:
+        """
+        Resumes waiting for the journaled transactions not in a terminal state yet
+        Returns the waiter's future of each, by transaction id
+        """
+        if self.journal is None:
+            raise RelayerClientException("resuming requires a journal")
+        return {
+            entry.transaction_id: self.waiter.submit(entry.transaction_id)
+            for entry in self.journal.pending()
+        }
+
+    def get_nonce(self, signer_address: str, signer_type: str):
+        """
+        Gets the nonce for the signer
+        """
+        return self._get_request(
+            GET_NONCE, f"?address={signer_address}&type={signer_type}"
+        )
+
+    def get_relay_payload(self, signer_address: str, signer_type: str) -> RelayPayload:
+        """
+        Gets the relay payload (relay address and nonce) for the signer
+        """
+        payload = self._get_request(
+            GET_RELAY_PAYLOAD, f"?address={signer_address}&type={signer_type}"
+        )
+        return self._parse_relay_payload(payload)
+
+    def get_transaction(self, transaction_id: str):
+        """
+        Gets the transaction given the transaction_id
+        """
+        return self._get_request(GET_TRANSACTION, f"?id={transaction_id}")
+
+    def get_transactions(self):
+        """
+        Gets all transactions for the builder
+        """
+        return self._get_request(GET_TRANSACTIONS)
+
+    def iter_transactions(
+        self, page_size: Optional[int] = None, max_pages: int = DEFAULT_MAX_PAGES
+    ) -> Iterator[RelayerTransactionRecord]:
+        """
+        Streams the transactions of the builder, one record at a time
+        Responses are parsed as they download. With a page_size the listing is
+        requested in limit/offset pages, until a short page or a page showing the
+        relayer ignores the parameters
+        """
+        if page_size is None:
+            for txn in iter_json_array(self._stream_request(GET_TRANSACTIONS)):
+                yield RelayerTransactionRecord.from_dict(txn)
+            return
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        offset = 0
+        previous = set()
+        for _ in range(max_pages):
+            query = f"?limit={page_size}&offset={offset}"
+            count = 0
+            ids = set()
+            for txn in iter_json_array(self._stream_request(GET_TRANSACTIONS, query)):
+                count += 1
+                record = RelayerTransactionRecord.from_dict(txn)
+                ids.add(record.transaction_id)
+                # Pushed over the page boundary by transactions created meanwhile
+                if record.transaction_id in previous:
+                    continue
+                yield record
+            # A short page is the last one, a long one means the limit was ignored
+            # and the same page twice that the offset was
+            if count != page_size or ids == previous:
+                return
+            previous = ids
+            offset += page_size
+        raise RelayerClientException(
+            f"transactions listing did not end within {max_pages} pages"
+        )
+
+    def get_deployed(self, safe_address) -> bool:
+        """
+        Returns a boolean that indicates if a safe is deployed
+        """
+        deployed = self.deployment_cache.get(safe_address)
+        if deployed is not None:
+            return deployed
+
+        deployed_payload = self._get_request(GET_DEPLOYED, f"?address={safe_address}")
+        deployed = self._parse_deployed(deployed_payload)
+        self.deployment_cache.seed(safe_address, deployed)
+        return deployed
+
+    def execute(
+        self,
+        transactions: list[SafeTransaction],
+        metadata: str = None,
+        *,
+        max_calls: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_calldata_gas: Optional[int] = None,
+    ):
+        """
+        Executes a batch of transactions
+        Automatically routes to executeProxyTransactions or executeSafeTransactions based on relayer_tx_type
+        With any of max_calls, max_bytes or max_calldata_gas a SAFE batch is split into
+        MultiSend chunks within those budgets, each submitted with its own nonce in
+        order, and the list of responses is returned. A failed chunk raises, the
+        chunks before it stay submitted
+        """
+        if (max_calls, max_bytes, max_calldata_gas) != (None, None, None):
+            if self.relayer_tx_type == RelayerTxType.PROXY:
+                raise ValueError("batch budgets only apply to SAFE transactions")
+            with span("encode", batch_size=len(transactions)):
+                chunks = create_safe_multisend_transactions(
+                    transactions,
+                    self.contract_config.safe_multisend,
+                    max_bytes=max_bytes,
+                    max_calldata_gas=max_calldata_gas,
+                    max_calls=max_calls,
+                )
+            return [self.executeSafeTransactions([chunk], metadata) for chunk in chunks]
+        if self.relayer_tx_type == RelayerTxType.PROXY:
+            return self.executeProxyTransactions(transactions, metadata)
+        else:
+            return self.executeSafeTransactions(transactions, metadata)
+
+    def executeProxyTransactions(
+        self, transactions: list[ProxyTransaction], metadata: str = None
+    ):
+        """
+        Executes a batch of proxy transactions
+        """
+        self.assert_signer_needed()
+        self.assert_builder_creds_needed()
+        self.assert_proxy_configured()
+
+        self.logger.debug("Executing proxy transactions...")
+        with self.tracer.span(
+            "execute", tx_type=RelayerTxType.PROXY.value, batch_size=len(transactions)
+        ):
+            start = time.time()
+            from_address = self.signer.address()
+
+            # Fetch the relay payload (relay address and nonce) while encoding the calls
+            # and estimating their gas
+            relay_payload_future = self._preflight(
+                "preflight.relay_payload",
+                None,
+                self.get_relay_payload,
+                from_address,
+                TransactionType.PROXY.value,
+            )
+            args = self._prepare_proxy_args(from_address, transactions)
+            relay_payload = relay_payload_future.result()
+
+            txn_request = self._build_proxy_request(
+                from_address, relay_payload, transactions, metadata, args=args
+            )
+
+            self.logger.debug(
+                "Client side proxy request creation took: %.3f seconds",
+                time.time() - start,
+            )
+            self.logger.debug("Created transaction request: %s", txn_request)
+
+            return self._submit(txn_request)
+
+    def executeSafeTransactions(
+        self, transactions: list[SafeTransaction], metadata: str = None
+    ):
+        """
+        Executes a batch of safe transactions
+        """
+        self.assert_signer_needed()
+        self.assert_builder_creds_needed()
+
+        with self.tracer.span(
+            "execute", tx_type=RelayerTxType.SAFE.value, batch_size=len(transactions)
+        ):
+            start = time.time()
+            safe_address = self.get_expected_safe()
+            from_address = self.signer.address()
+
+            # The deployment check and the nonce reservation are independent reads,
+            # run them while the transactions are aggregated
+            deployed_future = self._preflight(
+                "preflight.deployed",
+                self.deployment_cache.get(safe_address),
+                self.get_deployed,
+                safe_address,
+            )
+            nonce_future = self._preflight(
+                "preflight.nonce",
+                self.nonce_manager.reserve(),
+                self._reserve_nonce,
+                from_address,
+            )
+            try:
+                transaction = self._aggregate_safe_transactions(transactions)
+                deployed = deployed_future.result()
+            except Exception:
+                self._release_nonce(nonce_future)
+                raise
+            if not deployed:
+                self._release_nonce(nonce_future)
+                raise RelayerClientException(
+                    f"expected safe {safe_address} is not deployed"
+                )
+
+            nonce = nonce_future.result()
+            try:
+                txn_request = self._build_safe_request(
+                    from_address, str(nonce), [transaction], metadata
+                )
+
+                self.logger.debug(
+                    "Client side safe request creation took: %.3f seconds",
+                    time.time() - start,
+                )
+                self.logger.debug("Created transaction request: %s", txn_request)
+
+                response = self._submit(txn_request)
+            except Exception:
+                self.nonce_manager.release(nonce)
+                raise
+            self.nonce_manager.confirm(nonce)
+            return response
+
+    def deploy(self):
+        self.assert_signer_needed()
+        self.assert_builder_creds_needed()
+
+        with self.tracer.span("deploy", tx_type=TransactionType.SAFE_CREATE.value):
+            safe_address = self.get_expected_safe()
+            with span("preflight.deployed"):
+                deployed = self.get_deployed(safe_address)
+            if deployed:
+                raise RelayerClientException(
+                    f"safe {safe_address} is already deployed!"
+                )
+
+            txn_request = self._build_deploy_request()
+
+            self.logger.debug("Created transaction request: %s", txn_request)
+            response = self._submit(txn_request)
+            # The safe is being deployed, stop serving the cached negative result
+            self.deployment_cache.invalidate(safe_address)
+            return response
+
+    def poll_until_state(
+        self,
+        transaction_id: str,
+        states: List[str],
+        fail_state: str,
+        max_polls: Optional[int] = None,
+        poll_frequency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        submitted_at: Optional[float] = None,
+    ):
+        """
+        Polls the transaction until it reaches one of the states, fails or times out
+        Polls follow the learned transition timings with exponential backoff and jitter,
+        unless a fixed poll_frequency (ms) is given. submitted_at is the time.monotonic()
+        of the submission, used to learn the transition timings
+        """
+        if poll_frequency is not None and poll_frequency <= 0:
+            raise ValueError("poll_frequency must be positive")
+        target_states = set(list(states))
+        started = time.monotonic()
+        deadline = started + (timeout if timeout is not None else DEFAULT_WAIT_TIMEOUT)
+        schedule = PollSchedule(self.transition_timings, target_states)
+        observed = set()
+
+        self.logger.debug(
+            "Waiting for transaction %s matching states: %s...",
+            transaction_id,
+            target_states,
+        )
+
+        with self.tracer.span("wait", transaction_id=transaction_id) as wait_span:
+            polls = 0
+            while max_polls is None or polls < max_polls:
+                with span("poll") as poll_span:
+                    transactions = self.get_transaction(transaction_id)
+                    poll_span.set_attribute("state", _polled_state(transactions))
+                polls += 1
+                wait_span.set_attribute("polls", polls)
+                done, txn = self._observe_poll(
+                    transaction_id,
+                    transactions,
+                    target_states,
+                    fail_state,
+                    observed,
+                    submitted_at,
+                )
+                if done:
+                    self._observe_wait(polls, submitted_at, txn)
+                    return txn
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                delay = self._next_poll_delay(
+                    schedule, poll_frequency, submitted_at or started
+                )
+                time.sleep(min(delay, remaining))
+
+        self._observe_wait(polls, submitted_at, None)
+
+        self.logger.info(
+            "Transaction %s not found or not in given states, timing out!",
+            transaction_id,
+        )
+        return None
+
+    def _submit(self, txn_request: dict) -> ClientRelayerTransactionResponse:
+        """
+        Submits the signed request, journaling it first when a journal is configured
+        """
+        if self.journal is None:
+            resp = self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
+            self._count_submit(txn_request)
+            return ClientRelayerTransactionResponse(
+                resp.get("transactionID"), resp.get("transactionHash"), self
+            )
+
+        entry_id = self.journal.record_request(txn_request)
+        try:
+            resp = self._post_request(POST, SUBMIT_TRANSACTION, txn_request)
+        except RelayerApiException as e:
+            # Only a 4xx proves the relayer refused the request. Without a status
+            # code, or with a 5xx, it may have been processed upstream and the entry
+            # stays unsubmitted until reconciled
+            if e.status_code is not None and e.status_code < 500:
+                self.journal.record_rejected(entry_id)
+            raise
+        except RelayerClientException:
+            # Failed before sending, the circuit was open or headers were missing
+            self.journal.record_rejected(entry_id)
+            raise
+        self._count_submit(txn_request)
+        try:
+            self.journal.record_submitted(
+                entry_id,
+                resp.get("transactionID"),
+                resp.get("transactionHash"),
+                resp.get("state"),
+            )
+        except Exception:
+            # The relayer accepted the transaction, failing now would invite a resubmit
+            self.logger.exception(
+                "Failed to journal submitted transaction %s",
+                resp.get("transactionID"),
+            )
+        return ClientRelayerTransactionResponse(
+            resp.get("transactionID"), resp.get("transactionHash"), self
+        )
+
+    def _preflight(self, name: str, known, fn, *args) -> Future:
+        """
+        Runs a pre-flight read on the executor, unless its value is already known
+        """
+        if known is not None:
+            future = Future()
+            future.set_result(known)
+            return future
+        if self.tracer.enabled:
+            fn = propagate(partial(_timed, name, fn))
+        return self.executor.submit(fn, *args)
+
+    def _release_nonce(self, nonce_future: Future):
+        """
+        Releases the nonce reserved by an execute that is not going to submit
+        """
+        try:
+            nonce = nonce_future.result()
+        except Exception:
+            return
+        self.nonce_manager.release(nonce)
+
+    def _reserve_nonce(self, from_address: str) -> int:
+        return self.nonce_manager.reserve_or_sync(
+            lambda: self._parse_nonce(
+                self.get_nonce(from_address, TransactionType.SAFE.value)
+            )
+        )
+
+    def _get_request(self, request_path: str, query: str = ""):
+        return self.http_client.get(
+            f"{self.relayer_url}{request_path}{query}",
+            timeout=self.http_client.timeout_for(request_path),
+        )
+
+    def _stream_request(self, request_path: str, query: str = "") -> Iterator[bytes]:
+        return self.http_client.stream(
+            f"{self.relayer_url}{request_path}{query}",
+            timeout=self.http_client.timeout_for(request_path),
+        )
+
+    def _post_request(self, method: str, request_path: str, body: dict = None):
+        # Serialized once, the builder signature covers the bytes sent
+        payload = encode_json(body) if body is not None else None
+        builder_headers = self._generate_builder_headers(method, request_path, payload)
+        if builder_headers is None:
+            raise RelayerClientException("could not generate builder headers")
+        with span("http.submit", path=request_path) as http_span:
+            try:
+                resp = self.http_client.post(
+                    f"{self.relayer_url}{request_path}",
+                    headers=builder_headers,
+                    data=payload,
+                    timeout=self.http_client.timeout_for(request_path),
+                )
+            except RelayerApiException as e:
+                http_span.set_attribute("status_code", e.status_code)
+                raise
+            http_span.set_attribute("status_code", 200)
+        return resp
+
+
+def _timed(name: str, fn, *args):
+    with span(name):
+        return fn(*args)
+
+
+def _polled_state(transactions) -> Optional[str]:
+    return transactions[0].get("state") if transactions else None
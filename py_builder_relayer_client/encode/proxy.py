@@ -1,44 +1,66 @@
-from typing import List
+from typing import List, Union
 
-from eth_abi import encode
-from eth_utils import keccak, to_bytes, to_checksum_address, to_hex
+from ..builder.derive import address_to_bytes
+from ..models import ProxyTransaction
 
-from ..models import CallType, ProxyTransaction
+# Function selector: keccak256("proxy((uint8,address,uint256,bytes)[])")[:4]
+PROXY_SELECTOR = bytes.fromhex("34ee9791")
+
+# Head of a (uint8,address,uint256,bytes) call: three static words, the data offset
+# and the data length word
+CALL_HEAD_SIZE = 5 * 32
 
 
 def encode_proxy_transaction_data(txns: List[ProxyTransaction]) -> str:
     """
     Encode proxy transactions data using proxy function signature
     """
-    # Function selector: keccak256("proxy((uint8,address,uint256,bytes)[])")[:4]
-    # The function signature is: proxy((uint8,address,uint256,bytes)[])
-    function_selector = keccak(text="proxy((uint8,address,uint256,bytes)[])")[:4]
-
-    # Prepare the calls array
     # Each call is a tuple: (uint8 typeCode, address to, uint256 value, bytes data)
-    calls = []
-    for txn in txns:
-        to_address = to_checksum_address(txn.to)
-        data_bytes = (
-            to_bytes(hexstr=txn.data)
-            if txn.data.startswith("0x")
-            else to_bytes(hexstr="0x" + txn.data)
+    calls = [
+        (
+            int(txn.type_code.value),
+            address_to_bytes(txn.to),
+            int(txn.value),
+            _data_to_bytes(txn.data),
         )
+        for txn in txns
+    ]
+
+    # The calls are dynamic tuples, the array holds an offset to each one relative to
+    # the first word after its length, followed by the calls themselves
+    call_sizes = [CALL_HEAD_SIZE + _padded(len(data)) for _, _, _, data in calls]
+    offsets_size = 32 * len(calls)
+    buf = bytearray(4 + 64 + offsets_size + sum(call_sizes))
+    buf[0:4] = PROXY_SELECTOR
+    buf[4:36] = (32).to_bytes(32, "big")
+    buf[36:68] = len(calls).to_bytes(32, "big")
+
+    base = 68
+    head = base
+    pos = base + offsets_size
+    for (type_code, to, value, data), size in zip(calls, call_sizes):
+        buf[head : head + 32] = (pos - base).to_bytes(32, "big")
+        head += 32
+
+        buf[pos + 31] = type_code
+        buf[pos + 44 : pos + 64] = to
+        buf[pos + 64 : pos + 96] = value.to_bytes(32, "big")
+        buf[pos + 96 : pos + 128] = (128).to_bytes(32, "big")
+        buf[pos + 128 : pos + 160] = len(data).to_bytes(32, "big")
+        buf[pos + CALL_HEAD_SIZE : pos + CALL_HEAD_SIZE + len(data)] = data
+        pos += size
+
+    return "0x" + buf.hex()
 
-        calls.append(
-            (
-                int(txn.type_code.value),
-                to_address,
-                int(txn.value),
-                data_bytes,
-            )
-        )
 
-    # Encode the array of tuples
-    # The ABI type is: tuple(uint8,address,uint256,bytes)[]
-    encoded_data = encode(["(uint8,address,uint256,bytes)[]"], [calls])
+def _data_to_bytes(data: Union[str, bytes]) -> bytes:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data
+    data = data[2:] if data.startswith("0x") else data
+    if len(data) % 2:
+        data = "0" + data
+    return bytes.fromhex(data)
 
-    # Combine function selector with encoded data
-    full_data = function_selector + encoded_data
 
-    return to_hex(full_data)
+def _padded(size: int) -> int:
+    return (size + 31) // 32 * 32
@@ -1,51 +1,140 @@
-from typing import List
-from eth_abi import encode
-from eth_abi.packed import encode_packed
-from eth_utils import to_hex, to_bytes, to_checksum_address, keccak
+from typing import List, Optional, Tuple
+from eth_utils import to_bytes, to_checksum_address
 
+from ..builder.derive import address_to_bytes
 from ..models import SafeTransaction, OperationType
 
+# keccak(text="multiSend(bytes)")[:4]
+MULTISEND_SELECTOR = bytes.fromhex("8d80ff0a")
+
+# Packed record header: operation (uint8) + to (address) + value (uint256) + data length (uint256)
+PACKED_HEADER_SIZE = 1 + 20 + 32 + 32
+
+# Selector + ABI offset word + ABI length word of the bytes argument
+MULTISEND_HEADER_SIZE = 4 + 32 + 32
+
+# EIP-2028 calldata gas per byte
+ZERO_BYTE_GAS = 4
+NON_ZERO_BYTE_GAS = 16
+
+# (operation, to, value, data)
+PackedRecord = Tuple[int, bytes, int, bytes]
+
 
 def create_safe_multisend_transaction(
     txns: List[SafeTransaction], safe_multisend_address: str
 ) -> SafeTransaction:
-    encoded_txns = []
+    records = [_to_record(tx) for tx in txns]
+    return _encode_multisend(records, to_checksum_address(safe_multisend_address))
 
+
+def create_safe_multisend_transactions(
+    txns: List[SafeTransaction],
+    safe_multisend_address: str,
+    max_bytes: Optional[int] = None,
+    max_calldata_gas: Optional[int] = None,
+    max_calls: Optional[int] = None,
+) -> List[SafeTransaction]:
+    """
+    Aggregates the transactions into as few MultiSend transactions as the budgets allow
+    max_bytes bounds the calldata size of each MultiSend, max_calldata_gas its EIP-2028
+    calldata gas and max_calls its number of calls. A chunk holding a single transaction
+    is returned as is, a transaction over budget on its own gets its own chunk
+    """
+    multisend = to_checksum_address(safe_multisend_address)
+    header_gas = MULTISEND_HEADER_SIZE * NON_ZERO_BYTE_GAS
+
+    chunks = []
+    chunk_txns = []
+    chunk_records = []
+    packed_size = 0
+    calldata_gas = header_gas
     for tx in txns:
-        to_address = to_checksum_address(tx.to)
-        data_bytes = (
-            to_bytes(hexstr=tx.data)
-            if tx.data.startswith("0x")
-            else to_bytes(hexstr="0x" + tx.data)
-        )
+        record = _to_record(tx)
+        record_size = PACKED_HEADER_SIZE + len(record[3])
+        record_gas = _record_calldata_gas(record)
 
-        # Pack: [uint8, address, uint256, uint256, bytes]
-        packed_tx = encode_packed(
-            ["uint8", "address", "uint256", "uint256", "bytes"],
-            [
-                tx.operation.value,
-                to_address,
-                int(tx.value),
-                len(data_bytes),
-                data_bytes,
-            ],
+        over_budget = chunk_records and (
+            (max_calls is not None and len(chunk_records) >= max_calls)
+            or (
+                max_bytes is not None
+                and _calldata_size(packed_size + record_size) > max_bytes
+            )
+            or (
+                max_calldata_gas is not None
+                and calldata_gas + record_gas > max_calldata_gas
+            )
         )
-        encoded_txns.append(packed_tx)
+        if over_budget:
+            chunks.append(_aggregate(chunk_txns, chunk_records, multisend))
+            chunk_txns, chunk_records = [], []
+            packed_size, calldata_gas = 0, header_gas
+
+        chunk_txns.append(tx)
+        chunk_records.append(record)
+        packed_size += record_size
+        calldata_gas += record_gas
 
-    concatenated_txns = b"".join(encoded_txns)
+    if chunk_records:
+        chunks.append(_aggregate(chunk_txns, chunk_records, multisend))
+    return chunks
 
-    multisend_data = encode(["bytes"], [concatenated_txns])
 
-    # keccak(text="multiSend(bytes)")[:4]
-    function_selector = bytes.fromhex("8d80ff0a")
+def _aggregate(
+    txns: List[SafeTransaction], records: List[PackedRecord], multisend: str
+) -> SafeTransaction:
+    if len(txns) == 1:
+        return txns[0]
+    return _encode_multisend(records, multisend)
+
 
-    full_data = function_selector + multisend_data
+def _encode_multisend(records: List[PackedRecord], multisend: str) -> SafeTransaction:
+    """
+    Writes multiSend(bytes) calldata for the packed records into one preallocated buffer
+    """
+    packed_size = sum(PACKED_HEADER_SIZE + len(record[3]) for record in records)
+    buf = bytearray(_calldata_size(packed_size))
+    buf[0:4] = MULTISEND_SELECTOR
+    buf[4:36] = (32).to_bytes(32, "big")
+    buf[36:68] = packed_size.to_bytes(32, "big")
 
-    data = to_hex(full_data)
+    pos = MULTISEND_HEADER_SIZE
+    for operation, to, value, data in records:
+        data_len = len(data)
+        buf[pos] = operation
+        buf[pos + 1 : pos + 21] = to
+        buf[pos + 21 : pos + 53] = value.to_bytes(32, "big")
+        buf[pos + 53 : pos + 85] = data_len.to_bytes(32, "big")
+        pos += PACKED_HEADER_SIZE
+        buf[pos : pos + data_len] = data
+        pos += data_len
 
     return SafeTransaction(
-        to=to_checksum_address(safe_multisend_address),
+        to=multisend,
         operation=OperationType.DelegateCall,
-        data=to_hex(full_data),
+        data="0x" + buf.hex(),
         value="0",
     )
+
+
+def _to_record(tx: SafeTransaction) -> PackedRecord:
+    return (
+        tx.operation.value,
+        address_to_bytes(tx.to),
+        int(tx.value),
+        to_bytes(hexstr=tx.data),
+    )
+
+
+def _calldata_size(packed_size: int) -> int:
+    # The packed bytes are right padded to a multiple of 32 bytes
+    return MULTISEND_HEADER_SIZE + (packed_size + 31) // 32 * 32
+
+
+def _record_calldata_gas(record: PackedRecord) -> int:
+    operation, to, value, data = record
+    header = bytes([operation]) + to + value.to_bytes(32, "big")
+    header += len(data).to_bytes(32, "big")
+    zeros = header.count(0) + data.count(0)
+    size = len(header) + len(data)
+    return zeros * ZERO_BYTE_GAS + (size - zeros) * NON_ZERO_BYTE_GAS
@@ -7,7 +7,7 @@ class RelayerClientException(Exception):
 
 
 class RelayerApiException(RelayerClientException):
-    def __init__(self, resp: Response = None, error_msg=None):
+    def __init__(self, resp: Response = None, error_msg=None, status_code=None):
         if resp is None and error_msg is None:
             raise ValueError("invalid resp or error msg")
         if resp is not None:
@@ -15,7 +15,7 @@ class RelayerApiException(RelayerClientException):
             self.error_msg = self._get_message(resp)
         if error_msg is not None:
             self.error_msg = error_msg
-            self.status_code = None
+            self.status_code = status_code
 
     def _get_message(self, resp: Response):
         try:
@@ -28,3 +28,19 @@ class RelayerApiException(RelayerClientException):
 
     def __str__(self):
         return self.__repr__()
+
+
+class RelayerCircuitOpenException(RelayerClientException):
+    """
+    Raised without calling the relayer while the circuit of an endpoint is open
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"circuit open for {endpoint}, retrying in {retry_in:.1f} seconds"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+    def __str__(self):
+        return self.msg
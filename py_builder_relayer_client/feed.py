@@ -0,0 +1,113 @@
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Set
+
+from .models import RelayerTransactionRecord
+
+# Python before 3.11 only parses fractions of 3 or 6 digits
+_FRACTION = re.compile(r"\.(\d+)")
+
+DEFAULT_FEED_PAGE_SIZE = 100
+
+
+class TransactionFeed:
+    """
+    Incremental view of the builder's transactions for reconciliation jobs
+    Every poll yields the transactions created or updated since the last completed
+    poll, so a transaction shows up again whenever its state changes. Only the
+    watermark, the latest update time seen, and the ids updated at that exact time
+    are kept between polls. The listing is read in pages, newest first, and a poll
+    stops at the first page holding nothing newer than the watermark, so a steady
+    state poll fetches one page. A page_size of None streams the whole listing
+    """
+
+    def __init__(
+        self,
+        client,
+        since: Optional[str] = None,
+        page_size: Optional[int] = DEFAULT_FEED_PAGE_SIZE,
+    ):
+        self.client = client
+        self.page_size = page_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._watermark = None
+        if since is not None:
+            self._watermark = _parse_time(since)
+            if self._watermark is None:
+                raise ValueError(f"invalid since timestamp: {since}")
+        self._since = since
+        # Ids already yielded at the watermark time
+        self._seen_at_watermark: Set[str] = set()
+
+    @property
+    def since(self) -> Optional[str]:
+        """
+        Update time of the newest transaction seen, as given by the relayer
+        Persist it to resume the feed in another process, which then yields the
+        transactions updated at that exact time once more
+        """
+        return self._since
+
+    def poll(self) -> Iterator[RelayerTransactionRecord]:
+        """
+        Yields the transactions changed since the last poll
+        The watermark only advances once the poll is consumed to the end, so a poll
+        that is interrupted is fully repeated by the next one
+        """
+        watermark = self._watermark
+        since = self._since
+        seen = set(self._seen_at_watermark)
+        # Whether the page being read held anything not yielded before
+        fresh = False
+        records = self.client.iter_transactions(page_size=self.page_size)
+        for count, record in enumerate(records, 1):
+            updated_at = record.updated_at or record.created_at
+            changed = _parse_time(updated_at) if updated_at else None
+            if changed is None:
+                # Cannot be placed relative to the watermark
+                self.logger.debug(
+                    "Transaction %s has no usable update time", record.transaction_id
+                )
+            if changed is None or self._is_new(record.transaction_id, changed):
+                fresh = True
+                yield record
+                if changed is not None:
+                    if watermark is None or changed > watermark:
+                        watermark, since, seen = changed, updated_at, set()
+                    if changed == watermark:
+                        seen.add(record.transaction_id)
+
+            if self.page_size is not None and count % self.page_size == 0:
+                # Pages further down the listing are older still
+                if not fresh and self._watermark is not None:
+                    break
+                fresh = False
+
+        self._watermark = watermark
+        self._since = since
+        self._seen_at_watermark = seen
+
+    def _is_new(self, transaction_id: str, changed: datetime) -> bool:
+        if self._watermark is None or changed > self._watermark:
+            return True
+        return (
+            changed == self._watermark and transaction_id not in self._seen_at_watermark
+        )
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    """
+    Parses an ISO 8601 timestamp, None if it is not one
+    Timestamps without an offset are taken as UTC
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    value = _FRACTION.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), value, 1)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+from eth_utils import keccak, to_bytes
+
+from .http_helpers.helpers import HttpClient, get_default_client
+
+GAS_ESTIMATE_TIMEOUT = 10
+DEFAULT_GAS_CACHE_TTL = 30.0
+DEFAULT_GAS_CACHE_SIZE = 4096
+# Many RPC providers cap the number of calls in a JSON-RPC batch
+DEFAULT_RPC_BATCH_SIZE = 50
+
+# (from, to, data)
+GasCall = Tuple[str, str, str]
+
+
+class GasEstimator:
+    """
+    eth_estimateGas client over the pooled session of an HttpClient
+    Estimates are cached for ttl seconds keyed by (from, to, keccak(data)), and the
+    estimates missing from the cache are fetched together in JSON-RPC batches
+    """
+
+    def __init__(
+        self,
+        rpc_url: Optional[str],
+        http_client: Optional[HttpClient] = None,
+        ttl: float = DEFAULT_GAS_CACHE_TTL,
+        max_entries: int = DEFAULT_GAS_CACHE_SIZE,
+        batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+        timeout: float = GAS_ESTIMATE_TIMEOUT,
+    ):
+        self.rpc_url = rpc_url
+        self.http_client = (
+            http_client if http_client is not None else get_default_client()
+        )
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # key -> (gas, expiry)
+        self._entries = OrderedDict()
+
+    def estimate(self, from_address: str, to: str, data: str) -> int:
+        """
+        Returns the gas estimate of a single call
+        """
+        return self.estimate_many([(from_address, to, data)])[0]
+
+    def estimate_many(self, calls: Iterable[GasCall]) -> List[int]:
+        """
+        Returns the gas estimate of every call in input order
+        Raises ValueError if any estimate fails
+        """
+        estimates = self._estimate(list(calls))
+        for estimate in estimates:
+            if isinstance(estimate, ValueError):
+                raise estimate
+        return estimates
+
+    def prefetch(self, calls: Iterable[GasCall]) -> int:
+        """
+        Estimates and caches the calls ahead of signing, returns how many succeeded
+        Failed estimates are not cached and are left to the caller to retry
+        """
+        if self.rpc_url is None:
+            return 0
+        return sum(
+            1
+            for estimate in self._estimate(list(calls))
+            if not isinstance(estimate, ValueError)
+        )
+
+    def get(self, from_address: str, to: str, data: str) -> Optional[int]:
+        """
+        Returns the cached estimate of a call, None if it is not cached
+        """
+        return self._get(_cache_key(from_address, to, data))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _estimate(self, calls: List[GasCall]) -> list:
+        if self.rpc_url is None:
+            raise ValueError("RPC URL is required for gas estimation")
+
+        keys = [_cache_key(*call) for call in calls]
+        estimates = [self._get(key) for key in keys]
+
+        # Calls sharing a key are estimated once
+        missing: Dict[tuple, GasCall] = {}
+        for key, call, estimate in zip(keys, calls, estimates):
+            if estimate is None:
+                missing.setdefault(key, call)
+
+        fetched = {}
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch = missing_keys[start : start + self.batch_size]
+            try:
+                results = self._fetch([missing[key] for key in batch])
+            except ValueError as e:
+                results = [e] * len(batch)
+            for key, result in zip(batch, results):
+                fetched[key] = result
+                if not isinstance(result, ValueError):
+                    self._put(key, result)
+
+        return [
+            estimate if estimate is not None else fetched[key]
+            for key, estimate in zip(keys, estimates)
+        ]
+
+    def _fetch(self, calls: List[GasCall]) -> list:
+        """
+        Sends the calls as one JSON-RPC request, returns a gas limit or ValueError each
+        """
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "method": "eth_estimateGas",
+                "params": [{"from": from_address, "to": to, "data": data}],
+                "id": i,
+            }
+            for i, (from_address, to, data) in enumerate(calls)
+        ]
+        if len(payload) == 1:
+            payload = payload[0]
+
+        try:
+            response = self.http_client.session.post(
+                self.rpc_url, json=payload, timeout=self.timeout
+            )
+            response.raise_for_status()
+            results = response.json()
+        except requests.RequestException as e:
+            raise ValueError(f"Failed to estimate gas: {e}")
+        except ValueError as e:
+            raise ValueError(f"Invalid RPC response: {e}")
+
+        if isinstance(results, dict):
+            if len(calls) > 1:
+                # A single object in reply to a batch is an error for the whole batch
+                error = _parse_gas(results)
+                if not isinstance(error, ValueError):
+                    error = ValueError("Invalid RPC response: expected a batch")
+                return [error] * len(calls)
+            results = [results]
+        if not isinstance(results, list):
+            return [ValueError("Invalid RPC response: expected a batch")] * len(calls)
+
+        # Elements that are not objects with an int id answer none of the calls
+        by_id = {
+            result["id"]: result
+            for result in results
+            if isinstance(result, dict) and isinstance(result.get("id"), int)
+        }
+        return [
+            (
+                _parse_gas(by_id[i])
+                if i in by_id
+                else ValueError("Invalid RPC response: missing result")
+            )
+            for i in range(len(calls))
+        ]
+
+    def _get(self, key) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            gas, expiry = entry
+            if time.monotonic() >= expiry:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return gas
+
+    def _put(self, key, gas: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (gas, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _cache_key(from_address: str, to: str, data: str) -> tuple:
+    return (from_address.lower(), to.lower(), keccak(to_bytes(hexstr=data)))
+
+
+def _parse_gas(result: dict):
+    if "error" in result:
+        return ValueError(f"RPC error: {result['error']}")
+    if "result" not in result:
+        return ValueError("No result in RPC response")
+    gas = result["result"]
+    try:
+        return int(gas, 16) if isinstance(gas, str) else int(gas)
+    except (TypeError, ValueError) as e:
+        return ValueError(f"Invalid RPC response: {e}")
@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from ..exceptions import RelayerClientException
+
+# Outcomes of an admitted request
+SUCCESS = "success"
+OVERLOAD = "overload"
+IGNORED = "ignored"
+
+DEFAULT_INITIAL_LIMIT = 8
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_BACKOFF_RATIO = 0.5
+DEFAULT_LATENCY_TOLERANCE = 2.0
+# Weight of each success in the latency baseline
+BASELINE_ALPHA = 0.05
+# Successes needed before latency is used as an overload signal
+BASELINE_WARMUP = 20
+# Interval at which async waiters check for a free slot
+ASYNC_POLL_INTERVAL = 0.005
+
+
+class Permit:
+    """
+    An admitted request, reports its outcome to the controller when released
+    """
+
+    __slots__ = ("started", "outcome")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.outcome = SUCCESS
+
+    def overloaded(self):
+        self.outcome = OVERLOAD
+
+    def ignore(self):
+        self.outcome = IGNORED
+
+
+class AdmissionController:
+    """
+    Client side admission control shared by every call it is given to
+    A token bucket bounds the request rate (rate requests per second, up to burst at
+    once) and an AIMD limit bounds the requests in flight: it grows by one for every
+    limit successes and is cut by backoff_ratio on a 429, a 5xx, a transport error or
+    a latency above latency_tolerance times the learned baseline. Requests over either
+    bound wait in line instead of being rejected
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        backoff_ratio: float = DEFAULT_BACKOFF_RATIO,
+        latency_tolerance: Optional[float] = DEFAULT_LATENCY_TOLERANCE,
+    ):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+
+        self._cond = threading.Condition()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        # Requests started before the last decrease do not decrease the limit again
+        self._decreased_at = float("-inf")
+        self._baseline = None
+        self._samples = 0
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        with self._cond:
+            return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> Permit:
+        """
+        Waits for a free slot and a rate token
+        Raises RelayerClientException if none is available within timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                wait = self._try_admit()
+                if wait == 0:
+                    return Permit(time.monotonic())
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RelayerClientException("timed out waiting for admission")
+                    wait = remaining if wait is None else min(wait, remaining)
+                # Woken up early when a request is released
+                self._cond.wait(wait)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> Permit:
+        """
+        Awaits a free slot and a rate token without blocking the event loop
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                wait = self._try_admit()
+            if wait == 0:
+                return Permit(time.monotonic())
+            if wait is None:
+                wait = ASYNC_POLL_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RelayerClientException("timed out waiting for admission")
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+    def release(self, permit: Permit) -> None:
+        """
+        Frees the permit's slot and adapts the limit to its outcome
+        """
+        now = time.monotonic()
+        latency = now - permit.started
+        with self._cond:
+            self._in_flight -= 1
+            outcome = permit.outcome
+            if outcome == SUCCESS and self._latency_overloaded(latency):
+                outcome = OVERLOAD
+
+            if outcome == SUCCESS:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                self._update_baseline(latency)
+            elif outcome == OVERLOAD and permit.started >= self._decreased_at:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._decreased_at = now
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, timeout: Optional[float] = None):
+        """
+        Holds a permit for the duration of the block, failures count as overload
+        """
+        permit = self.acquire(timeout)
+        try:
+            yield permit
+        except BaseException:
+            permit.overloaded()
+            raise
+        finally:
+            self.release(permit)
+
+    @asynccontextmanager
+    async def admit_async(self, timeout: Optional[float] = None):
+        permit = await self.acquire_async(timeout)
+        try:
+            yield permit
+        except BaseException:
+            permit.overloaded()
+            raise
+        finally:
+            self.release(permit)
+
+    def _try_admit(self) -> Optional[float]:
+        """
+        Takes a slot and a token, returns 0 if admitted, otherwise the seconds until a
+        token is available or None when waiting on a slot
+        """
+        if self._in_flight >= int(self._limit):
+            return None
+        if self.rate is not None:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+        self._in_flight += 1
+        return 0
+
+    def _latency_overloaded(self, latency: float) -> bool:
+        return (
+            self.latency_tolerance is not None
+            and self._samples >= BASELINE_WARMUP
+            and latency > self.latency_tolerance * self._baseline
+        )
+
+    def _update_baseline(self, latency: float):
+        self._samples += 1
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            self._baseline += BASELINE_ALPHA * (latency - self._baseline)
@@ -0,0 +1,200 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from ..exceptions import RelayerApiException
+from ..metrics import MetricsRegistry, RelayerMetrics
+from .helpers import (
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    GET,
+    POST,
+    DELETE,
+    HttpClient,
+    AttemptTracker,
+    Timeout,
+    body_arguments,
+)
+from .admission import AdmissionController
+from .retry import CircuitBreaker, RetryPolicy
+
+
+class AsyncHttpClient:
+    """
+    Asyncio HTTP transport
+    Uses a pooled aiohttp session when aiohttp is installed, otherwise runs a pooled
+    HttpClient on a thread pool bounded by the connection pool size. Both retry, fail
+    fast and take admission as HttpClient does
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        endpoint_timeouts: Optional[Dict[str, Timeout]] = None,
+        use_aiohttp: Optional[bool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        admission: Optional[AdmissionController] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        if use_aiohttp is None:
+            use_aiohttp = aiohttp is not None
+        if use_aiohttp and aiohttp is None:
+            raise ValueError("aiohttp is required for the aiohttp transport")
+
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.endpoint_timeouts = dict(endpoint_timeouts or {})
+        self.use_aiohttp = use_aiohttp
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+        self.admission = admission
+        self.metrics = RelayerMetrics(metrics) if metrics is not None else None
+
+        self._session = None
+        self._http_client = None
+        self._executor = None
+        if not use_aiohttp:
+            self._http_client = HttpClient(
+                pool_maxsize=pool_maxsize,
+                timeout=timeout,
+                endpoint_timeouts=endpoint_timeouts,
+                retry_policy=self.retry_policy,
+                circuit_breaker=self.circuit_breaker,
+                admission=admission,
+                metrics=metrics,
+            )
+            self._executor = ThreadPoolExecutor(
+                max_workers=pool_maxsize, thread_name_prefix="relayer-http"
+            )
+
+    @property
+    def blocking_client(self) -> Optional[HttpClient]:
+        """
+        HttpClient behind the thread pool transport, None with aiohttp
+        """
+        return self._http_client
+
+    def timeout_for(self, request_path: str) -> Timeout:
+        """
+        Returns the timeout configured for the request path
+        """
+        return self.endpoint_timeouts.get(request_path, self.timeout)
+
+    async def request(
+        self,
+        endpoint: str,
+        method: str,
+        headers=None,
+        data=None,
+        timeout: Optional[Timeout] = None,
+    ):
+        if timeout is None:
+            timeout = self.timeout
+
+        if not self.use_aiohttp:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                partial(
+                    self._http_client.request, endpoint, method, headers, data, timeout
+                ),
+            )
+
+        attempts = AttemptTracker(
+            method,
+            urlsplit(endpoint).path,
+            self.retry_policy,
+            self.circuit_breaker,
+            self.admission,
+            self.metrics,
+        )
+        while True:
+            attempts.begin()
+            try:
+                permit = None
+                if self.admission is not None:
+                    permit = await self.admission.acquire_async()
+                attempts.admitted(permit)
+                async with self._get_session().request(
+                    method,
+                    endpoint,
+                    timeout=_client_timeout(timeout),
+                    **body_arguments(headers, data),
+                ) as resp:
+                    text = await resp.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                attempts.transport_error(isinstance(e, aiohttp.ClientConnectorError))
+                error = RelayerApiException(error_msg="Request exception!")
+            except BaseException:
+                attempts.abort()
+                raise
+            else:
+                if attempts.response(resp.status, resp.headers.get("Retry-After")):
+                    return _parse_body(text)
+                error = RelayerApiException(
+                    error_msg=_error_message(text), status_code=resp.status
+                )
+
+            delay = attempts.retry_delay()
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+
+    async def post(self, endpoint, headers=None, data=None, timeout=None):
+        return await self.request(endpoint, POST, headers, data, timeout)
+
+    async def get(self, endpoint, headers=None, data=None, timeout=None):
+        return await self.request(endpoint, GET, headers, data, timeout)
+
+    async def delete(self, endpoint, headers=None, data=None, timeout=None):
+        return await self.request(endpoint, DELETE, headers, data, timeout)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._http_client.close()
+
+    def _get_session(self):
+        # aiohttp sessions must be created inside the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize)
+            )
+        return self._session
+
+
+def _client_timeout(timeout: Timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+def _parse_body(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _error_message(text: str):
+    """
+    Message of an error response, its raw text when the body is JSON null
+    """
+    message = _parse_body(text)
+    return text if message is None else message
@@ -1,28 +1,391 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 
 from ..exceptions import RelayerApiException
+from ..metrics import MetricsRegistry, RelayerMetrics
+from .admission import AdmissionController
+from .retry import CircuitBreaker, RetryPolicy, is_failure_status, parse_retry_after
 
 GET = "GET"
 POST = "POST"
 DELETE = "DELETE"
 PUT = "PUT"
 
+# (connect timeout, read timeout) in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_PREPARED_CACHE_SIZE = 256
+DEFAULT_CHUNK_SIZE = 64 * 1024
+JSON_CONTENT_TYPE = "application/json"
 
-def request(endpoint: str, method: str, headers=None, data=None):
-    try:
-        resp = requests.request(
-            method=method, url=endpoint, headers=headers, json=data if data else None
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP transport backed by a requests.Session
+    Connections are reused across calls, every call has a timeout and
+    header-less GETs reuse their prepared request. Failed calls are retried as the
+    retry policy allows, behind a per endpoint circuit breaker. An admission controller,
+    possibly shared with other clients, bounds the request rate and concurrency. With a
+    metrics registry every attempt is timed and its errors and retries are counted
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        endpoint_timeouts: Optional[Dict[str, Timeout]] = None,
+        prepared_cache_size: int = DEFAULT_PREPARED_CACHE_SIZE,
+        session: Optional[requests.Session] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        admission: Optional[AdmissionController] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.session = session if session is not None else requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.timeout = timeout
+        self.endpoint_timeouts = dict(endpoint_timeouts or {})
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
         )
-        if resp.status_code != 200:
-            raise RelayerApiException(resp)
+        self.admission = admission
+        self.metrics = RelayerMetrics(metrics) if metrics is not None else None
 
+        self._prepared_cache_size = prepared_cache_size
+        self._prepared = OrderedDict()
+        self._prepared_lock = threading.Lock()
+
+    def timeout_for(self, request_path: str) -> Timeout:
+        """
+        Returns the timeout configured for the request path
+        """
+        return self.endpoint_timeouts.get(request_path, self.timeout)
+
+    def request(
+        self,
+        endpoint: str,
+        method: str,
+        headers=None,
+        data=None,
+        timeout: Optional[Timeout] = None,
+    ):
+        resp = self._send(endpoint, method, headers, data, timeout)
         try:
             return resp.json()
         except requests.JSONDecodeError:
             return resp.text
 
-    except requests.RequestException:
-        raise RelayerApiException(error_msg="Request exception!")
+    def stream(
+        self,
+        endpoint: str,
+        headers=None,
+        timeout: Optional[Timeout] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Sends a GET and yields the response body in chunks as it arrives
+        Failures before the body starts are retried as for get
+        """
+        resp = self._send(endpoint, GET, headers, None, timeout, stream=True)
+        try:
+            for chunk in resp.iter_content(chunk_size):
+                if chunk:
+                    yield chunk
+        except requests.RequestException:
+            raise RelayerApiException(error_msg="Request exception!")
+        finally:
+            resp.close()
+
+    def _send(
+        self,
+        endpoint: str,
+        method: str,
+        headers,
+        data,
+        timeout: Optional[Timeout],
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Sends the request until it gets a 200 or the retry policy gives up
+        """
+        try:
+            prepared, settings = self._prepare(method, endpoint, headers, data)
+        except requests.RequestException:
+            raise RelayerApiException(error_msg="Request exception!")
+        if timeout is None:
+            timeout = self.timeout
+        if stream:
+            settings = dict(settings, stream=True)
+
+        attempts = AttemptTracker(
+            method,
+            urlsplit(endpoint).path,
+            self.retry_policy,
+            self.circuit_breaker,
+            self.admission,
+            self.metrics,
+        )
+        while True:
+            attempts.begin()
+            try:
+                attempts.admitted(
+                    self.admission.acquire() if self.admission is not None else None
+                )
+                resp = self.session.send(
+                    prepared.copy() if attempts.attempt > 1 else prepared,
+                    timeout=timeout,
+                    **settings,
+                )
+            except requests.RequestException as e:
+                attempts.transport_error(_connect_failed(e))
+                error = RelayerApiException(error_msg="Request exception!")
+            except BaseException:
+                attempts.abort()
+                raise
+            else:
+                if attempts.response(resp.status_code, resp.headers.get("Retry-After")):
+                    return resp
+                error = RelayerApiException(resp)
+
+            delay = attempts.retry_delay()
+            if delay is None:
+                raise error
+            time.sleep(delay)
+
+    def post(self, endpoint, headers=None, data=None, timeout=None):
+        return self.request(endpoint, POST, headers, data, timeout)
+
+    def get(self, endpoint, headers=None, data=None, timeout=None):
+        return self.request(endpoint, GET, headers, data, timeout)
+
+    def delete(self, endpoint, headers=None, data=None, timeout=None):
+        return self.request(endpoint, DELETE, headers, data, timeout)
+
+    def close(self):
+        self.session.close()
+
+    def _prepare(self, method: str, endpoint: str, headers, data):
+        if headers or data or self._prepared_cache_size <= 0:
+            return self._prepare_new(method, endpoint, headers, data)
+
+        key = (method, endpoint)
+        with self._prepared_lock:
+            cached = self._prepared.get(key)
+            if cached is not None:
+                self._prepared.move_to_end(key)
+        if cached is not None:
+            prepared, settings = cached
+            return prepared.copy(), settings
+
+        prepared, settings = self._prepare_new(method, endpoint, None, None)
+        with self._prepared_lock:
+            self._prepared[key] = (prepared, settings)
+            if len(self._prepared) > self._prepared_cache_size:
+                self._prepared.popitem(last=False)
+        return prepared.copy(), settings
+
+    def _prepare_new(self, method: str, endpoint: str, headers, data):
+        prepared = self.session.prepare_request(
+            requests.Request(
+                method=method, url=endpoint, **body_arguments(headers, data)
+            )
+        )
+        settings = self.session.merge_environment_settings(
+            prepared.url, {}, None, None, None
+        )
+        return prepared, settings
+
+
+class AttemptTracker:
+    """
+    Bookkeeping of the attempts of one request, shared by the sync and async transports
+    Feeds every attempt's outcome to the circuit breaker, the admission permit and the
+    metrics, and tells whether and when the request is retried
+    """
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        retry_policy: RetryPolicy,
+        circuit_breaker: CircuitBreaker,
+        admission: Optional[AdmissionController] = None,
+        metrics: Optional[RelayerMetrics] = None,
+    ):
+        self.method = method
+        self.path = path
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.admission = admission
+        self.metrics = metrics
+        self.attempt = 0
+        self._permit = None
+        self._started = None
+        self._retry = False
+        self._retry_after = None
+
+    def begin(self) -> None:
+        """
+        Starts an attempt, raises RelayerCircuitOpenException if the endpoint fails fast
+        """
+        self.circuit_breaker.before_call(self.path)
+        self.attempt += 1
+        self._permit = None
+        self._retry = False
+        self._retry_after = None
+
+    def admitted(self, permit) -> None:
+        """
+        Records the admission permit of the attempt, None without admission control
+        """
+        self._permit = permit
+        self._started = time.perf_counter()
+
+    def response(self, status_code: int, retry_after: Optional[str] = None) -> bool:
+        """
+        Records the attempt's response, returns whether it is the result
+        """
+        failure = is_failure_status(status_code)
+        self._finish(failure, status_code)
+        if status_code == 200:
+            self.circuit_breaker.record_success(self.path)
+            return True
+        if failure:
+            self.circuit_breaker.record_failure(self.path)
+        else:
+            self.circuit_breaker.record_success(self.path)
+        self._retry = self.retry_policy.retry_status(self.method, status_code)
+        self._retry_after = parse_retry_after(retry_after)
+        return False
+
+    def transport_error(self, connect_failed: bool) -> None:
+        """
+        Records an attempt that got no response, connect_failed tells it was never sent
+        """
+        self._finish(True, None)
+        self.circuit_breaker.record_failure(self.path)
+        self._retry = self.retry_policy.retry_error(self.method, connect_failed)
+
+    def abort(self) -> None:
+        """
+        Records an attempt ended by any other exception, a cancellation for instance
+        Its permit and a half open trial it held are released
+        """
+        if self._permit is not None:
+            self._permit.overloaded()
+            self.admission.release(self._permit)
+            self._permit = None
+        self.circuit_breaker.abort_trial(self.path)
+
+    def retry_delay(self) -> Optional[float]:
+        """
+        Seconds to wait before retrying the failed attempt, None to give up
+        """
+        if not self._retry:
+            return None
+        delay = self.retry_policy.delay(self.attempt, self._retry_after)
+        if delay is not None and self.metrics is not None:
+            self.metrics.http_retries.inc(self.path)
+        return delay
+
+    def _finish(self, overloaded: bool, status_code: Optional[int]) -> None:
+        if self._permit is not None:
+            if overloaded:
+                self._permit.overloaded()
+            self.admission.release(self._permit)
+            self._permit = None
+        if self.metrics is not None:
+            observe_attempt(
+                self.metrics, self.path, self.method, self._started, status_code
+            )
+
+
+def encode_json(body) -> bytes:
+    """
+    Serializes body into the compact JSON bytes that are both signed and sent
+    Single quotes are escaped, builder signing would otherwise rewrite them in the
+    signed text only
+    """
+    text = json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+    return text.replace("'", "\\u0027").encode("utf-8")
+
+
+def body_arguments(headers, data) -> Dict:
+    """
+    Request arguments sending data, bytes as already serialized JSON and anything
+    else serialized to JSON by the transport
+    """
+    if isinstance(data, bytes):
+        return {
+            "headers": {"Content-Type": JSON_CONTENT_TYPE, **(headers or {})},
+            "data": data,
+        }
+    return {"headers": headers, "json": data if data else None}
+
+
+def observe_attempt(
+    metrics: RelayerMetrics,
+    path: str,
+    method: str,
+    started: float,
+    status_code: Optional[int],
+) -> None:
+    """
+    Records the duration of an attempt started at the time.perf_counter() given
+    """
+    metrics.http_duration.observe(time.perf_counter() - started, path, method)
+    if status_code is not None and status_code >= 400:
+        metrics.http_errors.inc(path, status_code)
+
+
+def _connect_failed(e: requests.RequestException) -> bool:
+    """
+    Whether the request failed before it could be sent
+    """
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+    if isinstance(e, requests.ConnectionError) and e.args:
+        reason = getattr(e.args[0], "reason", e.args[0])
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+    return False
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HttpClient:
+    """
+    Returns the process wide HttpClient used by the module level helpers
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
+
+
+def request(endpoint: str, method: str, headers=None, data=None):
+    return get_default_client().request(endpoint, method, headers, data)
 
 
 def post(endpoint, headers=None, data=None):
@@ -0,0 +1,80 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+from ..exceptions import RelayerClientException
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yields the elements of a JSON array as its bytes arrive
+    Only the element being parsed is buffered, so memory is bounded by the largest
+    element rather than the whole document
+    Raises RelayerClientException if the document is not a well formed array
+    """
+    chunks = iter(chunks)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    # Parser positions: before the opening bracket, before an element, after one
+    expect = "open"
+    for chunk in chunks:
+        buf += utf8.decode(chunk)
+        pos = 0
+        while True:
+            pos = _skip_whitespace(buf, pos)
+            if pos == len(buf):
+                break
+            if expect == "open":
+                if buf[pos] != "[":
+                    raise RelayerClientException("expected a JSON array")
+                pos += 1
+                expect = "first"
+                continue
+            if expect == "after":
+                if buf[pos] == "]":
+                    _expect_end(buf[pos + 1 :], chunks, utf8)
+                    return
+                if buf[pos] != ",":
+                    raise RelayerClientException("malformed JSON array")
+                pos += 1
+                expect = "next"
+                continue
+            if expect == "first" and buf[pos] == "]":
+                _expect_end(buf[pos + 1 :], chunks, utf8)
+                return
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely cut off by the chunk boundary
+                break
+            # A number at the end of the buffer may continue in the next chunk
+            if _skip_whitespace(buf, end) == len(buf):
+                break
+            yield value
+            pos = end
+            expect = "after"
+        buf = buf[pos:]
+
+    # Also reached when an element never decodes
+    raise RelayerClientException("truncated or malformed JSON array")
+
+
+def _skip_whitespace(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _expect_end(rest: str, chunks: Iterator[bytes], utf8):
+    """
+    Checks that nothing but whitespace follows the closing bracket
+    """
+    for chunk in chunks:
+        rest += utf8.decode(chunk)
+        if rest.strip(_WHITESPACE):
+            break
+    if rest.strip(_WHITESPACE):
+        raise RelayerClientException("unexpected data after JSON array")
@@ -0,0 +1,180 @@
+import random
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from ..exceptions import RelayerCircuitOpenException
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+RETRYABLE_STATUS_CODES = frozenset([429, 502, 503, 504])
+# Status codes the relayer answers without processing the request
+REJECTED_STATUS_CODES = frozenset([429])
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF = 0.1
+DEFAULT_MAX_BACKOFF = 2.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed relayer call is retried and how long to wait before it
+    Idempotent requests are retried on transport errors and retryable status codes.
+    Other requests, such as POST /submit, are only retried when they provably never
+    reached the relayer: the connection could not be established, or it was rejected
+    with a 429
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        multiplier: float = 2.0,
+        retry_status_codes: Iterable[int] = RETRYABLE_STATUS_CODES,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.retry_status_codes = frozenset(retry_status_codes)
+
+    def retry_status(self, method: str, status_code: int) -> bool:
+        """
+        Whether a response with the status code is worth retrying
+        """
+        if status_code not in self.retry_status_codes:
+            return False
+        return status_code in REJECTED_STATUS_CODES or _is_idempotent(method)
+
+    def retry_error(self, method: str, connect_failed: bool) -> bool:
+        """
+        Whether a transport error is worth retrying
+        connect_failed tells the request was never sent
+        """
+        return connect_failed or _is_idempotent(method)
+
+    def delay(
+        self, attempt: int, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Seconds to wait after the given failed attempt (1 based), None to give up
+        Exponential backoff with full jitter, or the server's Retry-After if it fits
+        within max_backoff
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * self.multiplier ** (attempt - 1))
+        )
+
+
+# Policy of clients that must not retry anything
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker:
+    """
+    Per endpoint circuit breaker
+    After failure_threshold consecutive failures the endpoint fails fast for
+    reset_timeout seconds, then a single trial call is let through: its success closes
+    the circuit and its failure opens it again. A failure_threshold of 0 disables it
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        # endpoint -> time the circuit opened
+        self._opened_at: Dict[str, float] = {}
+        self._trials: Set[str] = set()
+
+    def before_call(self, endpoint: str) -> None:
+        """
+        Raises RelayerCircuitOpenException if the endpoint must not be called
+        """
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return
+            retry_in = opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0 or endpoint in self._trials:
+                raise RelayerCircuitOpenException(endpoint, max(0.0, retry_in))
+            # Half open, this call is the trial
+            self._trials.add(endpoint)
+
+    def record_success(self, endpoint: str) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+            self._trials.discard(endpoint)
+
+    def abort_trial(self, endpoint: str) -> None:
+        """
+        Ends a call that neither succeeded nor failed, such as a cancelled one
+        If it was the half open trial, the next call becomes the trial
+        """
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._trials.discard(endpoint)
+
+    def record_failure(self, endpoint: str) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            if endpoint in self._trials or failures >= self.failure_threshold:
+                self._opened_at[endpoint] = time.monotonic()
+                self._trials.discard(endpoint)
+
+    def state(self, endpoint: str) -> str:
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return CLOSED
+            if endpoint in self._trials:
+                return HALF_OPEN
+            if time.monotonic() - opened_at < self.reset_timeout:
+                return OPEN
+            return HALF_OPEN
+
+
+def is_failure_status(status_code: int) -> bool:
+    """
+    Whether a status code tells the relayer is unhealthy, rather than the request bad
+    """
+    return status_code >= 500 or status_code in REJECTED_STATUS_CODES
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given in seconds, HTTP dates are ignored
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _is_idempotent(method: str) -> bool:
+    return method.upper() in IDEMPOTENT_METHODS
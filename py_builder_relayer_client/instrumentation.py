@@ -0,0 +1,169 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SPANS = 10_000
+
+# Innermost span in progress in the current thread or task
+_current: contextvars.ContextVar = contextvars.ContextVar("relayer_span", default=None)
+
+
+class Instrumentation:
+    """
+    Hook receiving the timed spans of a client's phases
+    Override on_span, it runs on whichever thread finished the span and must be quick
+    """
+
+    def on_span(self, span: "Span") -> None:
+        pass
+
+
+class Span:
+    """
+    A timed phase: name, attributes, parent span, duration in seconds and the name of
+    the exception it ended with, if any
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "parent",
+        "start",
+        "duration",
+        "error",
+        "_hook",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        hook: Instrumentation,
+        name: str,
+        attributes: Dict,
+        parent: Optional["Span"] = None,
+    ):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start = None
+        self.duration = None
+        self.error = None
+        self._hook = hook
+        self._token = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        try:
+            self._hook.on_span(self)
+        except Exception:
+            logger.exception("Instrumentation hook failed on span %s", self.name)
+        return False
+
+    def __repr__(self):
+        return f"Span(name={self.name!r}, duration={self.duration}, {self.attributes})"
+
+
+class _NoopSpan:
+    """
+    Shared stand-in used when nothing is instrumented
+    """
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Starts the top level spans of a client, nothing is timed without a hook
+    """
+
+    __slots__ = ("hook",)
+
+    def __init__(self, hook: Optional[Instrumentation] = None):
+        self.hook = hook
+
+    @property
+    def enabled(self) -> bool:
+        return self.hook is not None
+
+    def span(self, name: str, **attributes):
+        if self.hook is None:
+            return NOOP_SPAN
+        return Span(self.hook, name, attributes, _current.get())
+
+
+def span(name: str, **attributes):
+    """
+    Starts a child of the span in progress, a no-op outside of an instrumented call
+    """
+    parent = _current.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent._hook, name, attributes, parent)
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Binds fn to the span in progress, so the spans it starts on an executor thread
+    are nested under it
+    """
+    if _current.get() is None:
+        return fn
+    return partial(contextvars.copy_context().run, fn)
+
+
+class SpanCollector(Instrumentation):
+    """
+    Keeps the last max_spans finished spans in memory
+    """
+
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS):
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=max_spans)
+
+    def on_span(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def durations(self, name: str) -> List[float]:
+        """
+        Durations of the collected spans with the given name, oldest first
+        """
+        return [s.duration for s in self.spans if s.name == name]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
@@ -0,0 +1,220 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .models import RelayerTransactionState
+from .waiter import TERMINAL_STATES
+
+# Local states of entries the relayer has not acknowledged
+STATE_SUBMITTING = "SUBMITTING"
+STATE_REJECTED = "REJECTED"
+
+# Relayer states after which a transaction is no longer pending, invalid ones
+# included as they never progress
+JOURNAL_TERMINAL_STATES = TERMINAL_STATES | {
+    RelayerTransactionState.STATE_INVALID.value
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_id TEXT UNIQUE,
+    transaction_hash TEXT,
+    from_address TEXT,
+    nonce TEXT,
+    type TEXT,
+    state TEXT NOT NULL,
+    request TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_state ON entries (state);
+CREATE TABLE IF NOT EXISTS state_changes (
+    entry_id INTEGER NOT NULL REFERENCES entries (id),
+    state TEXT NOT NULL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS state_changes_entry ON state_changes (entry_id);
+"""
+
+_COLUMNS = (
+    "id, transaction_id, transaction_hash, from_address, nonce, type, state, "
+    "request, created_at, updated_at"
+)
+
+
+@dataclass
+class JournalEntry:
+    entry_id: int
+    transaction_id: Optional[str]
+    transaction_hash: Optional[str]
+    from_address: Optional[str]
+    nonce: Optional[str]
+    type: Optional[str]
+    state: str
+    request: dict
+    created_at: float
+    updated_at: float
+
+
+class TransactionJournal:
+    """
+    Durable SQLite record of the transactions a client submits
+    Every signed request is written before it is sent, then its transaction id and
+    each state the relayer reports. After a restart, pending() lists the transactions
+    still worth waiting for and unsubmitted() the requests whose submission outcome
+    is unknown, so neither needs a scan of the builder's history
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                # Survives a crash of the process without an fsync per write
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def record_request(self, request: dict) -> int:
+        """
+        Records a signed request about to be submitted, returns its entry id
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO entries (from_address, nonce, type, state, request, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request.get("from"),
+                    request.get("nonce"),
+                    request.get("type"),
+                    STATE_SUBMITTING,
+                    json.dumps(request),
+                    now,
+                    now,
+                ),
+            )
+            entry_id = cursor.lastrowid
+            self._add_state_change(entry_id, STATE_SUBMITTING, now)
+        return entry_id
+
+    def record_submitted(
+        self,
+        entry_id: int,
+        transaction_id: str,
+        transaction_hash: Optional[str] = None,
+        state: Optional[str] = None,
+    ) -> None:
+        """
+        Records the relayer's acknowledgement of a submitted request
+        """
+        state = state or "STATE_NEW"
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET transaction_id = ?, transaction_hash = ?, "
+                "state = ?, updated_at = ? WHERE id = ?",
+                (transaction_id, transaction_hash, state, now, entry_id),
+            )
+            self._add_state_change(entry_id, state, now)
+
+    def record_rejected(self, entry_id: int) -> None:
+        """
+        Records a request the relayer refused
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET state = ?, updated_at = ? WHERE id = ?",
+                (STATE_REJECTED, now, entry_id),
+            )
+            self._add_state_change(entry_id, STATE_REJECTED, now)
+
+    def record_state(
+        self, transaction_id: str, state: str, transaction_hash: Optional[str] = None
+    ) -> bool:
+        """
+        Records the state of a transaction as observed on the relayer
+        Returns whether it is a change, observing the same state again is a no-op
+        """
+        if transaction_id is None or not state:
+            return False
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id, state FROM entries WHERE transaction_id = ?",
+                (transaction_id,),
+            ).fetchone()
+            if row is None or row[1] == state:
+                return False
+            self._conn.execute(
+                "UPDATE entries SET state = ?, "
+                "transaction_hash = COALESCE(?, transaction_hash), updated_at = ? "
+                "WHERE id = ?",
+                (state, transaction_hash, now, row[0]),
+            )
+            self._add_state_change(row[0], state, now)
+        return True
+
+    def get(self, transaction_id: str) -> Optional[JournalEntry]:
+        rows = self._select("WHERE transaction_id = ?", (transaction_id,))
+        return rows[0] if rows else None
+
+    def pending(self) -> List[JournalEntry]:
+        """
+        Acknowledged transactions that have not reached a terminal state
+        """
+        terminal = sorted(JOURNAL_TERMINAL_STATES)
+        placeholders = ", ".join("?" for _ in terminal)
+        return self._select(
+            f"WHERE transaction_id IS NOT NULL AND state NOT IN ({placeholders}) "
+            "ORDER BY id",
+            terminal,
+        )
+
+    def unsubmitted(self) -> List[JournalEntry]:
+        """
+        Requests recorded before submission that were neither acknowledged nor
+        rejected, the process stopped or the connection failed mid submit
+        """
+        return self._select("WHERE state = ? ORDER BY id", (STATE_SUBMITTING,))
+
+    def history(self, transaction_id: str) -> List[Tuple[str, float]]:
+        """
+        The states of the transaction with the time.time() they were observed
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT s.state, s.observed_at FROM state_changes s "
+                "JOIN entries e ON e.id = s.entry_id "
+                "WHERE e.transaction_id = ? ORDER BY s.rowid",
+                (transaction_id,),
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _add_state_change(self, entry_id: int, state: str, now: float):
+        self._conn.execute(
+            "INSERT INTO state_changes (entry_id, state, observed_at) VALUES (?, ?, ?)",
+            (entry_id, state, now),
+        )
+
+    def _select(self, where: str, params) -> List[JournalEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM entries {where}", tuple(params)
+            ).fetchall()
+        return [_to_entry(row) for row in rows]
+
+
+def _to_entry(row) -> JournalEntry:
+    values: Dict = dict(zip(JournalEntry.__dataclass_fields__, row))
+    values["request"] = json.loads(values["request"])
+    return JournalEntry(**values)
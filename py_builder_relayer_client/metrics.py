@@ -0,0 +1,264 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONFIRMATION_BUCKETS = (1.0, 2.0, 5.0, 10.0, 15.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+POLL_ROUND_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+
+class _CounterValue:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramValue:
+    __slots__ = ("_lock", "_bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        # Per bucket counts, the last one is +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # The bucket is found outside the lock, only the increments are guarded
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Metric(ABC):
+    """
+    A named metric with a value per combination of label values
+    """
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values):
+        """
+        Returns the value of the label values, given in labelnames order
+        """
+        key = tuple(str(v) for v in values)
+        value = self._values.get(key)
+        if value is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            with self._lock:
+                value = self._values.get(key)
+                if value is None:
+                    value = self._new_value()
+                    self._values[key] = value
+        return value
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    @abstractmethod
+    def _new_value(self):
+        """
+        Creates the value of a new combination of label values
+        """
+
+
+class Counter(Metric):
+    kind = COUNTER
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self.labels(*labels).inc(amount)
+
+    def value(self, *labels) -> float:
+        return self.labels(*labels).value
+
+    def _new_value(self):
+        return _CounterValue()
+
+
+class Histogram(Metric):
+    kind = HISTOGRAM
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(b for b in buckets if b != math.inf))
+        if not self.buckets:
+            raise ValueError("at least one finite bucket is required")
+
+    def observe(self, value: float, *labels) -> None:
+        self.labels(*labels).observe(value)
+
+    def count(self, *labels) -> int:
+        return sum(self.labels(*labels).snapshot()[0])
+
+    def _new_value(self):
+        return _HistogramValue(self.buckets)
+
+
+class MetricsRegistry:
+    """
+    Thread safe set of counters and histograms
+    Asking for a metric that exists returns it, so clients sharing a registry share
+    their metrics
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def metrics(self) -> List[Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format
+        """
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in metric.samples():
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind == COUNTER:
+                    lines.append(
+                        f"{metric.name}{_labels(labels)} {_number(value.value)}"
+                    )
+                    continue
+                counts, total = value.snapshot()
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (math.inf,), counts):
+                    cumulative += count
+                    le = labels + [("le", _number(bound))]
+                    lines.append(f"{metric.name}_bucket{_labels(le)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{metric.name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} is already registered differently")
+            return metric
+
+
+class RelayerMetrics:
+    """
+    The metrics the client and its HTTP transport record
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.http_duration = registry.histogram(
+            "relayer_http_request_duration_seconds",
+            "Duration of HTTP attempts by endpoint",
+            ("endpoint", "method"),
+            LATENCY_BUCKETS,
+        )
+        self.http_errors = registry.counter(
+            "relayer_http_errors_total",
+            "HTTP attempts answered with a 4xx or 5xx status",
+            ("endpoint", "status_code"),
+        )
+        self.http_retries = registry.counter(
+            "relayer_http_retries_total",
+            "HTTP attempts retried after a failure",
+            ("endpoint",),
+        )
+        self.submits = registry.counter(
+            "relayer_submits_total",
+            "Transactions submitted to the relayer by type",
+            ("type",),
+        )
+        self.poll_rounds = registry.histogram(
+            "relayer_poll_rounds",
+            "Polls made while waiting for a transaction",
+            (),
+            POLL_ROUND_BUCKETS,
+        )
+        self.time_to_confirmation = registry.histogram(
+            "relayer_time_to_confirmation_seconds",
+            "Seconds from submission to a mined or confirmed state",
+            (),
+            CONFIRMATION_BUCKETS,
+        )
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    inner = ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs)
+    return "{" + inner + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
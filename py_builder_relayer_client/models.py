@@ -176,3 +176,81 @@ class SplitSig:
     r: str
     s: str
     v: str
+
+
+class RelayerTransactionRecord:
+    """
+    A builder transaction as listed by the relayer
+    Call data and signatures are not kept, get_transaction returns them
+    """
+
+    __slots__ = (
+        "transaction_id",
+        "transaction_hash",
+        "from_address",
+        "to",
+        "proxy_address",
+        "nonce",
+        "state",
+        "type",
+        "owner",
+        "metadata",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        transaction_id: str,
+        transaction_hash: str = None,
+        from_address: str = None,
+        to: str = None,
+        proxy_address: str = None,
+        nonce: str = None,
+        state: str = None,
+        type: str = None,
+        owner: str = None,
+        metadata: str = None,
+        created_at: str = None,
+        updated_at: str = None,
+    ):
+        self.transaction_id = transaction_id
+        self.transaction_hash = transaction_hash
+        self.from_address = from_address
+        self.to = to
+        self.proxy_address = proxy_address
+        self.nonce = nonce
+        self.state = state
+        self.type = type
+        self.owner = owner
+        self.metadata = metadata
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_dict(cls, txn: Dict) -> "RelayerTransactionRecord":
+        return cls(
+            transaction_id=txn.get("transactionID"),
+            transaction_hash=txn.get("transactionHash"),
+            from_address=txn.get("from"),
+            to=txn.get("to"),
+            proxy_address=txn.get("proxyAddress"),
+            nonce=txn.get("nonce"),
+            state=txn.get("state"),
+            type=txn.get("type"),
+            owner=txn.get("owner"),
+            metadata=txn.get("metadata"),
+            created_at=txn.get("createdAt"),
+            updated_at=txn.get("updatedAt"),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, RelayerTransactionRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return (
+            f"RelayerTransactionRecord(transaction_id={self.transaction_id!r}, "
+            f"state={self.state!r}, updated_at={self.updated_at!r})"
+        )
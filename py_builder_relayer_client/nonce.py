@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Any, Callable, Optional, Set
+
+DEFAULT_NONCE_MAX_AGE = 30.0
+
+
+class NonceManager:
+    """
+    Hands out increasing SAFE nonces for a single signer
+    The nonce is fetched from the relayer once and then reserved locally, a resync is
+    only needed after a rejected submission or once the local state is older than max_age
+    """
+
+    def __init__(self, max_age: Optional[float] = DEFAULT_NONCE_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._next = None
+        self._synced_at = None
+        self._in_flight: Set[int] = set()
+        self._confirmed = None
+
+    def reserve(self) -> Optional[int]:
+        """
+        Reserves the next nonce
+        Returns None if the manager must first be synced from the relayer
+        """
+        with self._lock:
+            if self._needs_sync():
+                return None
+            return self._reserve()
+
+    def reserve_or_sync(self, fetch: Callable[[], Any]) -> int:
+        """
+        Reserves the next nonce, calling fetch for the relayer nonce if a sync is needed
+        Concurrent callers share a single fetch
+        """
+        nonce = self.reserve()
+        if nonce is not None:
+            return nonce
+        with self._sync_lock:
+            nonce = self.reserve()
+            if nonce is None:
+                nonce = self.sync(fetch(), reserve=True)
+        return nonce
+
+    def sync(self, nonce, reserve: bool = False) -> Optional[int]:
+        """
+        Syncs the manager with the nonce reported by the relayer
+        A resync never moves backwards unless the manager was invalidated
+        If reserve is set, the next nonce is reserved and returned
+        """
+        nonce = int(nonce)
+        with self._lock:
+            if self._next is None:
+                self._next = nonce
+            else:
+                self._next = max(self._next, nonce)
+            self._synced_at = time.monotonic()
+            if reserve:
+                return self._reserve()
+        return None
+
+    def confirm(self, nonce: int) -> None:
+        """
+        Marks a reserved nonce as accepted by the relayer
+        """
+        with self._lock:
+            self._in_flight.discard(nonce)
+            if self._confirmed is None or nonce > self._confirmed:
+                self._confirmed = nonce
+
+    def release(self, nonce: int) -> None:
+        """
+        Releases a reserved nonce that was never accepted by the relayer
+        The local state is no longer trusted and the next reservation resyncs
+        """
+        with self._lock:
+            self._in_flight.discard(nonce)
+            self._invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Forces a resync from the relayer on the next reservation
+        """
+        with self._lock:
+            self._invalidate()
+
+    @property
+    def in_flight(self) -> Set[int]:
+        with self._lock:
+            return set(self._in_flight)
+
+    @property
+    def confirmed(self) -> Optional[int]:
+        return self._confirmed
+
+    def _reserve(self) -> int:
+        # A resync after a release can point back at nonces still held by others
+        while self._next in self._in_flight:
+            self._next += 1
+        nonce = self._next
+        self._next += 1
+        self._in_flight.add(nonce)
+        return nonce
+
+    def _invalidate(self):
+        self._next = None
+        self._synced_at = None
+
+    def _needs_sync(self) -> bool:
+        if self._next is None:
+            return True
+        if self.max_age is None:
+            return False
+        return time.monotonic() - self._synced_at > self.max_age
@@ -0,0 +1,135 @@
+import random
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+from .models import RelayerTransactionState
+
+DEFAULT_WAIT_TIMEOUT = 60.0
+DEFAULT_MAX_SAMPLES = 256
+
+# States whose time since submission is learned
+TRACKED_STATES = (
+    RelayerTransactionState.STATE_EXECUTED.value,
+    RelayerTransactionState.STATE_MINED.value,
+    RelayerTransactionState.STATE_CONFIRMED.value,
+)
+
+
+class TransitionTimings:
+    """
+    Records how long submitted transactions take to reach each relayer state
+    Keeps a bounded window of the most recent samples per state
+    """
+
+    def __init__(self, max_samples: int = DEFAULT_MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+
+    def record(self, state: str, elapsed: float) -> None:
+        """
+        Records the seconds between submission and the first observation of the state
+        """
+        with self._lock:
+            samples = self._samples.get(state)
+            if samples is None:
+                samples = deque(maxlen=self.max_samples)
+                self._samples[state] = samples
+            samples.append(elapsed)
+
+    def percentile(self, state: str, q: float) -> Optional[float]:
+        """
+        Returns the q (0 to 1) quantile of the state's samples, None if there are none
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(state, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[index]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the sample count and p10/p50/p90/p99 per state
+        """
+        with self._lock:
+            states = list(self._samples)
+        snapshot = {}
+        for state in states:
+            with self._lock:
+                count = len(self._samples[state])
+            snapshot[state] = {
+                "count": count,
+                "p10": self.percentile(state, 0.1),
+                "p50": self.percentile(state, 0.5),
+                "p90": self.percentile(state, 0.9),
+                "p99": self.percentile(state, 0.99),
+            }
+        return snapshot
+
+
+class PollSchedule:
+    """
+    Poll delays for a single wait
+    Before the learned transition window the schedule sleeps straight to its start,
+    inside the window it polls window_polls times spread over the window's width,
+    and past it (or with nothing learned yet) it backs off exponentially, from the
+    window's interval when there is one. Every delay is jittered and kept within
+    min_delay and max_delay
+    """
+
+    def __init__(
+        self,
+        timings: Optional[TransitionTimings],
+        states: Iterable[str],
+        initial_delay: float = 0.5,
+        min_delay: float = 0.25,
+        max_delay: float = 8.0,
+        multiplier: float = 1.6,
+        jitter: float = 0.2,
+        window_polls: int = 4,
+    ):
+        if window_polls < 1:
+            raise ValueError("window_polls must be at least 1")
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.window_polls = window_polls
+        self._backoffs = 0
+
+        # Window of the earliest target state that has been learned
+        self.window_start = None
+        self.window_end = None
+        if timings is not None:
+            for state in TRACKED_STATES:
+                if state in states:
+                    self.window_start = timings.percentile(state, 0.1)
+                    self.window_end = timings.percentile(state, 0.9)
+                    if self.window_start is not None:
+                        break
+
+    def next_delay(self, elapsed: float) -> float:
+        """
+        Returns the seconds to wait before the next poll
+        elapsed is the time since the transaction was submitted
+        """
+        if self.window_start is not None and elapsed < self.window_start:
+            delay = max(self.min_delay, self.window_start - elapsed)
+        elif self.window_end is not None and elapsed < self.window_end:
+            delay = self._window_delay()
+        else:
+            base = self.initial_delay
+            if self.window_end is not None:
+                base = max(base, self._window_delay())
+            delay = min(self.max_delay, base * self.multiplier**self._backoffs)
+            self._backoffs += 1
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(self.min_delay, delay)
+
+    def _window_delay(self) -> float:
+        width = self.window_end - self.window_start
+        return min(self.max_delay, width / self.window_polls)
@@ -0,0 +1,153 @@
+import threading
+import zlib
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from py_builder_signing_sdk.config import BuilderConfig
+
+from .client import DEFAULT_PREFLIGHT_WORKERS, RelayClient
+from .http_helpers.helpers import HttpClient
+from .metrics import MetricsRegistry
+from .models import RelayerTxType, SafeTransaction
+from .response import ClientRelayerTransactionResponse
+from .waiter import TransactionWaiter
+
+
+class PooledRelayClient:
+    """
+    Spreads executes across the safes (or proxies) of several signers
+    Every signer gets its own RelayClient, with its own nonce and deployment state,
+    while the HTTP transport, builder config, pre-flight executor and transaction
+    waiter are shared. An execute goes to the signer with the fewest executes in
+    flight, or to the signer its affinity key maps to
+    """
+
+    def __init__(
+        self,
+        relayer_url,
+        chain_id: int,
+        private_keys: List[str],
+        builder_config: BuilderConfig = None,
+        relayer_tx_type: RelayerTxType = RelayerTxType.SAFE,
+        rpc_url: Optional[str] = None,
+        http_client: Optional[HttpClient] = None,
+        executor: Optional[Executor] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        if not private_keys:
+            raise ValueError("at least one private key is required")
+
+        self._owns_http_client = http_client is None
+        self.http_client = (
+            http_client if http_client is not None else HttpClient(metrics=metrics)
+        )
+        self._owns_executor = executor is None
+        self.executor = (
+            executor
+            if executor is not None
+            else ThreadPoolExecutor(
+                max_workers=DEFAULT_PREFLIGHT_WORKERS * len(private_keys),
+                thread_name_prefix="relayer-preflight",
+            )
+        )
+        self.clients = [
+            RelayClient(
+                relayer_url,
+                chain_id,
+                private_key,
+                builder_config,
+                relayer_tx_type=relayer_tx_type,
+                rpc_url=rpc_url,
+                http_client=self.http_client,
+                executor=self.executor,
+                metrics=metrics,
+            )
+            for private_key in private_keys
+        ]
+        # Transaction lookups are per builder, any member can poll for all of them
+        self.waiter = TransactionWaiter(self.clients[0])
+        for client in self.clients:
+            client._waiter = self.waiter
+
+        self._lock = threading.Lock()
+        self._in_flight = [0] * len(self.clients)
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    @property
+    def addresses(self) -> List[str]:
+        """
+        Signer addresses, in pool order
+        """
+        return [client.signer.address() for client in self.clients]
+
+    @property
+    def in_flight(self) -> Dict[str, int]:
+        """
+        Executes in flight per signer address
+        """
+        with self._lock:
+            counts = list(self._in_flight)
+        return dict(zip(self.addresses, counts))
+
+    def client_for(self, key: Optional[str] = None) -> RelayClient:
+        """
+        Returns the member the affinity key maps to, the least loaded one without a key
+        """
+        return self.clients[self._pick(key)]
+
+    def execute(
+        self,
+        transactions: list[SafeTransaction],
+        metadata: str = None,
+        key: Optional[str] = None,
+    ) -> ClientRelayerTransactionResponse:
+        """
+        Executes the transactions through one of the signers
+        Executes sharing a key always use the same signer, for work that must stay
+        ordered behind a single nonce sequence
+        """
+        index = self._pick(key, reserve=True)
+        try:
+            return self.clients[index].execute(transactions, metadata)
+        finally:
+            with self._lock:
+                self._in_flight[index] -= 1
+
+    def deploy_missing(self) -> List[ClientRelayerTransactionResponse]:
+        """
+        Deploys the safes of the signers that do not have one yet
+        """
+        return [
+            client.deploy()
+            for client in self.clients
+            if not client.get_deployed(client.get_expected_safe())
+        ]
+
+    def close(self):
+        self.waiter.close()
+        for client in self.clients:
+            client._waiter = None
+            client.close()
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+        if self._owns_http_client:
+            self.http_client.close()
+
+    def _pick(self, key: Optional[str], reserve: bool = False) -> int:
+        with self._lock:
+            if key is not None:
+                index = zlib.crc32(key.encode()) % len(self.clients)
+            else:
+                # Least loaded, ties broken round robin
+                count = len(self.clients)
+                index = min(
+                    ((self._next + i) % count for i in range(count)),
+                    key=lambda i: self._in_flight[i],
+                )
+                self._next = (index + 1) % count
+            if reserve:
+                self._in_flight[index] += 1
+            return index
@@ -1,4 +1,6 @@
-from typing import List, Optional
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
 from .models import SafeTransaction, RelayerTransactionState
 
 
@@ -8,11 +10,12 @@ class ClientRelayerTransactionResponse:
         self.transaction_hash = transaction_hash
         self.hash = transaction_hash
         self.client = client
+        self.submitted_at = time.monotonic()
 
     def get_transaction(self) -> List[SafeTransaction]:
         return self.client.get_transaction(self.transaction_id)
 
-    def wait(self) -> Optional[SafeTransaction]:
+    def wait(self, timeout: Optional[float] = None) -> Optional[SafeTransaction]:
         """
         Wait for the transaction to reach a terminal state (mined or confirmed)
         """
@@ -25,5 +28,42 @@ class ClientRelayerTransactionResponse:
                 RelayerTransactionState.STATE_CONFIRMED.value,
             ],
             fail_state=RelayerTransactionState.STATE_FAILED.value,
-            max_polls=30,
+            timeout=timeout,
+            submitted_at=self.submitted_at,
+        )
+
+    def future(self, callback: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Returns a future resolved by the client's shared waiter once the transaction
+        reaches a terminal state (mined, confirmed or failed)
+        """
+        return self.client.waiter.submit(self.transaction_id, callback=callback)
+
+
+class AsyncClientRelayerTransactionResponse:
+    def __init__(self, transaction_id: str, transaction_hash: str, client):
+        self.transaction_id = transaction_id
+        self.transaction_hash = transaction_hash
+        self.hash = transaction_hash
+        self.client = client
+        self.submitted_at = time.monotonic()
+
+    async def get_transaction(self) -> List[SafeTransaction]:
+        return await self.client.get_transaction(self.transaction_id)
+
+    async def wait(self, timeout: Optional[float] = None) -> Optional[SafeTransaction]:
+        """
+        Wait for the transaction to reach a terminal state (mined or confirmed)
+        """
+        if self.transaction_id is None:
+            return None
+        return await self.client.poll_until_state(
+            transaction_id=self.transaction_id,
+            states=[
+                RelayerTransactionState.STATE_MINED.value,
+                RelayerTransactionState.STATE_CONFIRMED.value,
+            ],
+            fail_state=RelayerTransactionState.STATE_FAILED.value,
+            timeout=timeout,
+            submitted_at=self.submitted_at,
         )
@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+
+from eth_keys import keys
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+try:
+    import coincurve
+except ImportError:  # pragma: no cover - optional dependency
+    coincurve = None
+
+EIP191_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+
+class SigningBackend(ABC):
+    """
+    secp256k1 signer holding a private key parsed once
+    """
+
+    name = None
+
+    @abstractmethod
+    def sign_hash(self, message_hash: bytes) -> bytes:
+        """
+        Signs a 32 byte digest, returns the 65 byte r || s || v signature with v in (27, 28)
+        """
+
+
+class EthKeysBackend(SigningBackend):
+    """
+    Signs with eth_keys, the same path eth_account uses
+    """
+
+    name = "eth_keys"
+
+    def __init__(self, private_key: str):
+        self._key = keys.PrivateKey(HexBytes(private_key))
+
+    def sign_hash(self, message_hash: bytes) -> bytes:
+        signature = self._key.sign_msg_hash(message_hash)
+        return signature.to_bytes()[:64] + bytes([signature.v + 27])
+
+
+class CoincurveBackend(SigningBackend):
+    """
+    Signs with the native libsecp256k1 bindings from coincurve
+    """
+
+    name = "coincurve"
+
+    def __init__(self, private_key: str):
+        if coincurve is None:
+            raise ValueError("coincurve is required for the coincurve signing backend")
+        self._key = coincurve.PrivateKey(bytes(HexBytes(private_key)))
+
+    def sign_hash(self, message_hash: bytes) -> bytes:
+        if len(message_hash) != 32:
+            raise ValueError("message hash must be 32 bytes")
+        signature = self._key.sign_recoverable(message_hash, hasher=None)
+        return signature[:64] + bytes([signature[64] + 27])
+
+
+def get_signing_backend(private_key: str) -> SigningBackend:
+    """
+    Returns the fastest available signing backend for the private key
+    """
+    if coincurve is not None:
+        return CoincurveBackend(private_key)
+    return EthKeysBackend(private_key)
+
+
+def hash_eip191_message(message: bytes) -> bytes:
+    """
+    Hashes a message with the EIP191 personal message prefix
+    """
+    return keccak(EIP191_PREFIX + str(len(message)).encode() + message)
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, List, Optional
+
+from .exceptions import RelayerClientException
+from .models import RelayerTransactionState, SafeTransaction
+
+DEFAULT_BATCH_WINDOW = 0.05
+DEFAULT_MAX_BATCH_SIZE = 32
+
+
+class SubmissionHandle:
+    """
+    Handle of a transaction queued for batched submission
+    submitted resolves with the response of the batch the transaction was sent in,
+    the handle itself resolves with the relayer transaction once the batch is mined
+    """
+
+    def __init__(self, transaction: SafeTransaction):
+        self.transaction = transaction
+        self.submitted: Future = Future()
+        self.mined: Future = Future()
+
+    @property
+    def transaction_id(self) -> Optional[str]:
+        """
+        Relayer id of the batch, None until it is submitted
+        """
+        if not self.submitted.done() or self.submitted.exception() is not None:
+            return None
+        return self.submitted.result().transaction_id
+
+    def result(self, timeout: Optional[float] = None) -> dict:
+        """
+        Blocks until the batch is mined, returning its relayer transaction
+        """
+        return self.mined.result(timeout=timeout)
+
+    def done(self) -> bool:
+        return self.mined.done()
+
+    def cancel(self) -> bool:
+        """
+        Drops the transaction if it has not been taken into a batch yet
+        """
+        if not self.mined.cancel():
+            return False
+        self.submitted.cancel()
+        return True
+
+    def add_done_callback(self, callback: Callable[[Future], None]):
+        self.mined.add_done_callback(callback)
+
+
+class SubmissionQueue:
+    """
+    Coalesces single safe transactions into MultiSend batches submitted through execute
+    A batch is sent window seconds after its first transaction was queued, or as soon
+    as it holds max_batch_size transactions. Batches are submitted one at a time, so
+    transactions queued while a batch is in flight join the next one
+    """
+
+    def __init__(
+        self,
+        client,
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        metadata: Optional[str] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.client = client
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.metadata = metadata
+        self.wait_timeout = wait_timeout
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # (handle, time queued)
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._flush = False
+
+    def submit(self, transaction: SafeTransaction) -> SubmissionHandle:
+        """
+        Queues the transaction for the next batch
+        """
+        handle = SubmissionHandle(transaction)
+        with self._cond:
+            if self._closed:
+                raise RelayerClientException("submission queue is closed")
+            self._queue.append((handle, time.monotonic()))
+            self._ensure_started()
+            self._cond.notify()
+        return handle
+
+    def flush(self):
+        """
+        Submits the queued transactions without waiting for the window to end
+        """
+        with self._cond:
+            self._flush = True
+            self._cond.notify()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def close(self):
+        """
+        Submits the queued transactions and stops the queue
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="relayer-submission", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if batch:
+                self._submit(batch)
+
+    def _next_batch(self) -> Optional[List[SubmissionHandle]]:
+        """
+        Waits for the next batch to be due, None once the queue is closed and drained
+        """
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+
+            deadline = self._queue[0][1] + self.window
+            while (
+                len(self._queue) < self.max_batch_size
+                and not self._closed
+                and not self._flush
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = []
+            while self._queue and len(batch) < self.max_batch_size:
+                handle, _ = self._queue.popleft()
+                # Skip transactions cancelled by their caller
+                if handle.mined.set_running_or_notify_cancel():
+                    batch.append(handle)
+            if not self._queue:
+                self._flush = False
+            return batch
+
+    def _submit(self, batch: List[SubmissionHandle]):
+        try:
+            resp = self.client.execute(
+                [handle.transaction for handle in batch], self.metadata
+            )
+        except Exception as e:
+            self.logger.warning(f"Error submitting batch of {len(batch)}: {e}")
+            for handle in batch:
+                handle.submitted.set_exception(e)
+                handle.mined.set_exception(e)
+            return
+
+        for handle in batch:
+            handle.submitted.set_result(resp)
+        try:
+            mined = self.client.waiter.submit(
+                resp.transaction_id, timeout=self.wait_timeout
+            )
+        except Exception as e:
+            for handle in batch:
+                handle.mined.set_exception(e)
+            return
+        mined.add_done_callback(partial(self._resolve, batch))
+
+    def _resolve(self, batch: List[SubmissionHandle], mined: Future):
+        if mined.cancelled():
+            error = RelayerClientException("stopped waiting for the batch")
+        else:
+            error = mined.exception()
+        txn = mined.result() if error is None else None
+        if txn is not None and (
+            txn.get("state") == RelayerTransactionState.STATE_FAILED.value
+        ):
+            error = RelayerClientException(
+                f"transaction {txn.get('transactionID')} failed onchain"
+            )
+        for handle in batch:
+            if error is not None:
+                handle.mined.set_exception(error)
+            else:
+                handle.mined.set_result(txn)
@@ -0,0 +1,249 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Union
+
+from .exceptions import RelayerClientException
+from .models import RelayerTransactionState
+from .polling import DEFAULT_WAIT_TIMEOUT
+
+TERMINAL_STATES = frozenset(
+    [
+        RelayerTransactionState.STATE_MINED.value,
+        RelayerTransactionState.STATE_CONFIRMED.value,
+        RelayerTransactionState.STATE_FAILED.value,
+    ]
+)
+
+DEFAULT_POLL_INTERVAL = 2.0
+# Pending ids from which a round lists the builder's transactions first
+DEFAULT_BULK_THRESHOLD = 10
+# Bounds the listing read by a bulk round
+DEFAULT_BULK_PAGE_SIZE = 100
+DEFAULT_BULK_MAX_PAGES = 5
+
+
+@dataclass
+class _PendingTransaction:
+    future: Future
+    deadline: float
+
+
+class TransactionWaiter:
+    """
+    Waits for any number of relayer transactions from a single scheduler thread
+    Pending transaction ids are polled together in rounds. Each id resolves to a
+    future holding the transaction once it reaches a terminal state (mined,
+    confirmed or failed). Rounds with at least bulk_threshold pending ids first page
+    through the builder's listing, at most bulk_max_pages pages and only until every
+    pending id was seen, and skip the ids still in flight. A bulk_threshold of None
+    polls every id individually
+    """
+
+    def __init__(
+        self,
+        client,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        timeout: float = DEFAULT_WAIT_TIMEOUT,
+        bulk_threshold: Optional[int] = DEFAULT_BULK_THRESHOLD,
+        journal=None,
+        bulk_page_size: int = DEFAULT_BULK_PAGE_SIZE,
+        bulk_max_pages: int = DEFAULT_BULK_MAX_PAGES,
+    ):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.bulk_threshold = bulk_threshold
+        self.bulk_page_size = bulk_page_size
+        self.bulk_max_pages = bulk_max_pages
+        # TransactionJournal recording every state observed, if any
+        self.journal = journal
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._pending: Dict[str, _PendingTransaction] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def submit(
+        self,
+        transaction_id: str,
+        callback: Optional[Callable[[Future], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Future:
+        """
+        Starts waiting for the transaction, returning a future of the terminal transaction
+        Waiting on an id that is already pending returns the existing future
+        """
+        if transaction_id is None:
+            raise ValueError("transaction_id is required")
+
+        with self._cond:
+            if self._closed:
+                raise RelayerClientException("transaction waiter is closed")
+            pending = self._pending.get(transaction_id)
+            if pending is None:
+                timeout = timeout if timeout is not None else self.timeout
+                pending = _PendingTransaction(
+                    future=Future(), deadline=time.monotonic() + timeout
+                )
+                self._pending[transaction_id] = pending
+                self._ensure_started()
+                self._cond.notify()
+
+        if callback is not None:
+            pending.future.add_done_callback(callback)
+        return pending.future
+
+    def as_completed(
+        self,
+        transactions: Iterable[Union[str, Future]],
+        timeout: Optional[float] = None,
+    ) -> Iterator[Future]:
+        """
+        Yields the futures of the given transaction ids (or futures) as they complete
+        """
+        futures = [
+            txn if isinstance(txn, Future) else self.submit(txn) for txn in transactions
+        ]
+        return as_completed(futures, timeout=timeout)
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def close(self):
+        """
+        Stops the scheduler, pending futures are cancelled
+        """
+        with self._cond:
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._cond.notify()
+        for p in pending:
+            p.future.cancel()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="relayer-waiter", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Stop polling for futures cancelled by their caller
+                for transaction_id, p in list(self._pending.items()):
+                    if p.future.cancelled():
+                        del self._pending[transaction_id]
+                transaction_ids = list(self._pending)
+
+            started = time.monotonic()
+            try:
+                self._poll_round(transaction_ids)
+            except Exception:
+                # A bad round must not stop the scheduler, nor the expiry of waits
+                self.logger.exception("Error polling transactions")
+            self._expire()
+
+            with self._cond:
+                remaining = self.poll_interval - (time.monotonic() - started)
+                if remaining > 0 and not self._closed:
+                    self._cond.wait(remaining)
+
+    def _poll_round(self, transaction_ids):
+        in_flight = set()
+        if (
+            self.bulk_threshold is not None
+            and len(transaction_ids) >= self.bulk_threshold
+        ):
+            in_flight = self._list_in_flight(transaction_ids)
+
+        for transaction_id in transaction_ids:
+            if transaction_id in in_flight:
+                continue
+            try:
+                transactions = self.client.get_transaction(transaction_id)
+            except RelayerClientException as e:
+                self.logger.warning(
+                    "Error polling transaction %s: %s", transaction_id, e
+                )
+                continue
+            if not transactions:
+                continue
+            txn = transactions[0] if isinstance(transactions, list) else None
+            if not isinstance(txn, dict):
+                self.logger.warning(
+                    "Unexpected payload polling transaction %s", transaction_id
+                )
+                continue
+            if self.journal is not None:
+                self.journal.record_state(
+                    transaction_id, txn.get("state"), txn.get("transactionHash")
+                )
+            if txn.get("state") in TERMINAL_STATES:
+                self._resolve(transaction_id, txn)
+
+    def _list_in_flight(self, transaction_ids) -> Set[str]:
+        """
+        Pages through the builder's listing until every pending id was seen, returns
+        the ids listed in a non terminal state, which need no poll of their own
+        Terminal ones are still polled, to resolve with the full transaction
+        """
+        remaining = set(transaction_ids)
+        in_flight = set()
+        limit = self.bulk_page_size * self.bulk_max_pages
+        try:
+            records = self.client.iter_transactions(page_size=self.bulk_page_size)
+            for count, record in enumerate(records, 1):
+                if record.transaction_id in remaining:
+                    remaining.discard(record.transaction_id)
+                    if record.state not in TERMINAL_STATES:
+                        in_flight.add(record.transaction_id)
+                        if self.journal is not None:
+                            self.journal.record_state(
+                                record.transaction_id,
+                                record.state,
+                                record.transaction_hash,
+                            )
+                if not remaining or count >= limit:
+                    break
+        except RelayerClientException as e:
+            self.logger.warning("Error listing transactions: %s", e)
+        return in_flight
+
+    def _resolve(self, transaction_id, txn):
+        with self._cond:
+            pending = self._pending.pop(transaction_id, None)
+        if pending is not None and pending.future.set_running_or_notify_cancel():
+            pending.future.set_result(txn)
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._cond:
+            expired = [
+                (transaction_id, p)
+                for transaction_id, p in self._pending.items()
+                if p.deadline <= now
+            ]
+            for transaction_id, _ in expired:
+                del self._pending[transaction_id]
+        for transaction_id, p in expired:
+            if not p.future.set_running_or_notify_cancel():
+                continue
+            p.future.set_exception(
+                RelayerClientException(
+                    f"timed out waiting for transaction {transaction_id}"
+                )
+            )
@@ -19,6 +19,10 @@ setuptools.setup(
         "requests",
         "py-builder-signing-sdk",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["coincurve"],
+    },
     project_urls={
         "Bug Tracker": "https://github.com/Polymarket/py-builder-relayer-client/issues",
     },
@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from py_builder_relayer_client.builder.batch import (
+    BatchJob,
+    build_transaction_requests,
+)
+from py_builder_relayer_client.builder.proxy import build_proxy_transaction_request
+from py_builder_relayer_client.builder.safe import build_safe_transaction_request
+from py_builder_relayer_client.config import get_contract_config
+from py_builder_relayer_client.models import (
+    OperationType,
+    ProxyTransactionArgs,
+    SafeTransaction,
+    SafeTransactionArgs,
+)
+from py_builder_relayer_client.signer import Signer
+
+# Publicly known PKs
+PKS = [
+    "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+    "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d",
+]
+
+
+class TestBatch(TestCase):
+
+    def setUp(self):
+        self.config = get_contract_config(137)
+        self.signers = [Signer(pk, 137) for pk in PKS]
+        txn = SafeTransaction(
+            to="0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+            operation=OperationType.Call,
+            data="0x095ea7b3",
+            value="0",
+        )
+        self.jobs = []
+        for i in range(12):
+            signer = self.signers[i % 2]
+            if i % 3 == 0:
+                args = ProxyTransactionArgs(
+                    from_address=signer.address(),
+                    nonce=str(i),
+                    gas_price="0",
+                    data="0x095ea7b3",
+                    relay="0x1234567890123456789012345678901234567890",
+                    gas_limit="100000",
+                )
+            else:
+                args = SafeTransactionArgs(
+                    from_address=signer.address(),
+                    nonce=str(i),
+                    chain_id=137,
+                    transactions=[txn] * (i % 3),
+                )
+            self.jobs.append(BatchJob(signer=signer, args=args, metadata=str(i)))
+
+    def expected(self):
+        requests = []
+        for job in self.jobs:
+            if isinstance(job.args, SafeTransactionArgs):
+                build = build_safe_transaction_request
+            else:
+                build = build_proxy_transaction_request
+            requests.append(build(job.signer, job.args, self.config, job.metadata))
+        return requests
+
+    def test_build_in_process_pool(self):
+        requests = build_transaction_requests(
+            self.jobs, self.config, max_workers=2, chunksize=2
+        )
+        self.assertEqual(self.expected(), requests)
+
+    def test_build_inline(self):
+        requests = build_transaction_requests(self.jobs, self.config, max_workers=1)
+        self.assertEqual(self.expected(), requests)
+        self.assertEqual([], build_transaction_requests([], self.config))
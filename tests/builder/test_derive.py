@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from py_builder_relayer_client.builder.derive import derive
+from py_builder_relayer_client.builder.derive import derive, derive_many
 
 
 class TestDerive(TestCase):
@@ -11,3 +11,25 @@ class TestDerive(TestCase):
         safe = derive(address, safe_factory)
         expected_safe = "0x6d8c4e9aDF5748Af82Dabe2C6225207770d6B4fa"
         self.assertEqual(expected_safe, safe)
+
+    def test_derive_is_memoized(self):
+        derive.cache_clear()
+        address = "0x6e0c80c90ea6c15917308F820Eac91Ce2724B5b5"
+        safe_factory = "0xaacFeEa03eb1561C4e67d661e40682Bd20E3541b"
+        derive(address, safe_factory)
+        derive(address, safe_factory)
+        self.assertEqual(1, derive.cache_info().hits)
+
+    def test_derive_many(self):
+        safe_factory = "0xaacFeEa03eb1561C4e67d661e40682Bd20E3541b"
+        addresses = [
+            "0x6e0c80c90ea6c15917308F820Eac91Ce2724B5b5",
+            "0xf39fd6e51aad88f6f4ce6ab8827279cfffb92266",
+            "70997970C51812dc3A010C7d01b50e0d17dc79C8",
+        ]
+        safes = list(derive_many(iter(addresses), safe_factory))
+        self.assertEqual("0x6d8c4e9aDF5748Af82Dabe2C6225207770d6B4fa", safes[0])
+        self.assertEqual([derive(a, safe_factory) for a in addresses], safes)
+
+        with self.assertRaises(ValueError):
+            list(derive_many(["0x1234"], safe_factory))
@@ -5,6 +5,7 @@ from eth_utils import to_checksum_address
 from py_builder_relayer_client.builder.proxy import (
     build_proxy_transaction_request,
     derive_proxy,
+    derive_proxy_many,
 )
 from py_builder_relayer_client.config import ContractConfig
 from py_builder_relayer_client.models import ProxyTransactionArgs, RelayerTxType
@@ -23,6 +24,15 @@ class TestProxy(TestCase):
         self.assertEqual(len(proxy_address), 42)
         self.assertEqual(proxy_address, to_checksum_address(proxy_address))
 
+    def test_derive_proxy_many(self):
+        proxy_factory = "0xaB45c5A4B0c941a2F231C04C3f49182e1A254052"
+        addresses = [
+            "0x6e0c80c90ea6c15917308F820Eac91Ce2724B5b5",
+            "0xf39fd6e51aad88f6f4ce6ab8827279cfffb92266",
+        ]
+        proxies = list(derive_proxy_many(addresses, proxy_factory))
+        self.assertEqual([derive_proxy(a, proxy_factory) for a in addresses], proxies)
+
     def test_build_proxy_transaction_request(self):
         """Test building a proxy transaction request"""
         signer = Signer(
@@ -1,10 +1,15 @@
+import random
 from unittest import TestCase
 
+from eth_utils import to_checksum_address
+from poly_eip712_structs import make_domain
+
 from py_builder_relayer_client.builder.safe import (
     create_struct_hash,
     create_safe_signature,
     split_and_pack_sig,
 )
+from py_builder_relayer_client.model.safe_tx import SafeTx
 from py_builder_relayer_client.models import OperationType
 from py_builder_relayer_client.signer import Signer
 
@@ -32,6 +37,47 @@ class TestSafe(TestCase):
         )
         self.assertEqual(expected_struct_hash, struct_hash)
 
+    def test_create_struct_hash_matches_safe_tx_model(self):
+        rng = random.Random(712)
+
+        def address():
+            return to_checksum_address("0x" + rng.randbytes(20).hex())
+
+        for _ in range(25):
+            fields = dict(
+                to=address(),
+                value=rng.getrandbits(rng.choice([1, 64, 256])),
+                data="0x" + rng.randbytes(rng.randint(0, 300)).hex(),
+                operation=rng.choice([0, 1]),
+                safeTxGas=rng.getrandbits(32),
+                baseGas=rng.getrandbits(32),
+                gasPrice=rng.getrandbits(64),
+                gasToken=address(),
+                refundReceiver=address(),
+                nonce=rng.getrandbits(16),
+            )
+            safe = address()
+            chain_id = rng.choice([137, 80002])
+
+            expected = SafeTx(**fields).generate_struct_hash(
+                make_domain(verifyingContract=safe, chainId=chain_id)
+            )
+            struct_hash = create_struct_hash(
+                chain_id=chain_id,
+                safe=safe,
+                to=fields["to"],
+                value=str(fields["value"]),
+                data=fields["data"],
+                operation=OperationType(fields["operation"]),
+                safe_tx_gas=str(fields["safeTxGas"]),
+                base_gas=str(fields["baseGas"]),
+                gas_price=str(fields["gasPrice"]),
+                gas_token=fields["gasToken"],
+                refund_receiver=fields["refundReceiver"],
+                nonce=str(fields["nonce"]),
+            )
+            self.assertEqual(expected, struct_hash)
+
     def test_create_safe_signature(self):
 
         struct_hash = (
@@ -0,0 +1,54 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from py_builder_relayer_client.cache import DeploymentCache
+
+SAFE = "0x6d8c4e9aDF5748Af82Dabe2C6225207770d6B4fa"
+
+
+class TestDeploymentCache(TestCase):
+
+    def test_deployed_is_permanent(self):
+        cache = DeploymentCache(negative_ttl=1)
+        self.assertIsNone(cache.get(SAFE))
+
+        cache.seed(SAFE, True)
+        self.assertTrue(cache.get(SAFE.lower()))
+
+        # A stale negative result never downgrades a deployed safe
+        cache.seed(SAFE, False)
+        self.assertTrue(cache.get(SAFE))
+
+    @patch("py_builder_relayer_client.cache.time.monotonic")
+    def test_negative_results_expire(self, monotonic):
+        monotonic.return_value = 100.0
+        cache = DeploymentCache(negative_ttl=5)
+        cache.seed(SAFE, False)
+        self.assertFalse(cache.get(SAFE))
+
+        monotonic.return_value = 106.0
+        self.assertIsNone(cache.get(SAFE))
+        self.assertEqual(0, len(cache))
+
+    def test_lru_bound(self):
+        cache = DeploymentCache(max_entries=2)
+        cache.seed("0x01")
+        cache.seed("0x02")
+        cache.get("0x01")
+        cache.seed("0x03")
+
+        self.assertTrue(cache.get("0x01"))
+        self.assertIsNone(cache.get("0x02"))
+        self.assertTrue(cache.get("0x03"))
+
+    def test_invalidate(self):
+        cache = DeploymentCache()
+        cache.seed("0x01")
+        cache.seed("0x02")
+
+        cache.invalidate("0x01")
+        self.assertIsNone(cache.get("0x01"))
+        self.assertTrue(cache.get("0x02"))
+
+        cache.invalidate()
+        self.assertEqual(0, len(cache))
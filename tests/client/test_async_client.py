@@ -0,0 +1,229 @@
+import asyncio
+import json
+import threading
+from unittest import TestCase, skipIf
+
+import responses
+
+from benchmarks.mock_relayer import MockRelayer, MockRelayerConfig
+from py_builder_relayer_client.async_client import AsyncRelayClient
+from py_builder_relayer_client.exceptions import (
+    RelayerApiException,
+    RelayerClientException,
+)
+from py_builder_relayer_client.http_helpers.async_helpers import (
+    AsyncHttpClient,
+    aiohttp,
+)
+from py_builder_relayer_client.http_helpers.helpers import get_default_client
+from py_builder_relayer_client.http_helpers.retry import (
+    NO_RETRY,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from tests.helpers import ADDRESS, PK, SECRET, URL, approve_txn, make_builder_config
+
+
+def make_client(
+    url: str = URL, secret: str = SECRET, http_client: AsyncHttpClient = None
+) -> AsyncRelayClient:
+    return AsyncRelayClient(
+        url,
+        137,
+        PK,
+        make_builder_config(secret),
+        http_client=(
+            http_client
+            if http_client is not None
+            else AsyncHttpClient(use_aiohttp=False)
+        ),
+    )
+
+
+class TestAsyncRelayClient(TestCase):
+
+    def test_signer_shares_the_transport_pool(self):
+        client = make_client()
+        self.addCleanup(asyncio.run, client.close())
+
+        self.assertIs(client.signer.http_client, client.http_client.blocking_client)
+
+    @responses.activate
+    def test_execute_and_wait(self):
+        client = make_client()
+        safe = client.get_expected_safe()
+        responses.get(f"{URL}/deployed?address={safe}", json={"deployed": True})
+        responses.get(f"{URL}/nonce?address={ADDRESS}&type=SAFE", json={"nonce": "5"})
+        responses.post(
+            f"{URL}/submit",
+            json={"transactionID": "abc", "transactionHash": "0x01"},
+        )
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_MINED"}],
+        )
+
+        async def run():
+            async with client:
+                resp = await client.execute([approve_txn()], "test")
+                return resp, await resp.wait()
+
+        resp, txn = asyncio.run(run())
+
+        self.assertEqual("abc", resp.transaction_id)
+        self.assertEqual("0x01", resp.transaction_hash)
+        self.assertEqual("STATE_MINED", txn["state"])
+        submitted = responses.calls[2].request
+        self.assertIn(b'"nonce":"5"', submitted.body)
+        self.assertIn("POLY_BUILDER_SIGNATURE", submitted.headers)
+
+    @responses.activate
+    def test_execute_requires_deployed_safe(self):
+        client = make_client()
+        safe = client.get_expected_safe()
+        responses.get(f"{URL}/deployed?address={safe}", json={"deployed": False})
+
+        async def run():
+            async with client:
+                await client.execute([approve_txn()])
+
+        with self.assertRaises(RelayerClientException):
+            asyncio.run(run())
+
+    @responses.activate
+    def test_execute_reads_concurrently(self):
+        client = make_client()
+        safe = client.get_expected_safe()
+        # Both reads must be in flight at the same time to get an answer
+        barrier = threading.Barrier(2, timeout=2)
+
+        def meet_at(body):
+            def callback(request):
+                barrier.wait()
+                return 200, {}, json.dumps(body)
+
+            return callback
+
+        responses.add_callback(
+            responses.GET,
+            f"{URL}/deployed?address={safe}",
+            callback=meet_at({"deployed": True}),
+        )
+        responses.add_callback(
+            responses.GET,
+            f"{URL}/nonce?address={ADDRESS}&type=SAFE",
+            callback=meet_at({"nonce": "7"}),
+        )
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        async def run():
+            async with client:
+                return await client.execute([approve_txn(), approve_txn()])
+
+        resp = asyncio.run(run())
+
+        self.assertEqual("abc", resp.transaction_id)
+        self.assertEqual("7", json.loads(responses.calls[2].request.body)["nonce"])
+
+
+class _NullErrorRelayer(MockRelayer):
+    def handle(self, method, path, query, headers, body):
+        if path == "/nonce":
+            return 500, None, {}
+        return super().handle(method, path, query, headers, body)
+
+
+@skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAiohttpTransport(TestCase):
+
+    def start(self, relayer: MockRelayer, **kwargs) -> AsyncRelayClient:
+        relayer.start()
+        self.addCleanup(relayer.stop)
+        return make_client(
+            relayer.url,
+            http_client=AsyncHttpClient(use_aiohttp=True, **kwargs),
+        )
+
+    def test_signer_uses_the_default_client(self):
+        client = make_client(http_client=AsyncHttpClient(use_aiohttp=True))
+        self.addCleanup(asyncio.run, client.close())
+
+        self.assertIsNone(client.http_client.blocking_client)
+        self.assertIs(client.signer.http_client, get_default_client())
+
+    def test_execute_and_wait(self):
+        relayer = MockRelayer(
+            MockRelayerConfig(
+                mined_after=0.05, confirmed_after=0.1, builder_secret=SECRET
+            )
+        )
+        client = self.start(relayer)
+
+        async def run():
+            async with client:
+                resp = await client.execute([approve_txn()], "it's approved")
+                return resp, await resp.wait(timeout=10)
+
+        resp, txn = asyncio.run(run())
+
+        self.assertEqual(txn["transactionID"], resp.transaction_id)
+        self.assertIn(txn["state"], ("STATE_MINED", "STATE_CONFIRMED"))
+        self.assertEqual(txn["metadata"], "it's approved")
+        self.assertEqual(relayer.counts()[("/submit", 200)], 1)
+
+    def test_retries_throttled_reads(self):
+        relayer = MockRelayer(
+            MockRelayerConfig(
+                throttle_rate=0.5,
+                retry_after=0.0,
+                fault_paths=frozenset(["/nonce"]),
+                seed=7,
+            )
+        )
+        client = self.start(
+            relayer,
+            retry_policy=RetryPolicy(max_attempts=20),
+            circuit_breaker=CircuitBreaker(failure_threshold=0),
+        )
+
+        async def run():
+            async with client:
+                return [await client.get_nonce(ADDRESS, "SAFE") for _ in range(5)]
+
+        nonces = asyncio.run(run())
+
+        self.assertEqual(nonces, [{"nonce": "0"}] * 5)
+        self.assertGreater(relayer.counts()[("/nonce", 429)], 0)
+
+    def test_error_responses(self):
+        relayer = MockRelayer(MockRelayerConfig(builder_secret=SECRET))
+        relayer.start()
+        self.addCleanup(relayer.stop)
+        client = make_client(
+            relayer.url,
+            secret="b3RoZXI=",
+            http_client=AsyncHttpClient(use_aiohttp=True, retry_policy=NO_RETRY),
+        )
+
+        async def run():
+            async with client:
+                await client.execute([approve_txn()])
+
+        with self.assertRaises(RelayerApiException) as ctx:
+            asyncio.run(run())
+        self.assertEqual(ctx.exception.status_code, 401)
+        self.assertEqual(
+            ctx.exception.error_msg, {"error": "invalid builder signature"}
+        )
+
+    def test_null_error_body(self):
+        client = self.start(_NullErrorRelayer(), retry_policy=NO_RETRY)
+
+        async def run():
+            async with client:
+                await client.get_nonce(ADDRESS, "SAFE")
+
+        with self.assertRaises(RelayerApiException) as ctx:
+            asyncio.run(run())
+        self.assertEqual(ctx.exception.status_code, 500)
+        self.assertEqual(ctx.exception.error_msg, "null")
@@ -0,0 +1,364 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+import responses
+from responses import matchers
+from py_builder_signing_sdk.signing.hmac import build_hmac_signature
+
+from py_builder_relayer_client.exceptions import (
+    RelayerApiException,
+    RelayerClientException,
+)
+from py_builder_relayer_client.http_helpers.helpers import HttpClient
+from py_builder_relayer_client.models import RelayerTxType
+from tests.helpers import ADDRESS, URL, approve_txn, make_client
+
+
+def meet_at(barrier, body):
+    """responses callback answering with body once the other request arrived too"""
+
+    def callback(request):
+        barrier.wait()
+        return 200, {}, json.dumps(body)
+
+    return callback
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def txn(i: int) -> dict:
+    return {
+        "transactionID": f"id-{i}",
+        "transactionHash": f"0x{i:064x}",
+        "from": ADDRESS,
+        "state": "STATE_MINED",
+        "createdAt": f"2025-10-28T12:00:{i:02d}.000Z",
+        "updatedAt": f"2025-10-28T12:01:{i:02d}.000Z",
+    }
+
+
+def submitted_nonces():
+    return [
+        json.loads(call.request.body)["nonce"]
+        for call in responses.calls
+        if call.request.url.endswith("/submit")
+    ]
+
+
+class TestRelayClient(TestCase):
+
+    def mock_relayer(self, client, nonce="5"):
+        safe = client.get_expected_safe()
+        self.deployed_call = responses.get(
+            f"{URL}/deployed?address={safe}", json={"deployed": True}
+        )
+        return responses.get(
+            f"{URL}/nonce?address={ADDRESS}&type=SAFE", json={"nonce": nonce}
+        )
+
+    def test_close_releases_only_an_owned_transport(self):
+        client = make_client()
+        with patch.object(client.http_client.session, "close") as close:
+            client.close()
+        close.assert_called_once_with()
+
+        http_client = HttpClient()
+        self.addCleanup(http_client.close)
+        client = make_client(http_client=http_client)
+        with patch.object(http_client.session, "close") as close:
+            client.close()
+        close.assert_not_called()
+
+    @responses.activate
+    def test_execute_reserves_nonces_locally(self):
+        client = make_client()
+        nonce_call = self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            resps = list(pool.map(lambda _: client.execute([approve_txn()]), range(4)))
+
+        self.assertEqual(["abc"] * 4, [r.transaction_id for r in resps])
+        self.assertEqual(1, nonce_call.call_count)
+        self.assertEqual(["5", "6", "7", "8"], sorted(submitted_nonces()))
+        self.assertEqual(8, client.nonce_manager.confirmed)
+        self.assertEqual(set(), client.nonce_manager.in_flight)
+
+    @responses.activate
+    def test_rejected_submit_resyncs_nonce(self):
+        client = make_client()
+        nonce_call = self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"error": "invalid nonce"}, status=400)
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        with self.assertRaises(RelayerApiException):
+            client.execute([approve_txn()])
+        client.execute([approve_txn()])
+
+        self.assertEqual(2, nonce_call.call_count)
+        self.assertEqual(["5", "5"], submitted_nonces())
+
+    @responses.activate
+    def test_execute_in_budgeted_chunks(self):
+        client = make_client()
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        resps = client.execute([approve_txn() for _ in range(5)], max_calls=2)
+
+        self.assertEqual(3, len(resps))
+        self.assertEqual(["5", "6", "7"], submitted_nonces())
+        self.assertEqual(set(), client.nonce_manager.in_flight)
+        client.relayer_tx_type = RelayerTxType.PROXY
+        with self.assertRaises(ValueError):
+            client.execute([approve_txn()], max_calls=2)
+
+    @responses.activate
+    def test_deployed_safe_is_cached(self):
+        client = make_client()
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        client.execute([approve_txn()])
+        client.execute([approve_txn()])
+
+        self.assertEqual(1, self.deployed_call.call_count)
+
+    @responses.activate
+    def test_deploy_invalidates_negative_result(self):
+        client = make_client()
+        safe = client.get_expected_safe()
+        deployed_call = responses.get(
+            f"{URL}/deployed?address={safe}", json={"deployed": False}
+        )
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        self.assertFalse(client.get_deployed(safe))
+        self.assertFalse(client.get_deployed(safe))
+        self.assertEqual(1, deployed_call.call_count)
+
+        client.deploy()
+        self.assertIsNone(client.deployment_cache.get(safe))
+
+    @responses.activate
+    def test_response_future(self):
+        client = make_client()
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_CONFIRMED"}],
+        )
+
+        resp = client.execute([approve_txn()])
+        txn = resp.future().result(timeout=5)
+
+        self.assertEqual("STATE_CONFIRMED", txn["state"])
+        client.waiter.close()
+
+    @responses.activate
+    def test_wait_learns_transition_timings(self):
+        client = make_client()
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_EXECUTED"}],
+        )
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_MINED"}],
+        )
+
+        txn = client.poll_until_state(
+            "abc",
+            ["STATE_MINED"],
+            "STATE_FAILED",
+            poll_frequency=10,
+            submitted_at=time.monotonic(),
+        )
+
+        self.assertEqual("STATE_MINED", txn["state"])
+        timings = client.get_transition_timings()
+        self.assertEqual(1, timings["STATE_EXECUTED"]["count"])
+        self.assertEqual(1, timings["STATE_MINED"]["count"])
+        self.assertLess(timings["STATE_EXECUTED"]["p50"], timings["STATE_MINED"]["p50"])
+
+    @responses.activate
+    def test_poll_until_state_deadline(self):
+        client = make_client()
+        responses.get(f"{URL}/transaction?id=abc", json=[])
+
+        started = time.monotonic()
+        txn = client.poll_until_state(
+            "abc", ["STATE_MINED"], "STATE_FAILED", timeout=0.3
+        )
+
+        self.assertIsNone(txn)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_poll_until_state_rejects_non_positive_frequency(self):
+        with self.assertRaises(ValueError):
+            make_client().poll_until_state(
+                "abc", ["STATE_MINED"], "STATE_FAILED", poll_frequency=0
+            )
+
+    @responses.activate
+    def test_submit_signs_the_bytes_sent(self):
+        client = make_client()
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        client.execute([approve_txn()], metadata="it's \u00e9")
+
+        request = responses.calls[-1].request
+        self.assertNotIn(b'", "', request.body)
+        self.assertEqual("it's \u00e9", json.loads(request.body)["metadata"])
+        self.assertEqual(
+            build_hmac_signature(
+                "c2VjcmV0",
+                request.headers["POLY_BUILDER_TIMESTAMP"],
+                "POST",
+                "/submit",
+                request.body.decode(),
+            ),
+            request.headers["POLY_BUILDER_SIGNATURE"],
+        )
+
+    @responses.activate
+    def test_execute_safe_reads_concurrently(self):
+        executor = CountingExecutor()
+        client = make_client(executor=executor)
+        safe = client.get_expected_safe()
+        # Both reads must be in flight at the same time to get an answer
+        barrier = threading.Barrier(2, timeout=2)
+        responses.add_callback(
+            responses.GET,
+            f"{URL}/deployed?address={safe}",
+            callback=meet_at(barrier, {"deployed": True}),
+        )
+        responses.add_callback(
+            responses.GET,
+            f"{URL}/nonce?address={ADDRESS}&type=SAFE",
+            callback=meet_at(barrier, {"nonce": "5"}),
+        )
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        client.execute([approve_txn(), approve_txn()])
+
+        self.assertEqual(["5"], submitted_nonces())
+        self.assertEqual(2, executor.submitted)
+
+        # Cached deployment status and reserved nonces skip the executor
+        client.execute([approve_txn()])
+        self.assertEqual(["5", "6"], submitted_nonces())
+        self.assertEqual(2, executor.submitted)
+        executor.shutdown()
+
+    @responses.activate
+    def test_execute_undeployed_safe_releases_nonce(self):
+        client = make_client()
+        safe = client.get_expected_safe()
+        responses.get(f"{URL}/deployed?address={safe}", json={"deployed": False})
+        responses.get(f"{URL}/nonce?address={ADDRESS}&type=SAFE", json={"nonce": "5"})
+
+        with self.assertRaises(RelayerClientException):
+            client.execute([approve_txn()])
+
+        self.assertEqual(set(), client.nonce_manager.in_flight)
+        self.assertEqual([], submitted_nonces())
+        client.close()
+
+    @responses.activate
+    def test_execute_proxy_reads_concurrently(self):
+        rpc_url = "https://rpc.test"
+        client = make_client(relayer_tx_type=RelayerTxType.PROXY, rpc_url=rpc_url)
+        barrier = threading.Barrier(2, timeout=2)
+        responses.add_callback(
+            responses.GET,
+            f"{URL}/relay-payload?address={ADDRESS}&type=PROXY",
+            callback=meet_at(barrier, {"address": ADDRESS, "nonce": "3"}),
+        )
+        responses.add_callback(
+            responses.POST,
+            rpc_url,
+            callback=meet_at(barrier, {"jsonrpc": "2.0", "id": 0, "result": "0x5208"}),
+        )
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+        client.execute([approve_txn()])
+
+        body = json.loads(responses.calls[2].request.body)
+        self.assertEqual("3", body["nonce"])
+        self.assertEqual("21000", body["signatureParams"]["gasLimit"])
+        client.close()
+
+    @responses.activate
+    def test_iter_transactions_streams(self):
+        txns = [txn(i) for i in range(3)]
+        responses.get(f"{URL}/transactions", json=txns)
+
+        records = list(make_client().iter_transactions())
+
+        self.assertEqual(["id-0", "id-1", "id-2"], [r.transaction_id for r in records])
+        self.assertEqual("STATE_MINED", records[0].state)
+        self.assertEqual(txns, make_client().get_transactions())
+
+    @responses.activate
+    def test_iter_transactions_pages(self):
+        def page(offset, body):
+            responses.get(
+                f"{URL}/transactions",
+                json=body,
+                match=[
+                    matchers.query_param_matcher({"limit": "2", "offset": str(offset)})
+                ],
+            )
+
+        page(0, [txn(9), txn(8)])
+        # id-8 was pushed to the second page by a transaction created meanwhile
+        page(2, [txn(8), txn(7)])
+        page(4, [txn(6)])
+
+        ids = [r.transaction_id for r in make_client().iter_transactions(page_size=2)]
+
+        self.assertEqual(["id-9", "id-8", "id-7", "id-6"], ids)
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_iter_transactions_ignored_pagination(self):
+        responses.get(f"{URL}/transactions", json=[txn(1), txn(2)])
+
+        ids = [r.transaction_id for r in make_client().iter_transactions(page_size=2)]
+
+        # The second page repeats the first one, the offset is not supported
+        self.assertEqual(["id-1", "id-2"], ids)
+        self.assertEqual(2, len(responses.calls))
+
+        responses.reset()
+        responses.get(f"{URL}/transactions", json=[txn(i) for i in range(5)])
+        records = list(make_client().iter_transactions(page_size=2))
+        self.assertEqual(5, len(records))
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_iter_transactions_max_pages(self):
+        def endless(request):
+            offset = int(request.params["offset"])
+            return 200, {}, json.dumps([txn(offset), txn(offset + 1)])
+
+        responses.add_callback(responses.GET, f"{URL}/transactions", callback=endless)
+
+        with self.assertRaises(RelayerClientException):
+            list(make_client().iter_transactions(page_size=2, max_pages=3))
+        self.assertEqual(3, len(responses.calls))
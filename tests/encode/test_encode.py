@@ -1,7 +1,47 @@
+import random
 from unittest import TestCase
 
+from eth_abi import encode
+from eth_abi.packed import encode_packed
+from eth_utils import to_bytes, to_hex
+
 from py_builder_relayer_client.models import SafeTransaction, OperationType
-from py_builder_relayer_client.encode.safe import create_safe_multisend_transaction
+from py_builder_relayer_client.encode.safe import (
+    create_safe_multisend_transaction,
+    create_safe_multisend_transactions,
+)
+
+SAFE_MULTISEND_ADDRESS = "0xA238CBeb142c10Ef7Ad8442C6D1f9E89e07e7761"
+
+
+def reference_multisend_data(txns):
+    """Encodes multiSend(bytes) calldata with eth_abi"""
+    packed = b"".join(
+        encode_packed(
+            ["uint8", "address", "uint256", "uint256", "bytes"],
+            [
+                tx.operation.value,
+                tx.to,
+                int(tx.value),
+                len(to_bytes(hexstr=tx.data)),
+                to_bytes(hexstr=tx.data),
+            ],
+        )
+        for tx in txns
+    )
+    return "0x8d80ff0a" + to_hex(encode(["bytes"], [packed]))[2:]
+
+
+def random_transactions(rng, count):
+    return [
+        SafeTransaction(
+            to=to_hex(rng.randbytes(20)),
+            operation=rng.choice([OperationType.Call, OperationType.DelegateCall]),
+            data=to_hex(rng.randbytes(rng.randrange(0, 200))),
+            value=str(rng.randrange(0, 2**64)),
+        )
+        for _ in range(count)
+    ]
 
 
 class TestMultisend(TestCase):
@@ -32,3 +72,78 @@ class TestMultisend(TestCase):
         self.assertEqual(expected_value, multisend_txn.value)
         self.assertEqual(expected_operation, multisend_txn.operation.value)
         self.assertEqual(expected_data, multisend_txn.data)
+
+    def test_create_safe_multisend_transaction_matches_eth_abi(self):
+        rng = random.Random(11)
+        for count in (1, 2, 7, 30):
+            txns = random_transactions(rng, count)
+            multisend_txn = create_safe_multisend_transaction(
+                txns, SAFE_MULTISEND_ADDRESS
+            )
+            self.assertEqual(reference_multisend_data(txns), multisend_txn.data)
+
+    def test_create_safe_multisend_transactions_without_budget(self):
+        txns = random_transactions(random.Random(1), 5)
+        chunks = create_safe_multisend_transactions(txns, SAFE_MULTISEND_ADDRESS)
+        self.assertEqual(1, len(chunks))
+        self.assertEqual(
+            create_safe_multisend_transaction(txns, SAFE_MULTISEND_ADDRESS), chunks[0]
+        )
+
+    def test_create_safe_multisend_transactions_max_calls(self):
+        txns = random_transactions(random.Random(2), 7)
+        chunks = create_safe_multisend_transactions(
+            txns, SAFE_MULTISEND_ADDRESS, max_calls=3
+        )
+        self.assertEqual(3, len(chunks))
+        self.assertEqual(reference_multisend_data(txns[0:3]), chunks[0].data)
+        self.assertEqual(reference_multisend_data(txns[3:6]), chunks[1].data)
+        # A chunk of a single transaction is sent without MultiSend
+        self.assertEqual(txns[6], chunks[2])
+
+    def test_create_safe_multisend_transactions_max_bytes(self):
+        txns = random_transactions(random.Random(3), 40)
+        max_bytes = 1024
+        chunks = create_safe_multisend_transactions(
+            txns, SAFE_MULTISEND_ADDRESS, max_bytes=max_bytes
+        )
+        self.assertGreater(len(chunks), 1)
+
+        # Every transaction is kept in order
+        rebuilt = []
+        for chunk in chunks:
+            self.assertLessEqual(len(to_bytes(hexstr=chunk.data)), max_bytes)
+            if chunk.to == SAFE_MULTISEND_ADDRESS:
+                start = len(rebuilt)
+                for size in range(1, len(txns) - start + 1):
+                    if (
+                        reference_multisend_data(txns[start : start + size])
+                        == chunk.data
+                    ):
+                        rebuilt.extend(txns[start : start + size])
+                        break
+                else:
+                    self.fail("chunk does not encode the next transactions")
+            else:
+                rebuilt.append(chunk)
+        self.assertEqual(txns, rebuilt)
+
+    def test_create_safe_multisend_transactions_max_calldata_gas(self):
+        txns = random_transactions(random.Random(4), 20)
+        max_calldata_gas = 10_000
+        chunks = create_safe_multisend_transactions(
+            txns, SAFE_MULTISEND_ADDRESS, max_calldata_gas=max_calldata_gas
+        )
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            data = to_bytes(hexstr=chunk.data)
+            zeros = data.count(0)
+            self.assertLessEqual(zeros * 4 + (len(data) - zeros) * 16, max_calldata_gas)
+
+    def test_create_safe_multisend_transactions_oversized_transaction(self):
+        txns = random_transactions(random.Random(5), 3)
+        txns[1].data = "0x" + "ab" * 2048
+        chunks = create_safe_multisend_transactions(
+            txns, SAFE_MULTISEND_ADDRESS, max_bytes=1024
+        )
+        self.assertIn(txns[1], chunks)
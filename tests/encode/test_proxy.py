@@ -1,9 +1,28 @@
+import random
 from unittest import TestCase
 
+from eth_abi import encode
+from eth_utils import keccak, to_bytes, to_checksum_address, to_hex
+
 from py_builder_relayer_client.encode.proxy import encode_proxy_transaction_data
 from py_builder_relayer_client.models import CallType, ProxyTransaction
 
 
+def reference_proxy_transaction_data(txns):
+    """Encodes proxy((uint8,address,uint256,bytes)[]) calldata with eth_abi"""
+    calls = [
+        (
+            int(txn.type_code.value),
+            to_checksum_address(txn.to),
+            int(txn.value),
+            to_bytes(hexstr=txn.data) if isinstance(txn.data, str) else bytes(txn.data),
+        )
+        for txn in txns
+    ]
+    selector = keccak(text="proxy((uint8,address,uint256,bytes)[])")[:4]
+    return to_hex(selector + encode(["(uint8,address,uint256,bytes)[]"], [calls]))
+
+
 class TestProxyEncode(TestCase):
 
     def test_encode_proxy_transaction_data_single(self):
@@ -42,3 +61,23 @@ class TestProxyEncode(TestCase):
         # Multiple transactions should be longer than single transaction
         single_result = encode_proxy_transaction_data([tx1])
         self.assertGreater(len(result), len(single_result))
+
+    def test_encode_proxy_transaction_data_matches_eth_abi(self):
+        rng = random.Random(12)
+        for count in (0, 1, 2, 9, 40):
+            txns = []
+            for _ in range(count):
+                data = rng.randbytes(rng.randrange(0, 150))
+                txns.append(
+                    ProxyTransaction(
+                        to=to_hex(rng.randbytes(20)),
+                        type_code=rng.choice(list(CallType)),
+                        # Call data given as 0x hex, bare hex or bytes
+                        data=rng.choice([to_hex(data), data.hex(), data]),
+                        value=str(rng.randrange(0, 2**128)),
+                    )
+                )
+            self.assertEqual(
+                reference_proxy_transaction_data(txns),
+                encode_proxy_transaction_data(txns),
+            )
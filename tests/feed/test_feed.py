@@ -0,0 +1,103 @@
+from unittest import TestCase
+
+from py_builder_relayer_client.feed import TransactionFeed
+from py_builder_relayer_client.models import RelayerTransactionRecord
+
+
+def record(transaction_id: str, updated_at: str, state: str = "STATE_NEW"):
+    return RelayerTransactionRecord(transaction_id, state=state, updated_at=updated_at)
+
+
+class FakeClient:
+    def __init__(self):
+        self.records = []
+        self.pages = 0
+
+    def iter_transactions(self, page_size=None):
+        records = list(self.records)
+        if page_size is None:
+            self.pages += 1
+            yield from records
+            return
+        for offset in range(0, len(records) + 1, page_size):
+            self.pages += 1
+            yield from records[offset : offset + page_size]
+
+
+class TestTransactionFeed(TestCase):
+
+    def test_yields_changes_once(self):
+        client = FakeClient()
+        feed = TransactionFeed(client)
+        client.records = [
+            record("a", "2025-10-28T12:00:00.000Z"),
+            record("b", "2025-10-28T12:00:01.000Z"),
+            record("c", "2025-10-28T12:00:01.000Z"),
+        ]
+
+        self.assertEqual(["a", "b", "c"], [r.transaction_id for r in feed.poll()])
+        self.assertEqual("2025-10-28T12:00:01.000Z", feed.since)
+        self.assertEqual([], list(feed.poll()))
+
+        # d shares the watermark time, a changed state
+        client.records.append(record("d", "2025-10-28T12:00:01.000Z"))
+        client.records[0] = record("a", "2025-10-28T12:00:05Z", "STATE_MINED")
+        changed = list(feed.poll())
+        self.assertEqual(["a", "d"], [r.transaction_id for r in changed])
+        self.assertEqual("STATE_MINED", changed[0].state)
+        self.assertEqual("2025-10-28T12:00:05Z", feed.since)
+
+    def test_interrupted_poll_is_repeated(self):
+        client = FakeClient()
+        client.records = [
+            record("a", "2025-10-28T12:00:02Z"),
+            record("b", "2025-10-28T12:00:01Z"),
+        ]
+        feed = TransactionFeed(client)
+
+        next(feed.poll())
+        self.assertIsNone(feed.since)
+        self.assertEqual(["a", "b"], [r.transaction_id for r in feed.poll()])
+
+    def test_resume(self):
+        client = FakeClient()
+        client.records = [
+            record("a", "2025-10-28T11:59:59Z"),
+            record("b", "2025-10-28T12:00:00.5+00:00"),
+            record("c", None),
+        ]
+
+        feed = TransactionFeed(client, since="2025-10-28T12:00:00Z")
+
+        # Records without an update time cannot be skipped
+        self.assertEqual(["b", "c"], [r.transaction_id for r in feed.poll()])
+        with self.assertRaises(ValueError):
+            TransactionFeed(client, since="yesterday")
+
+    def test_steady_state_poll_reads_one_page(self):
+        client = FakeClient()
+        client.records = [
+            record(str(i), "2025-10-28T12:%02d:00Z" % (59 - i)) for i in range(10)
+        ]
+        feed = TransactionFeed(client, page_size=3)
+        self.assertEqual(10, len(list(feed.poll())))
+
+        client.pages = 0
+        self.assertEqual([], list(feed.poll()))
+        self.assertEqual(1, client.pages)
+
+        # New transactions push the unchanged ones to the following pages
+        client.records[:0] = [
+            record("new1", "2025-10-28T13:00:01Z"),
+            record("new2", "2025-10-28T13:00:00Z"),
+            record("new3", "2025-10-28T13:00:00Z"),
+            record("new4", "2025-10-28T13:00:00Z"),
+        ]
+        client.pages = 0
+        self.assertEqual(
+            ["new1", "new2", "new3", "new4"],
+            [r.transaction_id for r in feed.poll()],
+        )
+        # Two pages with changes and the first one without
+        self.assertEqual(3, client.pages)
+        self.assertEqual("2025-10-28T13:00:01Z", feed.since)
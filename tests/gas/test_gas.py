@@ -0,0 +1,208 @@
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import responses
+
+from py_builder_relayer_client.builder.batch import (
+    BatchJob,
+    build_transaction_requests,
+)
+from py_builder_relayer_client.builder.proxy import (
+    DEFAULT_GAS_LIMIT,
+    get_gas_limit,
+    prefetch_gas_limits,
+)
+from py_builder_relayer_client.config import get_contract_config
+from py_builder_relayer_client.gas import GasEstimator
+from py_builder_relayer_client.http_helpers.helpers import HttpClient
+from py_builder_relayer_client.models import ProxyTransactionArgs
+from py_builder_relayer_client.signer import Signer
+
+RPC_URL = "https://rpc.test"
+PK = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+FROM = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+TO = "0xaB45c5A4B0c941a2F231C04C3f49182e1A254052"
+
+
+def rpc_callback(errors=()):
+    """Answers eth_estimateGas with 21000 + len(data), or an error for data in errors"""
+
+    def callback(request):
+        payload = json.loads(request.body)
+        batch = payload if isinstance(payload, list) else [payload]
+        results = []
+        for call in batch:
+            data = call["params"][0]["data"]
+            if data in errors:
+                results.append(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": call["id"],
+                        "error": {"code": 3, "message": "execution reverted"},
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": call["id"],
+                        "result": hex(21000 + len(data)),
+                    }
+                )
+        body = results if isinstance(payload, list) else results[0]
+        return 200, {}, json.dumps(body)
+
+    return callback
+
+
+def proxy_args(data, gas_limit=None):
+    return ProxyTransactionArgs(
+        from_address=FROM,
+        nonce="0",
+        gas_price="0",
+        data=data,
+        relay="0x1234567890123456789012345678901234567890",
+        gas_limit=gas_limit,
+    )
+
+
+class TestGasEstimator(TestCase):
+
+    def setUp(self):
+        self.estimator = GasEstimator(RPC_URL, http_client=HttpClient())
+
+    @responses.activate
+    def test_estimate_many_uses_one_batch(self):
+        responses.add_callback(responses.POST, RPC_URL, callback=rpc_callback())
+        calls = [(FROM, TO, "0x" + "01" * i) for i in range(5)]
+        calls.append(calls[0])
+
+        estimates = self.estimator.estimate_many(calls)
+
+        self.assertEqual([21002 + 2 * i for i in range(5)] + [21002], estimates)
+        self.assertEqual(1, len(responses.calls))
+        # Duplicate calls are only sent once
+        self.assertEqual(5, len(json.loads(responses.calls[0].request.body)))
+
+    @responses.activate
+    def test_estimate_is_cached(self):
+        responses.add_callback(responses.POST, RPC_URL, callback=rpc_callback())
+
+        self.assertEqual(21004, self.estimator.estimate(FROM, TO, "0x01"))
+        self.assertEqual(21004, self.estimator.estimate(FROM.lower(), TO, "0x01"))
+        self.assertEqual(1, len(responses.calls))
+        self.assertIsInstance(json.loads(responses.calls[0].request.body), dict)
+
+    @responses.activate
+    def test_cache_expires(self):
+        responses.add_callback(responses.POST, RPC_URL, callback=rpc_callback())
+
+        with patch("py_builder_relayer_client.gas.time.monotonic", return_value=0):
+            self.estimator.estimate(FROM, TO, "0x01")
+        with patch("py_builder_relayer_client.gas.time.monotonic", return_value=29):
+            self.estimator.estimate(FROM, TO, "0x01")
+            self.assertEqual(1, len(responses.calls))
+        with patch("py_builder_relayer_client.gas.time.monotonic", return_value=31):
+            self.estimator.estimate(FROM, TO, "0x01")
+            self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_batch_splits_and_errors(self):
+        responses.add_callback(
+            responses.POST, RPC_URL, callback=rpc_callback(errors=("0x02",))
+        )
+        self.estimator.batch_size = 2
+        calls = [(FROM, TO, "0x01"), (FROM, TO, "0x02"), (FROM, TO, "0x03")]
+
+        self.assertEqual(2, self.estimator.prefetch(calls))
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(2, len(self.estimator))
+        self.assertIsNone(self.estimator.get(FROM, TO, "0x02"))
+
+        with self.assertRaises(ValueError):
+            self.estimator.estimate_many(calls)
+
+    @responses.activate
+    def test_malformed_batch_elements(self):
+        responses.post(
+            RPC_URL, json=[None, "0x5208", {"jsonrpc": "2.0", "id": 1, "result": "0x1"}]
+        )
+        calls = [(FROM, TO, "0x01"), (FROM, TO, "0x02")]
+
+        self.assertEqual(1, self.estimator.prefetch(calls))
+        self.assertEqual(1, self.estimator.get(FROM, TO, "0x02"))
+        self.assertIsNone(self.estimator.get(FROM, TO, "0x01"))
+
+    @responses.activate
+    def test_malformed_response(self):
+        responses.post(RPC_URL, json="0x5208")
+
+        with self.assertRaises(ValueError):
+            self.estimator.estimate(FROM, TO, "0x01")
+        self.assertEqual(0, self.estimator.prefetch([(FROM, TO, "0x01")]))
+
+    @responses.activate
+    def test_transport_error(self):
+        responses.post(RPC_URL, status=502)
+
+        with self.assertRaises(ValueError):
+            self.estimator.estimate(FROM, TO, "0x01")
+        self.assertEqual(0, self.estimator.prefetch([(FROM, TO, "0x01")]))
+
+    def test_requires_rpc_url(self):
+        estimator = GasEstimator(None, http_client=HttpClient())
+        with self.assertRaises(ValueError):
+            estimator.estimate(FROM, TO, "0x01")
+        self.assertEqual(0, estimator.prefetch([(FROM, TO, "0x01")]))
+
+
+class TestProxyGasLimits(TestCase):
+
+    def setUp(self):
+        self.config = get_contract_config(137)
+        self.signer = Signer(PK, 137, rpc_url=RPC_URL, http_client=HttpClient())
+
+    @responses.activate
+    def test_prefetch_gas_limits(self):
+        responses.add_callback(responses.POST, RPC_URL, callback=rpc_callback())
+        args = [proxy_args("0x01"), proxy_args("0x0202"), proxy_args("0x03", "5000")]
+
+        self.assertEqual(2, prefetch_gas_limits(self.signer, args, self.config))
+        self.assertEqual(1, len(responses.calls))
+
+        to = self.config.proxy_factory
+        self.assertEqual("21004", get_gas_limit(self.signer, to, args[0]))
+        self.assertEqual("21006", get_gas_limit(self.signer, to, args[1]))
+        self.assertEqual("5000", get_gas_limit(self.signer, to, args[2]))
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_get_gas_limit_falls_back(self):
+        responses.add_callback(
+            responses.POST, RPC_URL, callback=rpc_callback(errors=("0x01",))
+        )
+
+        with self.assertLogs("py_builder_relayer_client.builder.proxy", "WARNING"):
+            gas_limit = get_gas_limit(
+                self.signer, self.config.proxy_factory, proxy_args("0x01")
+            )
+        self.assertEqual(str(DEFAULT_GAS_LIMIT), gas_limit)
+
+    @responses.activate
+    def test_batch_build_estimates_once(self):
+        responses.add_callback(responses.POST, RPC_URL, callback=rpc_callback())
+        jobs = [
+            BatchJob(signer=self.signer, args=proxy_args("0x" + "01" * i))
+            for i in range(1, 6)
+        ]
+
+        requests = build_transaction_requests(jobs, self.config, max_workers=2)
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(
+            [str(21002 + 2 * i) for i in range(1, 6)],
+            [r.signature_params.gas_limit for r in requests],
+        )
+        # The caller's args are left untouched
+        self.assertIsNone(jobs[0].args.gas_limit)
@@ -0,0 +1,32 @@
+from py_builder_signing_sdk.config import BuilderConfig, BuilderApiKeyCreds
+
+from py_builder_relayer_client.client import RelayClient
+from py_builder_relayer_client.models import OperationType, SafeTransaction
+
+URL = "https://relayer.test"
+SECRET = "c2VjcmV0"
+
+# Publicly known PK
+PK = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+ADDRESS = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+
+
+def make_builder_config(secret: str = SECRET) -> BuilderConfig:
+    return BuilderConfig(
+        local_builder_creds=BuilderApiKeyCreds(
+            key="key", secret=secret, passphrase="pass"
+        )
+    )
+
+
+def make_client(url: str = URL, secret: str = SECRET, **kwargs) -> RelayClient:
+    return RelayClient(url, 137, PK, make_builder_config(secret), **kwargs)
+
+
+def approve_txn() -> SafeTransaction:
+    return SafeTransaction(
+        to="0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+        operation=OperationType.Call,
+        data="0x095ea7b3",
+        value="0",
+    )
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+import responses
+
+from py_builder_relayer_client.exceptions import (
+    RelayerApiException,
+    RelayerClientException,
+)
+from py_builder_relayer_client.http_helpers.admission import AdmissionController
+from py_builder_relayer_client.http_helpers.helpers import HttpClient
+from py_builder_relayer_client.http_helpers.retry import NO_RETRY
+
+URL = "https://relayer.test"
+
+
+class TestAdmissionController(TestCase):
+
+    def test_aimd_limit(self):
+        controller = AdmissionController(initial_limit=4, latency_tolerance=None)
+
+        for _ in range(8):
+            controller.release(controller.acquire())
+        self.assertEqual(5, controller.limit)
+
+        # Overloads of requests started together only cut the limit once
+        permits = [controller.acquire() for _ in range(3)]
+        for permit in permits:
+            permit.overloaded()
+            controller.release(permit)
+        self.assertEqual(2, controller.limit)
+        self.assertEqual(0, controller.in_flight)
+
+        # Never below min_limit
+        for _ in range(5):
+            permit = controller.acquire()
+            permit.overloaded()
+            controller.release(permit)
+        self.assertEqual(1, controller.limit)
+
+    def test_latency_overload(self):
+        controller = AdmissionController(initial_limit=10, latency_tolerance=2.0)
+        for _ in range(30):
+            # Fixed latencies, a scheduling hiccup must not read as an overload
+            permit = controller.acquire()
+            permit.started -= 0.05
+            controller.release(permit)
+        limit = controller.limit
+
+        slow = controller.acquire()
+        slow.started -= 10
+        controller.release(slow)
+        self.assertEqual(limit // 2, controller.limit)
+
+    def test_queues_excess_requests(self):
+        controller = AdmissionController(initial_limit=2, latency_tolerance=None)
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def work():
+            with controller.admit():
+                with lock:
+                    active[0] += 1
+                    active[1] = max(active[1], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(active[1], 3)
+        self.assertEqual(0, controller.in_flight)
+
+    def test_rate(self):
+        controller = AdmissionController(rate=50, burst=1, max_limit=100)
+
+        started = time.monotonic()
+        for _ in range(5):
+            controller.release(controller.acquire())
+        self.assertGreaterEqual(time.monotonic() - started, 0.07)
+
+    def test_timeout(self):
+        controller = AdmissionController(initial_limit=1, max_limit=1)
+        permit = controller.acquire()
+
+        with self.assertRaises(RelayerClientException):
+            controller.acquire(timeout=0.02)
+
+        controller.release(permit)
+        controller.release(controller.acquire(timeout=0.02))
+
+    def test_acquire_async(self):
+        controller = AdmissionController(initial_limit=1, max_limit=1)
+
+        async def run():
+            first = await controller.acquire_async()
+            waiting = asyncio.ensure_future(controller.acquire_async())
+            await asyncio.sleep(0.02)
+            self.assertFalse(waiting.done())
+            controller.release(first)
+            controller.release(await waiting)
+
+        asyncio.run(run())
+        self.assertEqual(0, controller.in_flight)
+
+
+class TestHttpClientAdmission(TestCase):
+
+    @responses.activate
+    def test_overload_shrinks_limit(self):
+        responses.get(f"{URL}/nonce", status=429)
+        responses.get(f"{URL}/deployed", json={"deployed": True})
+        controller = AdmissionController(initial_limit=8, latency_tolerance=None)
+        client = HttpClient(retry_policy=NO_RETRY, admission=controller)
+
+        with self.assertRaises(RelayerApiException):
+            client.get(f"{URL}/nonce")
+        self.assertEqual(4, controller.limit)
+
+        client.get(f"{URL}/deployed")
+        self.assertEqual(0, controller.in_flight)
@@ -0,0 +1,95 @@
+import json
+from unittest import TestCase
+
+import requests
+import responses
+
+from py_builder_relayer_client.exceptions import RelayerApiException
+from py_builder_relayer_client.http_helpers.helpers import (
+    DEFAULT_TIMEOUT,
+    HttpClient,
+    encode_json,
+)
+
+URL = "https://relayer.test"
+
+
+class TestHttpClient(TestCase):
+
+    @responses.activate
+    def test_get_reuses_session_and_prepared_request(self):
+        responses.get(f"{URL}/nonce?address=0x1&type=SAFE", json={"nonce": "3"})
+        client = HttpClient()
+
+        first = client.get(f"{URL}/nonce?address=0x1&type=SAFE")
+        second = client.get(f"{URL}/nonce?address=0x1&type=SAFE")
+
+        self.assertEqual({"nonce": "3"}, first)
+        self.assertEqual(first, second)
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(1, len(client._prepared))
+
+    @responses.activate
+    def test_timeouts(self):
+        responses.get(f"{URL}/nonce", json={})
+        responses.get(f"{URL}/deployed", json={})
+        client = HttpClient(endpoint_timeouts={"/deployed": (1, 2)})
+
+        client.get(f"{URL}/nonce")
+        client.get(f"{URL}/deployed", timeout=client.timeout_for("/deployed"))
+
+        self.assertEqual(
+            DEFAULT_TIMEOUT, responses.calls[0].request.req_kwargs["timeout"]
+        )
+        self.assertEqual((1, 2), responses.calls[1].request.req_kwargs["timeout"])
+
+    @responses.activate
+    def test_post_sends_json(self):
+        responses.post(
+            f"{URL}/submit",
+            json={"transactionID": "1"},
+            match=[responses.matchers.json_params_matcher({"type": "SAFE"})],
+        )
+        client = HttpClient()
+
+        resp = client.post(f"{URL}/submit", headers={"a": "b"}, data={"type": "SAFE"})
+
+        self.assertEqual({"transactionID": "1"}, resp)
+        self.assertEqual(0, len(client._prepared))
+
+    @responses.activate
+    def test_post_sends_bytes_as_is(self):
+        responses.post(f"{URL}/submit", json={"transactionID": "1"})
+        body = encode_json({"type": "SAFE"})
+
+        HttpClient().post(f"{URL}/submit", headers={"a": "b"}, data=body)
+
+        request = responses.calls[0].request
+        self.assertEqual(body, request.body)
+        self.assertEqual("application/json", request.headers["Content-Type"])
+        self.assertEqual("b", request.headers["a"])
+
+    def test_encode_json(self):
+        body = {"type": "SAFE", "metadata": "it's \u00e9", "params": {"n": 1}}
+
+        encoded = encode_json(body)
+
+        self.assertEqual(
+            '{"type":"SAFE","metadata":"it\\u0027s \u00e9","params":{"n":1}}'.encode(),
+            encoded,
+        )
+        self.assertEqual(body, json.loads(encoded))
+
+    @responses.activate
+    def test_errors(self):
+        responses.get(f"{URL}/nonce", json={"error": "bad"}, status=400)
+        responses.get(f"{URL}/deployed", body=requests.ConnectionError())
+        client = HttpClient()
+
+        with self.assertRaises(RelayerApiException) as ctx:
+            client.get(f"{URL}/nonce")
+        self.assertEqual(400, ctx.exception.status_code)
+
+        with self.assertRaises(RelayerApiException) as ctx:
+            client.get(f"{URL}/deployed")
+        self.assertIsNone(ctx.exception.status_code)
@@ -0,0 +1,37 @@
+import json
+from unittest import TestCase
+
+from py_builder_relayer_client.exceptions import RelayerClientException
+from py_builder_relayer_client.http_helpers.json_stream import iter_json_array
+
+
+def chunked(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray(TestCase):
+
+    def test_any_chunking(self):
+        doc = [{"id": i, "s": 'é✓"], ' * i, "n": [1, 2.5, -3e2]} for i in range(20)]
+        doc += [12345, "x", None, True, []]
+        data = json.dumps(doc, ensure_ascii=False, indent=1).encode()
+
+        for size in (1, 2, 3, 7, 64, len(data)):
+            self.assertEqual(doc, list(iter_json_array(chunked(data, size))))
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual([12, 3], list(iter_json_array([b"[1", b"2,", b"3", b"]"])))
+
+    def test_empty(self):
+        self.assertEqual([], list(iter_json_array([b" [ ", b"] \n"])))
+
+    def test_yields_before_the_end(self):
+        items = iter_json_array(iter([b'[{"a": 1}, ', b'{"a": 2}']))
+        self.assertEqual({"a": 1}, next(items))
+        with self.assertRaises(RelayerClientException):
+            next(items)
+
+    def test_malformed(self):
+        for data in (b"", b"{}", b"[1,2", b"[1 2]", b"[1]x", b"[1,]"):
+            with self.assertRaises(RelayerClientException, msg=data):
+                list(iter_json_array([data]))
@@ -0,0 +1,201 @@
+import time
+from unittest import TestCase
+
+import requests
+import responses
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from py_builder_relayer_client.exceptions import (
+    RelayerApiException,
+    RelayerCircuitOpenException,
+)
+from py_builder_relayer_client.http_helpers.helpers import HttpClient
+from py_builder_relayer_client.http_helpers.retry import (
+    CLOSED,
+    HALF_OPEN,
+    NO_RETRY,
+    OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+)
+
+URL = "https://relayer.test"
+
+
+def connect_error() -> requests.ConnectionError:
+    """The error requests raises when the connection could not be established"""
+    return requests.ConnectionError(
+        MaxRetryError(None, URL, NewConnectionError(None, "Connection refused"))
+    )
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_classification(self):
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.retry_status("GET", 502))
+        self.assertTrue(policy.retry_status("GET", 429))
+        self.assertFalse(policy.retry_status("GET", 400))
+        self.assertFalse(policy.retry_status("GET", 500))
+        # The submit may have been processed
+        self.assertFalse(policy.retry_status("POST", 502))
+        self.assertTrue(policy.retry_status("POST", 429))
+
+        self.assertTrue(policy.retry_error("GET", connect_failed=False))
+        self.assertFalse(policy.retry_error("POST", connect_failed=False))
+        self.assertTrue(policy.retry_error("POST", connect_failed=True))
+
+    def test_delay(self):
+        policy = RetryPolicy(max_attempts=4, backoff=0.1, max_backoff=0.3)
+
+        for attempt, cap in ((1, 0.1), (2, 0.2), (3, 0.3)):
+            for _ in range(20):
+                self.assertLessEqual(policy.delay(attempt), cap)
+        self.assertIsNone(policy.delay(4))
+        self.assertEqual(0.2, policy.delay(1, retry_after=0.2))
+        self.assertIsNone(policy.delay(1, retry_after=5))
+
+
+class TestCircuitBreaker(TestCase):
+
+    def test_opens_and_recovers(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+        breaker.record_failure("/nonce")
+        self.assertEqual(CLOSED, breaker.state("/nonce"))
+        breaker.record_failure("/nonce")
+        self.assertEqual(OPEN, breaker.state("/nonce"))
+        with self.assertRaises(RelayerCircuitOpenException):
+            breaker.before_call("/nonce")
+        # Other endpoints are unaffected
+        breaker.before_call("/deployed")
+
+        time.sleep(0.06)
+        breaker.before_call("/nonce")
+        self.assertEqual(HALF_OPEN, breaker.state("/nonce"))
+        # A single trial at a time
+        with self.assertRaises(RelayerCircuitOpenException):
+            breaker.before_call("/nonce")
+
+        # A failed trial opens the circuit again
+        breaker.record_failure("/nonce")
+        self.assertEqual(OPEN, breaker.state("/nonce"))
+
+        time.sleep(0.06)
+        breaker.before_call("/nonce")
+        breaker.record_success("/nonce")
+        self.assertEqual(CLOSED, breaker.state("/nonce"))
+
+
+class Cancelled(BaseException):
+    pass
+
+
+class TestHttpClientRetries(TestCase):
+
+    def make_client(self, **kwargs) -> HttpClient:
+        kwargs.setdefault("retry_policy", RetryPolicy(backoff=0))
+        return HttpClient(**kwargs)
+
+    @responses.activate
+    def test_get_retries_transient_errors(self):
+        responses.get(f"{URL}/nonce", status=502)
+        responses.get(f"{URL}/nonce", body=requests.ReadTimeout())
+        responses.get(f"{URL}/nonce", json={"nonce": "1"})
+
+        self.assertEqual({"nonce": "1"}, self.make_client().get(f"{URL}/nonce"))
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_get_gives_up(self):
+        responses.get(f"{URL}/nonce", status=503)
+
+        with self.assertRaises(RelayerApiException) as ctx:
+            self.make_client().get(f"{URL}/nonce")
+        self.assertEqual(503, ctx.exception.status_code)
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_client_errors_are_not_retried(self):
+        responses.get(f"{URL}/nonce", status=400)
+
+        with self.assertRaises(RelayerApiException):
+            self.make_client().get(f"{URL}/nonce")
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_submit_retries_only_when_safe(self):
+        client = self.make_client()
+
+        responses.post(f"{URL}/submit", status=502)
+        with self.assertRaises(RelayerApiException):
+            client.post(f"{URL}/submit", data={"a": 1})
+        self.assertEqual(1, len(responses.calls))
+
+        responses.reset()
+        responses.post(f"{URL}/submit", body=requests.ReadTimeout())
+        with self.assertRaises(RelayerApiException):
+            client.post(f"{URL}/submit", data={"a": 1})
+        self.assertEqual(1, len(responses.calls))
+
+        responses.reset()
+        responses.post(f"{URL}/submit", body=connect_error())
+        responses.post(f"{URL}/submit", status=429, headers={"Retry-After": "0"})
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+        resp = client.post(f"{URL}/submit", data={"a": 1})
+        self.assertEqual({"transactionID": "abc"}, resp)
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(
+            responses.calls[0].request.body, responses.calls[2].request.body
+        )
+
+    @responses.activate
+    def test_retry_after_beyond_max_backoff(self):
+        responses.get(f"{URL}/nonce", status=429, headers={"Retry-After": "60"})
+
+        with self.assertRaises(RelayerApiException):
+            self.make_client().get(f"{URL}/nonce")
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_circuit_breaker_fails_fast(self):
+        responses.get(f"{URL}/nonce", status=502)
+        responses.get(f"{URL}/deployed", json={"deployed": True})
+        client = self.make_client(
+            retry_policy=NO_RETRY,
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        )
+
+        for _ in range(2):
+            with self.assertRaises(RelayerApiException):
+                client.get(f"{URL}/nonce?address=0x1")
+        with self.assertRaises(RelayerCircuitOpenException):
+            client.get(f"{URL}/nonce?address=0x2")
+        self.assertEqual(2, len(responses.calls))
+
+        self.assertEqual({"deployed": True}, client.get(f"{URL}/deployed"))
+
+    @responses.activate
+    def test_aborted_trial_releases_the_circuit(self):
+        responses.get(f"{URL}/nonce", status=502)
+        responses.get(f"{URL}/nonce", json={"nonce": "1"})
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        client = self.make_client(retry_policy=NO_RETRY, circuit_breaker=breaker)
+        with self.assertRaises(RelayerApiException):
+            client.get(f"{URL}/nonce")
+        time.sleep(0.02)
+
+        send = client.session.send
+
+        def cancelled(*args, **kwargs):
+            raise Cancelled()
+
+        client.session.send = cancelled
+        with self.assertRaises(Cancelled):
+            client.get(f"{URL}/nonce")
+        client.session.send = send
+
+        # The next call is the new trial
+        self.assertEqual({"nonce": "1"}, client.get(f"{URL}/nonce"))
+        self.assertEqual(CLOSED, breaker.state("/nonce"))
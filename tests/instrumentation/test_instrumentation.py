@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import responses
+
+from py_builder_relayer_client.instrumentation import (
+    NOOP_SPAN,
+    Instrumentation,
+    SpanCollector,
+    Tracer,
+    propagate,
+    span,
+)
+from tests.helpers import ADDRESS, URL, approve_txn, make_client
+
+
+def reserve_nonce():
+    with span("nonce"):
+        pass
+
+
+class FailingHook(Instrumentation):
+    def on_span(self, span):
+        raise RuntimeError("boom")
+
+
+class TestTracer(TestCase):
+
+    def test_noop_without_hook(self):
+        self.assertIs(NOOP_SPAN, Tracer().span("execute", batch_size=1))
+        self.assertIs(NOOP_SPAN, span("encode"))
+        with Tracer().span("execute"):
+            self.assertIs(NOOP_SPAN, span("encode"))
+
+        fn = len
+        self.assertIs(fn, propagate(fn))
+
+    def test_nesting(self):
+        collector = SpanCollector()
+        tracer = Tracer(collector)
+
+        with self.assertRaises(ValueError):
+            with tracer.span("execute", batch_size=2) as root:
+                with span("encode") as child:
+                    child.set_attribute("bytes", 10)
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    executor.submit(propagate(reserve_nonce)).result()
+                raise ValueError()
+
+        names = [s.name for s in collector.spans]
+        self.assertEqual(["encode", "nonce", "execute"], names)
+        encode, nonce, execute = collector.spans
+        self.assertIs(root, execute)
+        self.assertIs(execute, encode.parent)
+        self.assertIs(execute, nonce.parent)
+        self.assertEqual({"bytes": 10}, encode.attributes)
+        self.assertEqual("ValueError", execute.error)
+        self.assertIsNone(encode.error)
+        self.assertGreaterEqual(execute.duration, encode.duration)
+        self.assertIs(NOOP_SPAN, span("after"))
+
+    def test_hook_errors_are_contained(self):
+        with Tracer(FailingHook()).span("execute"):
+            pass
+
+
+class TestClientSpans(TestCase):
+
+    @responses.activate
+    def test_execute_and_wait(self):
+        collector = SpanCollector()
+        client = make_client(instrumentation=collector)
+        safe = client.get_expected_safe()
+        responses.get(f"{URL}/deployed?address={safe}", json={"deployed": True})
+        responses.get(f"{URL}/nonce?address={ADDRESS}&type=SAFE", json={"nonce": "5"})
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_MINED"}],
+        )
+
+        resp = client.execute([approve_txn(), approve_txn()])
+        resp.wait()
+
+        by_name = {s.name: s for s in collector.spans}
+        execute = by_name["execute"]
+        self.assertEqual({"tx_type": "SAFE", "batch_size": 2}, execute.attributes)
+        for name in (
+            "derive_address",
+            "preflight.deployed",
+            "preflight.nonce",
+            "encode",
+            "hash_struct",
+            "sign",
+            "headers",
+            "http.submit",
+        ):
+            self.assertIs(execute, _root(by_name[name]), name)
+        self.assertEqual(200, by_name["http.submit"].attributes["status_code"])
+
+        self.assertEqual({"state": "STATE_MINED"}, by_name["poll"].attributes)
+        self.assertIs(by_name["wait"], by_name["poll"].parent)
+        self.assertEqual(1, by_name["wait"].attributes["polls"])
+        client.close()
+
+
+def _root(s):
+    while s.parent is not None:
+        s = s.parent
+    return s
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+import responses
+
+from py_builder_relayer_client.exceptions import RelayerApiException
+from py_builder_relayer_client.journal import (
+    STATE_REJECTED,
+    STATE_SUBMITTING,
+    TransactionJournal,
+)
+from tests.helpers import ADDRESS, URL, approve_txn, make_client
+
+
+def request(nonce: str) -> dict:
+    return {"from": ADDRESS, "nonce": nonce, "type": "SAFE", "data": "0x"}
+
+
+class TestTransactionJournal(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "journal.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_lifecycle(self):
+        journal = TransactionJournal(self.path)
+        mined = journal.record_request(request("1"))
+        journal.record_submitted(mined, "a", "0xa")
+        pending = journal.record_request(request("2"))
+        journal.record_submitted(pending, "b")
+        rejected = journal.record_request(request("3"))
+        journal.record_rejected(rejected)
+        journal.record_request(request("4"))
+        invalid = journal.record_request(request("5"))
+        journal.record_submitted(invalid, "c")
+
+        self.assertTrue(journal.record_state("a", "STATE_MINED"))
+        self.assertFalse(journal.record_state("a", "STATE_MINED"))
+        self.assertTrue(journal.record_state("b", "STATE_EXECUTED", "0xb"))
+        self.assertFalse(journal.record_state("unknown", "STATE_MINED"))
+        self.assertTrue(journal.record_state("c", "STATE_INVALID"))
+        journal.close()
+
+        # Everything survives a restart
+        journal = TransactionJournal(self.path)
+        self.assertEqual(["b"], [e.transaction_id for e in journal.pending()])
+        self.assertEqual("0xb", journal.get("b").transaction_hash)
+        unsubmitted = journal.unsubmitted()
+        self.assertEqual(["4"], [e.nonce for e in unsubmitted])
+        self.assertEqual(request("4"), unsubmitted[0].request)
+        self.assertEqual(
+            [STATE_SUBMITTING, "STATE_NEW", "STATE_MINED"],
+            [state for state, _ in journal.history("a")],
+        )
+        journal.close()
+
+
+class TestClientJournal(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "journal.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def mock_relayer(self, client):
+        safe = client.get_expected_safe()
+        responses.get(f"{URL}/deployed?address={safe}", json={"deployed": True})
+        responses.get(f"{URL}/nonce?address={ADDRESS}&type=SAFE", json={"nonce": "5"})
+
+    @responses.activate
+    def test_records_submissions(self):
+        client = make_client(journal=self.path)
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "a"})
+        responses.post(f"{URL}/submit", status=400, json={"error": "bad"})
+        responses.post(f"{URL}/submit", body=requests.ReadTimeout())
+        responses.post(f"{URL}/submit", status=503, json={"error": "unavailable"})
+
+        client.execute([approve_txn()])
+        for _ in range(3):
+            with self.assertRaises(RelayerApiException):
+                client.execute([approve_txn()])
+
+        self.assertEqual("5", client.journal.get("a").nonce)
+        self.assertEqual(["a"], [e.transaction_id for e in client.journal.pending()])
+        # The timed out and 503 submits may have been processed, the 400 was not
+        self.assertEqual(2, len(client.journal.unsubmitted()))
+        states = client.journal._conn.execute("SELECT state FROM entries").fetchall()
+        self.assertEqual(1, states.count((STATE_REJECTED,)))
+        client.close()
+
+    @responses.activate
+    def test_resume_after_restart(self):
+        client = make_client(journal=self.path)
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "a"})
+        client.execute([approve_txn()])
+        client.close()
+
+        responses.get(
+            f"{URL}/transaction?id=a",
+            json=[{"transactionID": "a", "state": "STATE_MINED"}],
+        )
+        client = make_client(journal=self.path, resume_pending=False)
+        futures = client.resume()
+
+        self.assertEqual(["a"], list(futures))
+        self.assertEqual("STATE_MINED", futures["a"].result(timeout=2)["state"])
+        self.assertEqual([], client.journal.pending())
+        self.assertEqual([], list(client.resume()))
+        client.close()
+
+    @responses.activate
+    def test_resumes_pending_on_construction(self):
+        client = make_client(journal=self.path)
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "a"})
+        client.execute([approve_txn()])
+        client.close()
+
+        responses.get(
+            f"{URL}/transaction?id=a",
+            json=[{"transactionID": "a", "state": "STATE_NEW"}],
+        )
+        client = make_client(journal=self.path)
+
+        self.assertEqual(1, client.waiter.pending)
+        client.close()
+
+    @responses.activate
+    def test_journal_failure_after_submit(self):
+        client = make_client(journal=self.path)
+        self.mock_relayer(client)
+        responses.post(f"{URL}/submit", json={"transactionID": "a"})
+
+        with patch.object(
+            client.journal,
+            "record_submitted",
+            side_effect=sqlite3.IntegrityError("UNIQUE constraint failed"),
+        ):
+            with self.assertLogs("RelayClient", "ERROR"):
+                resp = client.execute([approve_txn()])
+
+        self.assertEqual("a", resp.transaction_id)
+        client.close()
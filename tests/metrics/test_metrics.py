@@ -0,0 +1,132 @@
+import threading
+from unittest import TestCase
+
+import responses
+
+from py_builder_relayer_client.exceptions import RelayerApiException
+from py_builder_relayer_client.http_helpers.helpers import HttpClient
+from py_builder_relayer_client.http_helpers.retry import RetryPolicy
+from py_builder_relayer_client.metrics import Metric, MetricsRegistry
+from tests.helpers import ADDRESS, URL, approve_txn, make_client
+
+
+class TestMetricsRegistry(TestCase):
+
+    def test_render_prometheus(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("submits_total", "Submits", ("type",))
+        histogram = registry.histogram(
+            "latency_seconds", "Latency", ("endpoint",), buckets=(0.1, 1)
+        )
+
+        counter.inc("SAFE")
+        counter.inc("SAFE", amount=2)
+        counter.inc('a"b')
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, "/nonce")
+
+        self.assertEqual(
+            "# HELP latency_seconds Latency\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{endpoint="/nonce",le="0.1"} 2\n'
+            'latency_seconds_bucket{endpoint="/nonce",le="1"} 3\n'
+            'latency_seconds_bucket{endpoint="/nonce",le="+Inf"} 4\n'
+            'latency_seconds_sum{endpoint="/nonce"} 3.65\n'
+            'latency_seconds_count{endpoint="/nonce"} 4\n'
+            "# HELP submits_total Submits\n"
+            "# TYPE submits_total counter\n"
+            'submits_total{type="SAFE"} 3\n'
+            'submits_total{type="a\\"b"} 1\n',
+            registry.render_prometheus(),
+        )
+
+    def test_registration(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("c", "C", ("a",))
+
+        self.assertIs(counter, registry.counter("c", "C", ("a",)))
+        with self.assertRaises(ValueError):
+            registry.histogram("c", "C", ("a",))
+        with self.assertRaises(ValueError):
+            counter.inc("x", "y")
+        with self.assertRaises(TypeError):
+            Metric("m", "M")
+
+    def test_concurrent_updates(self):
+        histogram = MetricsRegistry().histogram("h", "H", buckets=(1,))
+
+        def observe():
+            for _ in range(10_000):
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(40_000, histogram.count())
+
+
+class TestClientMetrics(TestCase):
+
+    @responses.activate
+    def test_http_metrics(self):
+        registry = MetricsRegistry()
+        client = HttpClient(retry_policy=RetryPolicy(backoff=0), metrics=registry)
+        responses.get(f"{URL}/nonce", status=503)
+        responses.get(f"{URL}/nonce", json={"nonce": "1"})
+        responses.get(f"{URL}/deployed", status=400)
+
+        client.get(f"{URL}/nonce")
+        with self.assertRaises(RelayerApiException):
+            client.get(f"{URL}/deployed")
+
+        self.assertEqual(
+            2,
+            registry.get("relayer_http_request_duration_seconds").count(
+                "/nonce", "GET"
+            ),
+        )
+        errors = registry.get("relayer_http_errors_total")
+        self.assertEqual(1, errors.value("/nonce", 503))
+        self.assertEqual(1, errors.value("/deployed", 400))
+        self.assertEqual(1, registry.get("relayer_http_retries_total").value("/nonce"))
+
+    @responses.activate
+    def test_execute_and_wait(self):
+        registry = MetricsRegistry()
+        client = make_client(metrics=registry)
+        safe = client.get_expected_safe()
+        responses.get(f"{URL}/deployed?address={safe}", json={"deployed": True})
+        responses.get(f"{URL}/nonce?address={ADDRESS}&type=SAFE", json={"nonce": "5"})
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_NEW"}],
+        )
+        responses.get(
+            f"{URL}/transaction?id=abc",
+            json=[{"transactionID": "abc", "state": "STATE_MINED"}],
+        )
+
+        resp = client.execute([approve_txn()])
+        client.poll_until_state(
+            "abc",
+            ["STATE_MINED"],
+            "STATE_FAILED",
+            poll_frequency=1,
+            submitted_at=resp.submitted_at,
+        )
+
+        self.assertEqual(1, registry.get("relayer_submits_total").value("SAFE"))
+        poll_rounds = registry.get("relayer_poll_rounds")
+        self.assertEqual(1, poll_rounds.count())
+        self.assertEqual(2, poll_rounds.labels().snapshot()[1])
+        self.assertEqual(
+            1, registry.get("relayer_time_to_confirmation_seconds").count()
+        )
+        self.assertIn(
+            'relayer_http_request_duration_seconds_count{endpoint="/submit",method="POST"} 1',
+            registry.render_prometheus(),
+        )
+        client.close()
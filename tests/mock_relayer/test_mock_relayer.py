@@ -0,0 +1,167 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from benchmarks.load import build_operation, run_load
+from benchmarks.mock_relayer import MockRelayer, MockRelayerConfig
+from py_builder_relayer_client.exceptions import RelayerApiException
+from py_builder_relayer_client.http_helpers.helpers import HttpClient
+from py_builder_relayer_client.http_helpers.retry import NO_RETRY
+from tests.helpers import ADDRESS, SECRET, approve_txn, make_client
+
+HEADERS = {
+    "POLY_BUILDER_API_KEY": "key",
+    "POLY_BUILDER_PASSPHRASE": "pass",
+    "POLY_BUILDER_SIGNATURE": "sig",
+    "POLY_BUILDER_TIMESTAMP": "1",
+}
+
+
+def submit_body(nonce: str = "0") -> bytes:
+    return json.dumps(
+        {"type": "SAFE", "from": ADDRESS, "signature": "0x01", "nonce": nonce}
+    ).encode()
+
+
+class TestMockRelayer(TestCase):
+
+    def test_state_transitions(self):
+        relayer = MockRelayer(MockRelayerConfig(mined_after=0.0, confirmed_after=60))
+        self.addCleanup(relayer.stop)
+        _, resp, _ = relayer.handle("POST", "/submit", {}, HEADERS, submit_body())
+        self.assertEqual(resp["state"], "STATE_NEW")
+
+        _, txns, _ = relayer.handle(
+            "GET", "/transaction", {"id": resp["transactionID"]}, {}, b""
+        )
+        self.assertEqual(txns[0]["state"], "STATE_MINED")
+        self.assertEqual(txns[0]["transactionHash"], resp["transactionHash"])
+
+        relayer.config.confirmed_after = 0.0
+        _, txns, _ = relayer.handle(
+            "GET", "/transaction", {"id": resp["transactionID"]}, {}, b""
+        )
+        self.assertEqual(txns[0]["state"], "STATE_CONFIRMED")
+        self.assertGreaterEqual(txns[0]["updatedAt"], txns[0]["createdAt"])
+
+    def test_failed_transactions_are_not_confirmed(self):
+        relayer = MockRelayer(
+            MockRelayerConfig(mined_after=0.0, confirmed_after=0.0, fail_rate=1.0)
+        )
+        self.addCleanup(relayer.stop)
+        relayer.handle("POST", "/submit", {}, HEADERS, submit_body())
+        self.assertEqual(relayer.transactions()[0]["state"], "STATE_FAILED")
+
+    def test_submits_advance_the_nonce(self):
+        relayer = MockRelayer()
+        self.addCleanup(relayer.stop)
+        query = {"address": ADDRESS, "type": "SAFE"}
+        relayer.handle("POST", "/submit", {}, HEADERS, submit_body("4"))
+        _, payload, _ = relayer.handle("GET", "/nonce", query, {}, b"")
+        self.assertEqual(payload, {"nonce": "5"})
+        relayer.handle("POST", "/submit", {}, HEADERS, submit_body("2"))
+        _, payload, _ = relayer.handle("GET", "/nonce", query, {}, b"")
+        self.assertEqual(payload, {"nonce": "5"})
+
+    def test_injected_faults(self):
+        relayer = MockRelayer(MockRelayerConfig(throttle_rate=1.0, retry_after=0.5))
+        self.addCleanup(relayer.stop)
+        status, _, headers = relayer.handle("GET", "/nonce", {}, {}, b"")
+        self.assertEqual(status, 429)
+        self.assertEqual(headers, {"Retry-After": "0.5"})
+
+        relayer.config = MockRelayerConfig(
+            error_rate=1.0, fault_paths=frozenset(["/submit"])
+        )
+        status, _, _ = relayer.handle("GET", "/nonce", {}, {}, b"")
+        self.assertEqual(status, 200)
+        status, _, _ = relayer.handle("POST", "/submit", {}, HEADERS, submit_body())
+        self.assertEqual(status, 500)
+
+    def test_rejects_unsigned_submits(self):
+        relayer = MockRelayer()
+        self.addCleanup(relayer.stop)
+        status, _, _ = relayer.handle("POST", "/submit", {}, {}, submit_body())
+        self.assertEqual(status, 401)
+        status, _, _ = relayer.handle("POST", "/submit", {}, HEADERS, b"{")
+        self.assertEqual(status, 400)
+
+    def test_execute_and_wait(self):
+        relayer = MockRelayer(
+            MockRelayerConfig(
+                mined_after=0.05, confirmed_after=0.1, builder_secret=SECRET
+            )
+        ).start()
+        self.addCleanup(relayer.stop)
+        client = make_client(relayer.url)
+        self.addCleanup(client.close)
+
+        resp = client.execute([approve_txn()], "approve")
+        txn = resp.future().result(timeout=10)
+
+        self.assertEqual(txn["transactionID"], resp.transaction_id)
+        self.assertIn(txn["state"], ("STATE_MINED", "STATE_CONFIRMED"))
+        self.assertEqual(txn["metadata"], "approve")
+        self.assertEqual(relayer.counts()[("/submit", 200)], 1)
+
+    def test_quoted_metadata_passes_signature_checks(self):
+        relayer = MockRelayer(MockRelayerConfig(builder_secret=SECRET)).start()
+        self.addCleanup(relayer.stop)
+        client = make_client(relayer.url)
+        self.addCleanup(client.close)
+
+        client.execute([approve_txn()], metadata="it's \u00e9")
+
+        self.assertEqual(relayer.transactions()[0]["metadata"], "it's \u00e9")
+
+    def test_verifies_the_builder_signature(self):
+        relayer = MockRelayer(MockRelayerConfig(builder_secret=SECRET)).start()
+        self.addCleanup(relayer.stop)
+        client = make_client(
+            relayer.url,
+            secret="b3RoZXI=",
+            http_client=HttpClient(retry_policy=NO_RETRY),
+        )
+        self.addCleanup(client.close)
+
+        with self.assertRaises(RelayerApiException) as ctx:
+            client.execute([approve_txn()])
+        self.assertEqual(ctx.exception.status_code, 401)
+
+    def test_concurrent_executes(self):
+        relayer = MockRelayer(MockRelayerConfig(builder_secret=SECRET)).start()
+        self.addCleanup(relayer.stop)
+        client = make_client(relayer.url)
+        self.addCleanup(client.close)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(
+                executor.map(lambda _: client.execute([approve_txn()]), range(20))
+            )
+
+        self.assertEqual(len({r.transaction_id for r in responses}), 20)
+        nonces = sorted(int(t["nonce"]) for t in relayer.transactions())
+        self.assertEqual(nonces, list(range(20)))
+        records = list(client.iter_transactions(page_size=7))
+        self.assertEqual(
+            [r.transaction_id for r in records],
+            [t["transactionID"] for t in relayer.transactions()],
+        )
+
+    def test_async_load_modes(self):
+        relayer = MockRelayer(
+            MockRelayerConfig(
+                mined_after=0.05, confirmed_after=0.1, builder_secret=SECRET
+            )
+        ).start()
+        self.addCleanup(relayer.stop)
+
+        for mode in ("async", "async-confirm"):
+            with self.subTest(mode=mode):
+                operation, close = build_operation(mode, relayer.url, 2, 10)
+                try:
+                    report = run_load(operation, rate=50, duration=0.2, concurrency=4)
+                finally:
+                    close()
+                self.assertEqual(report["failed"], 0, report["errors"])
+                self.assertEqual(report["completed"], report["offered"])
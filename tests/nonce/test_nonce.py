@@ -0,0 +1,85 @@
+import threading
+from unittest import TestCase
+
+from py_builder_relayer_client.nonce import NonceManager
+
+
+class TestNonceManager(TestCase):
+
+    def test_requires_sync(self):
+        manager = NonceManager()
+        self.assertIsNone(manager.reserve())
+
+        manager.sync("7")
+        self.assertEqual(7, manager.reserve())
+        self.assertEqual(8, manager.reserve())
+        self.assertEqual({7, 8}, manager.in_flight)
+
+    def test_confirm_and_release(self):
+        manager = NonceManager()
+        manager.sync(3)
+        first = manager.reserve()
+        second = manager.reserve()
+
+        manager.confirm(first)
+        self.assertEqual(3, manager.confirmed)
+        self.assertEqual({4}, manager.in_flight)
+
+        # A rejected nonce invalidates the local state
+        manager.release(second)
+        self.assertEqual(set(), manager.in_flight)
+        self.assertIsNone(manager.reserve())
+
+        manager.sync(4)
+        self.assertEqual(4, manager.reserve())
+
+    def test_resync_never_moves_backwards(self):
+        manager = NonceManager(max_age=0)
+        self.assertEqual(10, manager.sync(10, reserve=True))
+
+        # Stale, a lagging relayer nonce must not hand out 10 again
+        self.assertIsNone(manager.reserve())
+        self.assertEqual(11, manager.sync(10, reserve=True))
+
+        manager.invalidate()
+        self.assertEqual(2, manager.sync(2, reserve=True))
+
+    def test_resync_skips_nonces_still_in_flight(self):
+        manager = NonceManager()
+        manager.sync(5)
+        self.assertEqual(5, manager.reserve())
+        self.assertEqual(6, manager.reserve())
+
+        manager.release(5)
+        self.assertEqual(5, manager.reserve_or_sync(lambda: 5))
+        self.assertEqual(7, manager.reserve())
+        self.assertEqual({5, 6, 7}, manager.in_flight)
+
+    def test_reserve_or_sync_fetches_once(self):
+        manager = NonceManager()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return "4"
+
+        self.assertEqual(4, manager.reserve_or_sync(fetch))
+        self.assertEqual(5, manager.reserve_or_sync(fetch))
+        self.assertEqual(1, len(fetches))
+
+    def test_concurrent_reservations_are_unique(self):
+        manager = NonceManager()
+        manager.sync(0)
+        reserved = []
+
+        def reserve():
+            for _ in range(100):
+                reserved.append(manager.reserve())
+
+        threads = [threading.Thread(target=reserve) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(list(range(800)), sorted(reserved))
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from py_builder_relayer_client.polling import PollSchedule, TransitionTimings
+
+MINED = "STATE_MINED"
+CONFIRMED = "STATE_CONFIRMED"
+
+
+class TestTransitionTimings(TestCase):
+
+    def test_percentiles_and_snapshot(self):
+        timings = TransitionTimings(max_samples=10)
+        self.assertIsNone(timings.percentile(MINED, 0.5))
+
+        for elapsed in range(20):
+            timings.record(MINED, float(elapsed))
+
+        # Only the 10 most recent samples are kept
+        self.assertEqual(10.0, timings.percentile(MINED, 0))
+        self.assertEqual(19.0, timings.percentile(MINED, 1))
+        snapshot = timings.snapshot()
+        self.assertEqual(10, snapshot[MINED]["count"])
+        self.assertEqual(14.0, snapshot[MINED]["p50"])
+
+
+class TestPollSchedule(TestCase):
+
+    def test_backoff_without_samples(self):
+        schedule = PollSchedule(
+            None, [MINED], initial_delay=1, multiplier=2, max_delay=5, jitter=0
+        )
+        delays = [schedule.next_delay(0) for _ in range(5)]
+        self.assertEqual([1, 2, 4, 5, 5], delays)
+
+    def test_polls_around_learned_window(self):
+        timings = TransitionTimings()
+        for elapsed in (8.0, 9.0, 10.0, 11.0, 12.0):
+            timings.record(MINED, elapsed)
+        schedule = PollSchedule(
+            timings, [MINED, CONFIRMED], min_delay=0.5, initial_delay=1, jitter=0
+        )
+
+        # Sleep straight to the start of the window, poll a few times inside it
+        self.assertEqual(7.5, schedule.next_delay(0.5))
+        self.assertEqual(1.0, schedule.next_delay(9.0))
+        # Then back off
+        self.assertEqual(1, schedule.next_delay(13.0))
+        self.assertEqual(1.6, schedule.next_delay(14.0))
+
+    def test_wide_window_keeps_polls_bounded(self):
+        timings = TransitionTimings()
+        for elapsed in range(2, 31):
+            timings.record(MINED, float(elapsed))
+        schedule = PollSchedule(timings, [MINED], jitter=0)
+
+        elapsed, polls = 0.0, 0
+        while elapsed < 30:
+            elapsed += schedule.next_delay(elapsed)
+            polls += 1
+
+        self.assertLessEqual(polls, 6)
+
+    def test_jitter_bounds(self):
+        schedule = PollSchedule(None, [MINED], initial_delay=2, multiplier=1)
+        for _ in range(100):
+            self.assertTrue(1.6 <= schedule.next_delay(0) <= 2.4)
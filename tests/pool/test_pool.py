@@ -0,0 +1,117 @@
+import json
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+import responses
+
+from py_builder_relayer_client.pool import PooledRelayClient
+from tests.helpers import URL, approve_txn, make_builder_config
+
+# Publicly known PKs
+PKS = [
+    "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+    "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d",
+    "0x5de4111afa1a4b94908f83103eb1f1706367c2e68ca870fc3fb9a804cdab365a",
+]
+
+
+def make_pool() -> PooledRelayClient:
+    return PooledRelayClient(URL, 137, PKS, make_builder_config())
+
+
+class TestPooledRelayClient(TestCase):
+
+    def mock_relayer(self, pool):
+        for client in pool.clients:
+            safe = client.get_expected_safe()
+            address = client.signer.address()
+            responses.get(f"{URL}/deployed?address={safe}", json={"deployed": True})
+            responses.get(
+                f"{URL}/nonce?address={address}&type=SAFE", json={"nonce": "0"}
+            )
+        responses.post(f"{URL}/submit", json={"transactionID": "abc"})
+
+    def submitted_from(self):
+        return [
+            json.loads(call.request.body)["from"]
+            for call in responses.calls
+            if call.request.url.endswith("/submit")
+        ]
+
+    def test_members_share_transport(self):
+        pool = make_pool()
+
+        self.assertEqual(3, len(pool))
+        self.assertEqual(3, len(set(pool.addresses)))
+        for client in pool.clients:
+            self.assertIs(pool.http_client, client.http_client)
+            self.assertIs(pool.http_client, client.signer.http_client)
+            self.assertIs(pool.executor, client.executor)
+            self.assertIs(pool.waiter, client.waiter)
+        with patch.object(pool.http_client.session, "close") as close:
+            pool.close()
+        close.assert_called_once_with()
+
+    @responses.activate
+    def test_affinity(self):
+        pool = make_pool()
+        self.mock_relayer(pool)
+
+        for _ in range(3):
+            pool.execute([approve_txn()], key="market-1")
+        pool.execute([approve_txn()], key="market-2")
+
+        submitted = self.submitted_from()
+        self.assertEqual(1, len(set(submitted[:3])))
+        self.assertEqual(pool.client_for("market-1").signer.address(), submitted[0])
+        self.assertEqual(pool.client_for("market-2").signer.address(), submitted[3])
+        self.assertEqual({0}, set(pool.in_flight.values()))
+        pool.close()
+
+    @responses.activate
+    def test_round_robin_when_idle(self):
+        pool = make_pool()
+        self.mock_relayer(pool)
+
+        for _ in range(6):
+            pool.execute([approve_txn()])
+
+        self.assertEqual(pool.addresses * 2, self.submitted_from())
+        # Each signer keeps its own nonce sequence
+        for client in pool.clients:
+            self.assertEqual(1, client.nonce_manager.confirmed)
+        pool.close()
+
+    def test_least_loaded(self):
+        pool = make_pool()
+        release = threading.Event()
+        started = threading.Semaphore(0)
+        picked = []
+
+        def fake_execute(index):
+            def execute(transactions, metadata=None):
+                picked.append(index)
+                started.release()
+                release.wait(timeout=2)
+
+            return execute
+
+        for i, client in enumerate(pool.clients):
+            client.execute = fake_execute(i)
+
+        threads = [
+            threading.Thread(target=pool.execute, args=([approve_txn()],))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+            self.assertTrue(started.acquire(timeout=2))
+        self.assertEqual([0, 1, 2], sorted(picked))
+        self.assertEqual([1, 1, 1], list(pool.in_flight.values()))
+
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual([0, 0, 0], list(pool.in_flight.values()))
+        pool.close()
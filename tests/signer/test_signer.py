@@ -0,0 +1,61 @@
+import random
+from unittest import TestCase, skipUnless
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from py_builder_relayer_client.signer import Signer
+from py_builder_relayer_client.signing import (
+    CoincurveBackend,
+    EthKeysBackend,
+    SigningBackend,
+    coincurve,
+)
+from py_builder_relayer_client.utils.utils import prepend_zx
+
+
+class TestSigner(TestCase):
+
+    def reference_signatures(self, private_key, message_hash):
+        """
+        Signatures from the eth_account path used before signing backends
+        """
+        return (
+            prepend_zx(
+                Account.unsafe_sign_hash(message_hash, private_key).signature.hex()
+            ),
+            prepend_zx(
+                Account.sign_message(
+                    encode_defunct(message_hash), private_key
+                ).signature.hex()
+            ),
+        )
+
+    def assert_backend_matches_eth_account(self, backend_class):
+        rng = random.Random(10)
+        for _ in range(20):
+            private_key = "0x" + rng.randbytes(32).hex()
+            signer = Signer(private_key, 137, backend=backend_class(private_key))
+            message_hash = rng.randbytes(32)
+
+            expected_sig, expected_message_sig = self.reference_signatures(
+                private_key, message_hash
+            )
+            self.assertEqual(expected_sig, signer.sign(message_hash))
+            self.assertEqual(expected_sig, signer.sign("0x" + message_hash.hex()))
+            self.assertEqual(expected_message_sig, signer.sign_message(message_hash))
+            self.assertEqual(
+                expected_message_sig,
+                signer.sign_eip712_struct_hash("0x" + message_hash.hex()),
+            )
+
+    def test_backend_requires_sign_hash(self):
+        with self.assertRaises(TypeError):
+            SigningBackend()
+
+    def test_eth_keys_backend(self):
+        self.assert_backend_matches_eth_account(EthKeysBackend)
+
+    @skipUnless(coincurve is not None, "coincurve is not installed")
+    def test_coincurve_backend(self):
+        self.assert_backend_matches_eth_account(CoincurveBackend)
@@ -0,0 +1,112 @@
+import threading
+from unittest import TestCase
+
+from py_builder_relayer_client.exceptions import (
+    RelayerApiException,
+    RelayerClientException,
+)
+from py_builder_relayer_client.models import OperationType, SafeTransaction
+from py_builder_relayer_client.response import ClientRelayerTransactionResponse
+from py_builder_relayer_client.submission import SubmissionQueue
+from py_builder_relayer_client.waiter import TransactionWaiter
+
+
+class FakeClient:
+    """
+    Records executed batches, each mined in the state given by final_state
+    """
+
+    def __init__(self, final_state="STATE_MINED", error=None):
+        self.final_state = final_state
+        self.error = error
+        self.batches = []
+        self.lock = threading.Lock()
+        self.waiter = TransactionWaiter(self, poll_interval=0.01)
+
+    def execute(self, transactions, metadata=None):
+        if self.error is not None:
+            raise self.error
+        with self.lock:
+            self.batches.append(list(transactions))
+            transaction_id = str(len(self.batches))
+        return ClientRelayerTransactionResponse(transaction_id, "0x01", self)
+
+    def get_transaction(self, transaction_id):
+        return [{"transactionID": transaction_id, "state": self.final_state}]
+
+    def get_transactions(self):
+        return []
+
+
+def txn(i) -> SafeTransaction:
+    return SafeTransaction(
+        to="0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+        operation=OperationType.Call,
+        data="0x%08x" % i,
+        value="0",
+    )
+
+
+class TestSubmissionQueue(TestCase):
+
+    def test_coalesces_within_window(self):
+        client = FakeClient()
+        with SubmissionQueue(client, window=0.2) as queue:
+            handles = [queue.submit(txn(i)) for i in range(10)]
+            results = [h.result(timeout=2) for h in handles]
+
+        self.assertEqual([[txn(i) for i in range(10)]], client.batches)
+        self.assertEqual(["1"] * 10, [h.transaction_id for h in handles])
+        self.assertEqual(["STATE_MINED"] * 10, [r["state"] for r in results])
+        client.waiter.close()
+
+    def test_max_batch_size(self):
+        client = FakeClient()
+        queue = SubmissionQueue(client, window=10, max_batch_size=4)
+        handles = [queue.submit(txn(i)) for i in range(10)]
+        # The last partial batch is sent when the queue closes
+        queue.close()
+        for h in handles:
+            h.result(timeout=2)
+
+        self.assertEqual([4, 4, 2], [len(b) for b in client.batches])
+        self.assertEqual(
+            ["1", "1", "1", "1", "2", "2", "2", "2", "3", "3"],
+            [h.transaction_id for h in handles],
+        )
+        client.waiter.close()
+
+    def test_flush_and_cancel(self):
+        client = FakeClient()
+        queue = SubmissionQueue(client, window=10)
+        kept = queue.submit(txn(1))
+        dropped = queue.submit(txn(2))
+        self.assertTrue(dropped.cancel())
+
+        queue.flush()
+        kept.result(timeout=2)
+
+        self.assertEqual([[txn(1)]], client.batches)
+        self.assertFalse(kept.cancel())
+        queue.close()
+        client.waiter.close()
+
+    def test_execute_error(self):
+        client = FakeClient(error=RelayerApiException(error_msg="boom"))
+        with SubmissionQueue(client, window=0) as queue:
+            handle = queue.submit(txn(1))
+            with self.assertRaises(RelayerApiException):
+                handle.result(timeout=2)
+        self.assertIsNone(handle.transaction_id)
+        with self.assertRaises(RelayerClientException):
+            queue.submit(txn(2))
+        client.waiter.close()
+
+    def test_failed_batch(self):
+        client = FakeClient(final_state="STATE_FAILED")
+        with SubmissionQueue(client, window=0) as queue:
+            handle = queue.submit(txn(1))
+            with self.assertRaises(RelayerClientException):
+                handle.result(timeout=2)
+        self.assertEqual("1", handle.transaction_id)
+        client.waiter.close()
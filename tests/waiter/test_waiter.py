@@ -0,0 +1,175 @@
+import threading
+from unittest import TestCase
+
+from py_builder_relayer_client.exceptions import RelayerApiException
+from py_builder_relayer_client.models import RelayerTransactionRecord
+from py_builder_relayer_client.waiter import DEFAULT_BULK_THRESHOLD, TransactionWaiter
+
+
+class FakeClient:
+    """
+    Serves transaction states from a dict and records the calls made
+    """
+
+    def __init__(self, states):
+        self.states = states
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_transaction(self, transaction_id):
+        with self.lock:
+            self.calls.append(("get_transaction", transaction_id))
+            state = self.states.get(transaction_id)
+        if state == "error":
+            raise RelayerApiException(error_msg="boom")
+        if state == "garbage":
+            return "<html>bad gateway</html>"
+        if state is None:
+            return []
+        return [{"transactionID": transaction_id, "state": state}]
+
+    def iter_transactions(self, page_size=None):
+        with self.lock:
+            self.calls.append(("iter_transactions", page_size))
+            listing = list(self.states.items())
+        for transaction_id, state in listing:
+            with self.lock:
+                self.calls.append(("listed", transaction_id))
+            yield RelayerTransactionRecord(transaction_id, state=state)
+
+
+class TestTransactionWaiter(TestCase):
+
+    def test_resolves_terminal_states(self):
+        client = FakeClient({"a": "STATE_MINED", "b": "STATE_NEW", "c": "error"})
+        waiter = TransactionWaiter(client, poll_interval=0.01, bulk_threshold=100)
+        done = []
+        called = threading.Event()
+
+        def callback(future):
+            done.append(future.result()["state"])
+            called.set()
+
+        a = waiter.submit("a", callback=callback)
+        b = waiter.submit("b")
+        c = waiter.submit("c")
+        # b stays pending, waiting on it again shares its future
+        self.assertIs(b, waiter.submit("b"))
+
+        self.assertEqual("STATE_MINED", a.result(timeout=1)["state"])
+        # Callbacks run on the waiter thread once the result is set
+        self.assertTrue(called.wait(timeout=1))
+        self.assertEqual(["STATE_MINED"], done)
+        self.assertFalse(b.done())
+
+        client.states["b"] = "STATE_FAILED"
+        client.states["c"] = "STATE_CONFIRMED"
+        self.assertEqual("STATE_FAILED", b.result(timeout=1)["state"])
+        self.assertEqual("STATE_CONFIRMED", c.result(timeout=1)["state"])
+        waiter.close()
+
+    def test_bulk_rounds_and_as_completed(self):
+        states = {str(i): "STATE_NEW" for i in range(20)}
+        states["other"] = "STATE_NEW"
+        client = FakeClient(states)
+        waiter = TransactionWaiter(
+            client, poll_interval=0.01, bulk_threshold=5, bulk_page_size=7
+        )
+
+        futures = [waiter.submit(str(i)) for i in range(20)]
+        threading.Event().wait(0.05)
+        names = [name for name, _ in client.calls]
+        self.assertIn(("iter_transactions", 7), client.calls)
+        # In flight transactions seen in the listing are not polled one by one
+        self.assertNotIn("get_transaction", names)
+        # Listing stops once every pending id was seen
+        self.assertNotIn(("listed", "other"), client.calls)
+
+        for i in range(20):
+            states[str(i)] = "STATE_CONFIRMED"
+        results = [f.result() for f in waiter.as_completed(futures, timeout=1)]
+        self.assertEqual(20, len(results))
+        waiter.close()
+
+    def test_bulk_rounds_by_default(self):
+        states = {str(i): "STATE_NEW" for i in range(DEFAULT_BULK_THRESHOLD)}
+        client = FakeClient(states)
+        waiter = TransactionWaiter(client, poll_interval=0.01)
+
+        futures = [waiter.submit(i) for i in states]
+        threading.Event().wait(0.05)
+        waiter.close()
+
+        self.assertIn("iter_transactions", [name for name, _ in client.calls])
+        self.assertNotIn("get_transaction", [name for name, _ in client.calls])
+        self.assertTrue(all(f.cancelled() for f in futures))
+
+    def test_bulk_rounds_can_be_disabled(self):
+        states = {str(i): "STATE_CONFIRMED" for i in range(20)}
+        client = FakeClient(states)
+        waiter = TransactionWaiter(client, poll_interval=0.01, bulk_threshold=None)
+
+        results = [f.result() for f in waiter.as_completed(states, timeout=1)]
+
+        self.assertEqual(20, len(results))
+        self.assertNotIn("iter_transactions", [name for name, _ in client.calls])
+        waiter.close()
+
+    def test_bulk_listing_is_bounded(self):
+        states = {f"old-{i}": "STATE_CONFIRMED" for i in range(50)}
+        states.update({str(i): "STATE_NEW" for i in range(3)})
+        client = FakeClient(states)
+        waiter = TransactionWaiter(
+            client,
+            poll_interval=0.01,
+            bulk_threshold=1,
+            bulk_page_size=10,
+            bulk_max_pages=2,
+        )
+
+        futures = [waiter.submit(str(i)) for i in range(3)]
+        threading.Event().wait(0.05)
+        waiter.close()
+
+        listed = [name for name, _ in client.calls if name == "listed"]
+        rounds = [name for name, _ in client.calls if name == "iter_transactions"]
+        self.assertLessEqual(len(listed), 20 * len(rounds))
+        # Ids the bounded listing did not reach are polled individually
+        self.assertIn(("get_transaction", "0"), client.calls)
+        self.assertTrue(all(f.cancelled() for f in futures))
+
+    def test_survives_unexpected_payloads(self):
+        client = FakeClient({"a": "garbage", "b": "STATE_NEW"})
+        original = client.get_transaction
+
+        def get_transaction(transaction_id):
+            if transaction_id == "b":
+                raise AttributeError("boom")
+            return original(transaction_id)
+
+        client.get_transaction = get_transaction
+        waiter = TransactionWaiter(client, poll_interval=0.01)
+
+        a = waiter.submit("a", timeout=0.05)
+        b = waiter.submit("b", timeout=0.05)
+        with self.assertRaises(Exception):
+            a.result(timeout=1)
+        with self.assertRaises(Exception):
+            b.result(timeout=1)
+
+        client.states["c"] = "STATE_MINED"
+        self.assertEqual("STATE_MINED", waiter.submit("c").result(timeout=1)["state"])
+        waiter.close()
+
+    def test_timeout_and_close(self):
+        client = FakeClient({"a": "STATE_NEW", "b": "STATE_NEW"})
+        waiter = TransactionWaiter(client, poll_interval=0.01)
+
+        timed_out = waiter.submit("a", timeout=0.05)
+        with self.assertRaises(Exception):
+            timed_out.result(timeout=1)
+
+        pending = waiter.submit("b")
+        waiter.close()
+        self.assertTrue(pending.cancelled())
+        self.assertEqual(0, waiter.pending)